@@ -1,2 +0,0 @@
-# app/__init__.py
-print("🔥 app package loaded")
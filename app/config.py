@@ -1,25 +1,21 @@
 # app/config.py
 
 import os
-import sys
-
-print("\n>>> LOADING app.config")
-print(">>> app.config __file__:", __file__)
-print(">>> CWD:", os.getcwd())
-print(">>> sys.path:")
-for p in sys.path:
-    print("   -", p)
-print(">>> ENV PYTHONPATH:", os.getenv("PYTHONPATH"))
-print(">>> ================================\n")
-
-# app/config.py
 
 """
 Central application configuration.
 
 STAGE 1:
 - Define cameras explicitly
-- MAIN stream only
+- SUB stream for detection, MAIN stream on demand for plate crops
+
+Optional per camera:
+- "roi": list of polygons [[x, y], ...] in normalised [0..1] coordinates;
+  detection only runs on (and only keeps vehicles inside) these regions
+- "motion": False (no motion gate) or a dict of MotionGate overrides
+- "decoder": {"fps": float, "keyframes_only": bool, "gop_sec": float} (dual RTSP reader mode)
+- "sub_size" / "main_size": native [w, h] of the streams for the SUB -> MAIN
+  bbox mapping; normally read from ffmpeg, set them to pin the mapping
 """
 
 CAMERAS = {
@@ -30,5 +26,91 @@ CAMERAS = {
 }
 
 
-# Future-proofing (used in later stages)
+# HTTP ingest: camera ids accepted besides CAMERAS (push-only cameras).
+# Comma-separated allow-list; "*" accepts any id (load tests). Each push
+# camera keeps a FrameHub slot + DetectionWorker for the process lifetime,
+# so at most PUSH_CAMERAS_MAX of them are ever started
+PUSH_CAMERAS = frozenset(c.strip() for c in os.getenv("PUSH_CAMERAS", "").split(",") if c.strip())
+PUSH_CAMERAS_MAX = int(os.getenv("PUSH_CAMERAS_MAX", "16"))
+
+
+# MAIN stream reader output (on-demand plate crops)
 DEFAULT_MAIN_RESOLUTION = (1920, 1080)
+
+# Detector input size (longest side, px) — drives decode/resize decisions
+DETECTION_INPUT_SIZE = 640
+
+# RTSP reader: "dual" = one ffmpeg, two raw outputs (detect + preview channels)
+#              "single" = legacy: one 1280x720 source-rate output on the detect channel
+RTSP_READER_MODE = os.getenv("RTSP_READER_MODE", "dual")
+# RTSP supervisor: "threads" = one RTSPReader thread per camera
+#                  "asyncio" = every camera's pipes on a few event-loop threads (hundreds of cameras)
+RTSP_SUPERVISOR = os.getenv("RTSP_SUPERVISOR", "threads")
+RTSP_SUPERVISOR_SHARDS = int(os.getenv("RTSP_SUPERVISOR_SHARDS", min(4, os.cpu_count() or 1)))
+DETECT_STREAM_SIZE = (DETECTION_INPUT_SIZE, DETECTION_INPUT_SIZE * 9 // 16)   # 16:9, letterboxed
+# Detect rendition of cameras WITHOUT a MAIN tap (no "main" URL or
+# MAIN_STREAM_ANPR=0): their plate crops come from it, so it keeps the
+# single-mode resolution (640x360 would halve plate pixels and drop
+# vehicles under the pipeline's 80x40 crop floor)
+SUB_ANPR_STREAM_SIZE = (1280, 720)
+DETECT_STREAM_FPS = 5.0        # decoder fps filter: >= the scheduler's max detection rate
+PREVIEW_STREAM_SIZE = (960, 540)
+PREVIEW_STREAM_FPS = 10.0      # MJPEG preview paces at 10 FPS
+
+# Dual-stream ANPR: detect on SUB, crop plates from MAIN. The MAIN reader
+# opens when a plate crop is due and closes after MAIN_STREAM_IDLE_SEC without one.
+# Kept at >= 2x the camera's motion keep-alive (MainStreamTaps), so a gated
+# camera's keep-alive inference never lands on the idle boundary
+MAIN_STREAM_ANPR = os.getenv("MAIN_STREAM_ANPR", "1") == "1"
+MAIN_STREAM_SIZE = DEFAULT_MAIN_RESOLUTION
+MAIN_STREAM_FPS = DETECT_STREAM_FPS     # every SUB frame has a MAIN twin close in time
+MAIN_STREAM_BUFFER = 8                  # frames (~1.6 s at 5 FPS)
+MAIN_STREAM_MAX_SKEW = 0.3              # s between a SUB frame and the MAIN frame used for it
+MAIN_STREAM_IDLE_SEC = float(os.getenv("MAIN_STREAM_IDLE_SEC", "25"))
+MAIN_STREAM_CONNECT_SEC = 4.0           # ANPR waits this long for a freshly opened tap's first frame
+
+# Per-frame tracing (app.tracing): share of frames whose spans are kept,
+# and how many sampled traces /debug/traces can show
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.05"))
+TRACE_BUFFER = 500
+
+# Vehicle detector weights (loaded once, shared: app.detection.registry)
+VEHICLE_MODEL_PATH = os.getenv("VEHICLE_MODEL_PATH", "yolov8n.pt")
+
+# Inference backend: torch | onnx | openvino ; precision: fp32 | int8
+# ONNX files default to <weights>.onnx / <weights>.int8.onnx (python -m app.detection.export)
+DETECTOR_BACKEND = os.getenv("DETECTOR_BACKEND", "torch")
+DETECTOR_PRECISION = os.getenv("DETECTOR_PRECISION", "fp32")
+DETECTOR_ONNX_PATH = os.getenv("DETECTOR_ONNX_PATH") or None
+DETECTOR_THREADS = int(os.getenv("DETECTOR_THREADS", "0"))   # 0 = runtime default
+
+# Learned plate detector over vehicle crops (one batch per frame) instead of
+# Canny + contour proposals. Unset = Canny
+PLATE_DETECTOR_MODEL = os.getenv("PLATE_DETECTOR_MODEL") or None
+PLATE_DETECTOR_BACKEND = os.getenv("PLATE_DETECTOR_BACKEND", "onnx")   # torch (.pt) | onnx | openvino (.onnx)
+PLATE_DETECTOR_INPUT_SIZE = 320
+PLATE_DETECTOR_BATCH = 8                # crops per inference run (dynamic-batch exports)
+PLATE_DETECTOR_CONF = float(os.getenv("PLATE_DETECTOR_CONF", "0.35"))
+PLATE_DETECTOR_MAX_PER_VEHICLE = 2      # best boxes per crop handed to the gate / OCR
+
+# Per-camera detection throughput controls (RTSP + HTTP ingest alike)
+# Starting rates; the adaptive scheduler moves them within the bounds below
+DETECTION_FPS = 2
+ANPR_FPS = 0.7
+
+# Adaptive scheduler: rates follow vehicle count / motion / latency,
+# total inference time stays under DETECTION_BUDGET (cores' worth), capped at the
+# shared model handle's concurrency (registry.HANDLE_CONCURRENCY = 1: serialised)
+ADAPTIVE_SCHEDULER = os.getenv("ADAPTIVE_SCHEDULER", "1") == "1"
+DETECTION_FPS_BOUNDS = (0.2, 4.0)
+ANPR_FPS_BOUNDS = (0.1, 1.0)
+DETECTION_BUDGET = float(os.getenv("DETECTION_BUDGET", max(1, (os.cpu_count() or 2) - 1)))
+
+# Per-camera detection history ring (DetectionManager): detection runs / detections kept
+DETECTION_HISTORY_FRAMES = 2048         # ~17 min at 2 FPS
+DETECTION_HISTORY_DETECTIONS = 32768
+
+# Motion gate: skip detection on static scenes (plus a periodic keep-alive)
+MOTION_GATE_ENABLED = os.getenv("MOTION_GATE", "1") == "1"
+MOTION_THRESHOLD = float(os.getenv("MOTION_THRESHOLD", "0.002"))   # share of pixels that changed
+MOTION_KEEPALIVE_SEC = float(os.getenv("MOTION_KEEPALIVE_SEC", "10"))
@@ -0,0 +1,261 @@
+# app/detection/backends.py
+
+"""
+Detector inference backends.
+
+Every backend is callable as detector(frame_bgr) -> float32 array (N, 6):
+    x1, y1, x2, y2, confidence, class_id     (frame pixel coordinates)
+
+- torch:    ultralytics eager (reference path)
+- onnx:     ONNX Runtime, CPUExecutionProvider
+- openvino: ONNX Runtime + OpenVINOExecutionProvider (onnxruntime-openvino)
+
+ONNX models are exported with a static 1x3xSxS input; preprocessing
+(letterbox, BGR->RGB, HWC->CHW, /255) writes into preallocated buffers.
+"""
+
+import logging
+import os
+
+import numpy as np
+
+logger = logging.getLogger("DetectorBackend")
+
+BACKENDS = ("torch", "onnx", "openvino")
+PRECISIONS = ("fp32", "int8")
+
+LETTERBOX_FILL = 114
+CONF_THRESHOLD = 0.25
+IOU_THRESHOLD = 0.45
+MAX_DETECTIONS = 300
+
+# COCO class id -> vehicle label
+COCO_VEHICLE_CLASSES = {
+    2: "car",
+    3: "motorcycle",
+    5: "bus",
+    7: "truck",
+}
+
+_EMPTY = np.zeros((0, 6), dtype=np.float32)
+
+
+def onnx_path_for(weights: str, precision: str = "fp32") -> str:
+    """yolov8n.pt -> yolov8n.onnx / yolov8n.int8.onnx"""
+    stem = os.path.splitext(weights)[0]
+    return f"{stem}.int8.onnx" if precision == "int8" else f"{stem}.onnx"
+
+
+# -------------------------------------------------
+# Torch (ultralytics)
+# -------------------------------------------------
+class TorchDetector:
+    backend = "torch"
+
+    def __init__(self, weights: str, imgsz: int, classes=None, conf: float = CONF_THRESHOLD):
+        from ultralytics import YOLO
+
+        self.model = YOLO(weights)
+        self.imgsz = imgsz
+        self.classes = list(classes) if classes else None
+        self.conf = conf
+
+    def __call__(self, frame) -> np.ndarray:
+        results = self.model(
+            frame,
+            imgsz=self.imgsz,
+            conf=self.conf,
+            classes=self.classes,
+            verbose=False,
+        )
+        if not results:
+            return _EMPTY
+        # boxes.data = (N, 6): xyxy, conf, cls — already in frame coordinates
+        return results[0].boxes.data.cpu().numpy().astype(np.float32, copy=False)
+
+
+# -------------------------------------------------
+# Preprocessing (shared with INT8 calibration)
+# -------------------------------------------------
+class Letterbox:
+    """
+    Reusable letterbox into a fixed SxS NCHW float32 tensor.
+
+    Buffers are allocated once; the border is only repainted when the
+    source frame size changes (cameras keep a constant resolution).
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.canvas = np.full((size, size, 3), LETTERBOX_FILL, dtype=np.uint8)
+        self.tensor = np.empty((1, 3, size, size), dtype=np.float32)
+        self._layout = None     # (h, w) -> (scale, left, top, nw, nh)
+        self._resized = None
+
+    def _fit(self, h: int, w: int):
+        if self._layout is not None and self._layout[0] == (h, w):
+            return self._layout[1]
+
+        scale = min(self.size / h, self.size / w)
+        nw, nh = int(round(w * scale)), int(round(h * scale))
+        left, top = (self.size - nw) // 2, (self.size - nh) // 2
+
+        self.canvas[:] = LETTERBOX_FILL
+        self._resized = np.empty((nh, nw, 3), dtype=np.uint8)
+        fit = (scale, left, top, nw, nh)
+        self._layout = ((h, w), fit)
+        return fit
+
+    def __call__(self, frame) -> tuple:
+        import cv2
+
+        h, w = frame.shape[:2]
+        scale, left, top, nw, nh = self._fit(h, w)
+
+        if (nw, nh) == (w, h):
+            self.canvas[top:top + nh, left:left + nw] = frame
+        else:
+            cv2.resize(frame, (nw, nh), dst=self._resized, interpolation=cv2.INTER_LINEAR)
+            self.canvas[top:top + nh, left:left + nw] = self._resized
+
+        # BGR HWC uint8 -> RGB CHW float32 [0,1], straight into the input tensor
+        np.multiply(
+            self.canvas.transpose(2, 0, 1)[::-1],
+            np.float32(1.0 / 255.0),
+            out=self.tensor[0],
+            casting="unsafe",
+        )
+        return self.tensor, scale, left, top
+
+
+def nms(boxes: np.ndarray, scores: np.ndarray, classes: np.ndarray, iou: float) -> np.ndarray:
+    import cv2
+
+    # Class-aware NMS in one call: offset boxes per class so they never overlap
+    offset = classes[:, None] * 4096.0
+    shifted = boxes + offset
+    xywh = np.column_stack((shifted[:, :2], shifted[:, 2:] - shifted[:, :2]))
+    keep = cv2.dnn.NMSBoxes(xywh.tolist(), scores.tolist(), 0.0, iou, top_k=MAX_DETECTIONS)
+    return np.asarray(keep, dtype=np.int64).reshape(-1)
+
+
+# -------------------------------------------------
+# ONNX Runtime (CPU / OpenVINO EP)
+# -------------------------------------------------
+def onnx_session(model_path: str, backend: str = "onnx", threads: int = 0):
+    import onnxruntime as ort
+
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(
+            f"{model_path} missing — export it with: python -m app.detection.export"
+        )
+
+    providers = ["CPUExecutionProvider"]
+    if backend == "openvino":
+        if "OpenVINOExecutionProvider" not in ort.get_available_providers():
+            raise RuntimeError("OpenVINOExecutionProvider unavailable (install onnxruntime-openvino)")
+        providers.insert(0, "OpenVINOExecutionProvider")
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if threads:
+        options.intra_op_num_threads = threads
+
+    return ort.InferenceSession(model_path, sess_options=options, providers=providers)
+
+
+class OnnxDetector:
+    def __init__(
+        self,
+        model_path: str,
+        *,
+        backend: str = "onnx",
+        classes=None,
+        conf: float = CONF_THRESHOLD,
+        iou: float = IOU_THRESHOLD,
+        threads: int = 0,
+    ):
+        self.session = onnx_session(model_path, backend, threads)
+        self.model_path = model_path
+        self.backend = backend
+
+        inp = self.session.get_inputs()[0]
+        if not all(isinstance(d, int) for d in inp.shape):
+            raise ValueError(f"{model_path}: dynamic input shape {inp.shape}; export with a static imgsz")
+        self.input_name = inp.name
+        self.imgsz = int(inp.shape[-1])
+
+        self.letterbox = Letterbox(self.imgsz)
+        self.classes = np.asarray(sorted(classes), dtype=np.int64) if classes else None
+        self.conf = conf
+        self.iou = iou
+
+    def __call__(self, frame) -> np.ndarray:
+        tensor, scale, left, top = self.letterbox(frame)
+        out = self.session.run(None, {self.input_name: tensor})[0]
+
+        # YOLOv8 head: (1, 4 + nc, anchors) -> (anchors, 4 + nc)
+        pred = out[0].T
+        scores = pred[:, 4:]
+        if self.classes is not None:
+            scores = scores[:, self.classes]
+
+        cls_idx = scores.argmax(axis=1)
+        conf = scores[np.arange(len(scores)), cls_idx]
+        mask = conf >= self.conf
+        if not mask.any():
+            return _EMPTY
+
+        cxcywh = pred[mask, :4]
+        conf = conf[mask]
+        cls_idx = cls_idx[mask]
+        cls = self.classes[cls_idx] if self.classes is not None else cls_idx
+
+        boxes = np.empty_like(cxcywh)
+        boxes[:, :2] = cxcywh[:, :2] - cxcywh[:, 2:] / 2
+        boxes[:, 2:] = cxcywh[:, :2] + cxcywh[:, 2:] / 2
+
+        keep = nms(boxes, conf, cls.astype(np.float32), self.iou)
+        boxes, conf, cls = boxes[keep], conf[keep], cls[keep]
+
+        # Undo letterbox -> frame pixels
+        h, w = frame.shape[:2]
+        boxes[:, [0, 2]] = ((boxes[:, [0, 2]] - left) / scale).clip(0, w)
+        boxes[:, [1, 3]] = ((boxes[:, [1, 3]] - top) / scale).clip(0, h)
+
+        return np.column_stack((boxes, conf, cls)).astype(np.float32, copy=False)
+
+
+# -------------------------------------------------
+# Factory
+# -------------------------------------------------
+def load_detector(
+    weights: str,
+    *,
+    backend: str = "torch",
+    precision: str = "fp32",
+    imgsz: int = 640,
+    classes=None,
+    onnx_path: str | None = None,
+    threads: int = 0,
+):
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown detector backend {backend!r} (expected one of {BACKENDS})")
+    if precision not in PRECISIONS:
+        raise ValueError(f"unknown detector precision {precision!r} (expected one of {PRECISIONS})")
+
+    if backend == "torch":
+        if precision != "fp32":
+            raise ValueError("torch backend runs fp32 only; use onnx/openvino for int8")
+        return TorchDetector(weights, imgsz, classes=classes)
+
+    path = onnx_path or onnx_path_for(weights, precision)
+    detector = OnnxDetector(path, backend=backend, classes=classes, threads=threads)
+    if detector.imgsz != imgsz:
+        logger.warning(
+            "[BACKEND] %s was exported at %d px (DETECTION_INPUT_SIZE=%d)",
+            path,
+            detector.imgsz,
+            imgsz,
+        )
+    return detector
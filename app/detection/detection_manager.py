@@ -4,43 +4,84 @@ import threading
 import time
 from typing import Dict, List
 
+import numpy as np
+
+from app.detection.history import DetectionHistory, HistoryView
+
 
 class DetectionManager:
     """
     Thread-safe detection metadata cache.
 
     Stores ONLY metadata (no frames):
-    - vehicles
-    - plates
-    - timestamps
+    - latest vehicles (detections array) / plates / timestamp per camera (get)
+    - time-indexed columnar history per camera (history / between / last)
+
+    One writer per camera (its DetectionWorker). Reads take no lock: the
+    latest entry is swapped in whole, history queries are ring views.
     """
 
-    def __init__(self):
+    def __init__(self, history_frames: int | None = None, history_detections: int | None = None):
+        from app.config import DETECTION_HISTORY_DETECTIONS, DETECTION_HISTORY_FRAMES
+
+        self.history_frames = history_frames or DETECTION_HISTORY_FRAMES
+        self.history_detections = history_detections or DETECTION_HISTORY_DETECTIONS
+
         # cam_id -> data
         self._data: Dict[str, dict] = {}
-        self._lock = threading.Lock()
+        self._history: Dict[str, DetectionHistory] = {}
+        self._lock = threading.Lock()   # camera registration only
+
+    def _history_for(self, cam_id: str) -> DetectionHistory:
+        history = self._history.get(cam_id)
+        if history is None:
+            with self._lock:
+                history = self._history.get(cam_id)
+                if history is None:
+                    history = self._history[cam_id] = DetectionHistory(
+                        self.history_frames, self.history_detections
+                    )
+        return history
 
     def update(
         self,
         cam_id: str,
         *,
-        vehicles: List[dict],
+        vehicles: np.ndarray,
         plates: List[dict],
+        ts: float | None = None,
     ):
-        with self._lock:
-            self._data[cam_id] = {
-                "ts": time.time(),
-                "vehicles": vehicles,
-                "plates": plates,
-            }
+        """ts: capture time of the frame the detections came from (default: now)."""
+        now = time.time()
+        ts = now if ts is None else ts
+        self._history_for(cam_id).append(ts, vehicles)
+        self._data[cam_id] = {
+            "ts": ts,
+            "updated": now,     # freshness for get(); ts may come from a source clock
+            "vehicles": vehicles,
+            "plates": plates,
+        }
 
     def get(self, cam_id: str, max_age_sec: float = 1.0) -> dict | None:
-        with self._lock:
-            entry = self._data.get(cam_id)
-            if not entry:
-                return None
+        entry = self._data.get(cam_id)
+        if not entry:
+            return None
+
+        if time.time() - entry["updated"] > max_age_sec:
+            return None
+
+        return entry
+
+    # -------------------------------------------------
+    # History (zero-copy NumPy views, see HistoryView)
+    # -------------------------------------------------
+    def history(self, cam_id: str) -> DetectionHistory | None:
+        return self._history.get(cam_id)
 
-            if time.time() - entry["ts"] > max_age_sec:
-                return None
+    def between(self, cam_id: str, t0: float, t1: float) -> HistoryView | None:
+        history = self._history.get(cam_id)
+        return history.between(t0, t1) if history is not None else None
 
-            return entry
+    def last(self, cam_id: str, k: int) -> HistoryView | None:
+        history = self._history.get(cam_id)
+        return history.last(k) if history is not None else None
@@ -0,0 +1,100 @@
+# app/detection/detections.py
+
+"""
+Columnar detection results: one NumPy structured array per frame.
+
+Row = (bbox int32[4] x1 y1 x2 y2, conf float32, cls int16 COCO id,
+track int32, -1 = untracked). Filtering, clamping, offsets and coordinate
+mapping are whole-array operations, so per-frame Python cost no longer
+grows with the number of boxes. Per-row iteration is left to work that is
+per vehicle anyway (plate crops, OCR).
+"""
+
+import numpy as np
+
+from app.detection.backends import COCO_VEHICLE_CLASSES
+
+DETECTION_DTYPE = np.dtype([
+    ("bbox", np.int32, (4,)),
+    ("conf", np.float32),
+    ("cls", np.int16),
+    ("track", np.int32),
+])
+
+VEHICLE_CLASS_IDS = np.array(sorted(COCO_VEHICLE_CLASSES), dtype=np.int16)
+_CLASS_IDS_BY_NAME = {name: cid for cid, name in COCO_VEHICLE_CLASSES.items()}
+
+
+def empty(n: int = 0) -> np.ndarray:
+    dets = np.zeros(n, DETECTION_DTYPE)
+    dets["track"] = -1
+    return dets
+
+
+def from_model_output(raw, frame_shape, classes=VEHICLE_CLASS_IDS, min_conf: float = 0.0) -> np.ndarray:
+    """
+    Detector (N, 6) [x1, y1, x2, y2, conf, cls] -> detections:
+    class filter, confidence filter and clamp to the frame, vectorized.
+    """
+    raw = np.asarray(raw, dtype=np.float32).reshape(-1, 6)
+    cls = raw[:, 5].astype(np.int16)
+    keep = np.isin(cls, classes)
+    if min_conf > 0.0:
+        keep &= raw[:, 4] >= min_conf
+    raw, cls = raw[keep], cls[keep]
+
+    h, w = frame_shape[:2]
+    dets = empty(len(raw))
+    # Truncate like int(), then clamp to the frame
+    dets["bbox"] = np.clip(raw[:, :4].astype(np.int32), 0, (w, h, w, h))
+    dets["conf"] = raw[:, 4]
+    dets["cls"] = cls
+    return dets
+
+
+def from_boxes(boxes, conf: float = 1.0, cls: int | str = 2) -> np.ndarray:
+    """Plain boxes (mocks, fixtures) -> detections with one conf / class."""
+    boxes = np.asarray(boxes, dtype=np.int32).reshape(-1, 4)
+    dets = empty(len(boxes))
+    dets["bbox"] = boxes
+    dets["conf"] = conf
+    dets["cls"] = _CLASS_IDS_BY_NAME[cls] if isinstance(cls, str) else cls
+    return dets
+
+
+def concat(parts: list) -> np.ndarray:
+    return np.concatenate(parts) if parts else empty()
+
+
+def shifted(dets: np.ndarray, dx: int, dy: int) -> np.ndarray:
+    """Copy with boxes moved by (dx, dy) (crop -> frame coordinates)."""
+    out = dets.copy()
+    out["bbox"] += np.array((dx, dy, dx, dy), dtype=np.int32)
+    return out
+
+
+def class_name(cls_id) -> str:
+    cls_id = int(cls_id)
+    return COCO_VEHICLE_CLASSES.get(cls_id, str(cls_id))
+
+
+def class_names(dets: np.ndarray) -> list:
+    return [class_name(c) for c in dets["cls"].tolist()]
+
+
+def to_dicts(dets: np.ndarray) -> list:
+    """API / log edge: [{"bbox", "confidence", "class", "track_id"}]."""
+    return [
+        {
+            "bbox": bbox,
+            "confidence": conf,
+            "class": class_name(cls),
+            "track_id": None if track < 0 else track,
+        }
+        for bbox, conf, cls, track in zip(
+            dets["bbox"].tolist(),
+            dets["conf"].tolist(),
+            dets["cls"].tolist(),
+            dets["track"].tolist(),
+        )
+    ]
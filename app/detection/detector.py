@@ -3,8 +3,20 @@ import time
 import threading
 import logging
 
-from app.detection.vehicle_detector import detect_vehicles
+import numpy as np
+
+from app.detection.registry import thread_inference_seconds
 from app.ingest.frame.pipeline import run_frame_pipeline
+from app.metrics import (
+    CAMERA_CPU_SECONDS,
+    DEADLINE_MISSES,
+    DETECTION_RATE,
+    DETECTIONS_TOTAL,
+    FRAMES_SKIPPED,
+    STAGE_SECONDS,
+)
+from app.temporal.tracker import VehicleTracker
+from app.tracing import TRACER
 
 logger = logging.getLogger("DetectionWorker")
 
@@ -19,19 +31,39 @@ class DetectionWorker(threading.Thread):
         cam_id: str,
         frame_hub,
         detection_manager,
-        fps: int = 2,
+        fps: float = 2,
         anpr_fps: float = 0.7,
         vehicle_delta: int = 1,
         per_vehicle_cooldown: float = 2.0,
+        detect_fn=None,
+        roi=None,
+        motion_gate=None,
+        main_tap=None,
     ):
-        super().__init__(daemon=True)
+        super().__init__(daemon=True, name=f"DetectionWorker-{cam_id}")
 
         self.cam_id = cam_id
         self.frame_hub = frame_hub
         self.detection_manager = detection_manager
 
-        self.interval = 1.0 / max(fps, 1)
-        self.anpr_interval = 1.0 / max(anpr_fps, 0.1)
+        # Injectable detector (load tests use a stub; default = YOLO)
+        if detect_fn is None:
+            from app.detection.vehicle_detector import detect_vehicles as detect_fn
+        self.detect_fn = detect_fn
+
+        # Optional DetectionROI: infer only on the ROI rects (None = full frame)
+        self.roi = roi
+
+        # Optional MotionGate: static frames skip inference entirely
+        self.motion_gate = motion_gate
+
+        # Optional MainStreamTap: plate crops from the high-res MAIN stream
+        self.main_tap = main_tap
+
+        # Track ids across runs: history rows + per-vehicle event coalescing
+        self.tracker = VehicleTracker()
+
+        self.set_rates(fps, anpr_fps)
 
         self.vehicle_delta = vehicle_delta
         self.per_vehicle_cooldown = per_vehicle_cooldown
@@ -39,10 +71,43 @@ class DetectionWorker(threading.Thread):
         self._last_run = 0.0
         self._last_anpr_ts = 0.0
         self._last_vehicle_count = 0
-        self._vehicle_last_seen = {}
+        # Per-vehicle ANPR cooldown: bboxes sent to ANPR + when (pruned past the cooldown)
+        self._anpr_boxes = np.empty((0, 4), np.int32)
+        self._anpr_ts = np.empty(0, np.float64)
+        self._last_seq = 0
+
+        # Replay / benchmark visibility
+        self.processed_seq = 0      # last FrameHub seq fully processed
+        self.frames_processed = 0   # includes frames the motion gate skipped
+        self.frames_skipped = 0     # overwritten in FrameHub before we read them
+        self.frames_gated = 0       # read, but no motion -> no inference
+
+        # Scheduler inputs (cumulative; DetectionScheduler diffs them)
+        self.inferences = 0
+        self.inference_sec = 0.0
+        self.vehicles_seen = 0      # sum of per-inference vehicle counts
+        self.deadline_misses = 0    # tick took longer than the detection interval
+
+        # 📊 Metric children (resolved once; hot loop only observes)
+        self._framehub_wait = STAGE_SECONDS.labels(cam_id, "framehub_wait")
+        self._inference_timer = STAGE_SECONDS.labels(cam_id, "inference")
+        self._motion_timer = STAGE_SECONDS.labels(cam_id, "motion_gate")
+        self._cpu = CAMERA_CPU_SECONDS.labels(cam_id, "detection")
+        self._runs = DETECTIONS_TOTAL.labels(cam_id)
+        self._skipped = FRAMES_SKIPPED.labels(cam_id)
+        self._misses = DEADLINE_MISSES.labels(cam_id)
 
         self.running = True
 
+    def set_rates(self, fps: float, anpr_fps: float):
+        """Detection / ANPR rates; safe to call from another thread."""
+        self.fps = fps
+        self.anpr_fps = anpr_fps
+        self.interval = 1.0 / max(fps, 0.05)
+        self.anpr_interval = 1.0 / max(anpr_fps, 0.05)
+        DETECTION_RATE.labels(self.cam_id, "detect").set(fps)
+        DETECTION_RATE.labels(self.cam_id, "anpr").set(anpr_fps)
+
     def run(self):
         logger.info("[DETECT] started | cam=%s", self.cam_id)
 
@@ -54,50 +119,184 @@ class DetectionWorker(threading.Thread):
                 continue
             self._last_run = now
 
-            frame = self.frame_hub.get_latest(self.cam_id)
-            if frame is None:
-                continue
+            entry = self.frame_hub.latest_entry(self.cam_id)
+            if entry is None or entry.seq == self._last_seq:
+                continue  # no NEW frame (push cameras may be idle)
 
-            try:
-                vehicles = detect_vehicles(frame)
-                count = len(vehicles)
-
-                self.detection_manager.update(
-                    self.cam_id,
-                    vehicles=vehicles,
-                    plates=[],
-                )
-
-                if not vehicles:
-                    self._last_vehicle_count = 0
-                    continue
-
-                if now - self._last_anpr_ts < self.anpr_interval:
-                    continue
-
-                if abs(count - self._last_vehicle_count) < self.vehicle_delta:
-                    continue
-
-                eligible = []
-                for v in vehicles:
-                    vid = tuple(v["bbox"])
-                    last_seen = self._vehicle_last_seen.get(vid, 0.0)
-                    if now - last_seen >= self.per_vehicle_cooldown:
-                        eligible.append(v)
-                        self._vehicle_last_seen[vid] = now
-
-                if not eligible:
-                    continue
-
-                run_frame_pipeline(
-                    camera_id=self.cam_id,
-                    frame_ts=now,
-                    frame=frame,
-                    vehicles=eligible,
-                )
-
-                self._last_anpr_ts = now
-                self._last_vehicle_count = count
+            skipped = entry.seq - self._last_seq - 1
+            if skipped > 0 and self._last_seq:
+                self.frames_skipped += skipped
+                self._skipped.inc(skipped)
+            self._last_seq = entry.seq
+            frame = entry.frame
+            content = self.frame_hub.content_rect(self.cam_id, frame.shape)
+
+            self._framehub_wait.observe(max(0.0, now - entry.ts))
 
+            cpu0 = time.thread_time()
+            t0 = time.perf_counter()
+            try:
+                # Current trace for this thread: stage_timer() spans + event tags
+                with TRACER.trace(self.cam_id, entry.trace_id, entry.ts) as trace:
+                    if self.motion_gate is not None:
+                        with self._motion_timer.time():
+                            moving = self.motion_gate.should_detect(frame, now, content)
+                        trace.add_span("motion_gate", t0, time.perf_counter())
+                        if not moving:
+                            self.frames_gated += 1
+                            continue
+                    self._process(frame, now, entry.ts, trace, content)
             except Exception:
                 logger.exception("[DETECT] crash | cam=%s", self.cam_id)
+            finally:
+                if time.perf_counter() - t0 > self.interval:
+                    self.deadline_misses += 1
+                    self._misses.inc()
+                self._cpu.inc(time.thread_time() - cpu0)
+                self.frames_processed += 1
+                self.processed_seq = entry.seq
+
+    def _process(self, frame, now: float, frame_ts: float, trace, content: tuple | None = None):
+        m0 = thread_inference_seconds()
+        t0 = time.perf_counter()
+        if self.roi is not None:
+            vehicles = self.roi.detect(frame, self.detect_fn, content)
+        else:
+            vehicles = self.detect_fn(frame)
+        t1 = time.perf_counter()
+        # Model time inside the shared handle's lock (queueing behind other
+        # cameras excluded); detectors that bypass the registry -> wall time
+        elapsed = thread_inference_seconds() - m0 or t1 - t0
+        self._inference_timer.observe(elapsed)
+        trace.add_span("inference", t0, t1)
+        self._runs.inc()
+        self.tracker.assign(vehicles)
+        count = len(vehicles)
+
+        self.inferences += 1
+        self.inference_sec += elapsed
+        self.vehicles_seen += count
+
+        self.detection_manager.update(
+            self.cam_id,
+            vehicles=vehicles,
+            plates=[],
+            ts=frame_ts,
+        )
+
+        if count == 0:
+            self._last_vehicle_count = 0
+            return
+
+        if now - self._last_anpr_ts < self.anpr_interval:
+            return
+
+        if abs(count - self._last_vehicle_count) < self.vehicle_delta:
+            return
+
+        mask = self._cooldown_mask(vehicles["bbox"], now)
+        if not mask.any():
+            return
+        eligible = vehicles[mask]
+        sub_boxes = eligible["bbox"]
+
+        # High-res twin of this frame. Demand only when a plate crop is
+        # actually due: a parked car (cooling down) must not keep the MAIN
+        # decode open. A tap that is still connecting defers ANPR (nothing
+        # marked sent) to a later frame; past MAIN_STREAM_CONNECT_SEC
+        # without a MAIN frame, crops fall back to SUB
+        if self.main_tap is not None:
+            self.main_tap.demand()
+            main = self.main_tap.frame_at(frame_ts)
+            if main is None and self.main_tap.connecting():
+                return
+            mapped = None
+            if main is not None:
+                sub_source = self.frame_hub.source_size(self.cam_id)
+                mapped = self.main_tap.map_vehicles(eligible, frame.shape, main.frame.shape, sub_source)
+            if mapped is not None:
+                eligible = mapped
+                frame = main.frame
+                frame_ts = main.ts
+
+        self._mark_sent(sub_boxes, now)
+
+        with trace.span("anpr"):
+            run_frame_pipeline(
+                camera_id=self.cam_id,
+                frame_ts=frame_ts,
+                frame=frame,
+                vehicles=eligible,
+            )
+
+        self._last_anpr_ts = now
+        self._last_vehicle_count = count
+
+    def _cooldown_mask(self, boxes: np.ndarray, now: float) -> np.ndarray:
+        """Vehicles (by exact bbox) not sent to ANPR within per_vehicle_cooldown."""
+        fresh = now - self._anpr_ts < self.per_vehicle_cooldown
+        self._anpr_boxes = self._anpr_boxes[fresh]
+        self._anpr_ts = self._anpr_ts[fresh]
+
+        # (N, M) exact bbox matches against the still-cooling boxes
+        cooling = (boxes[:, None, :] == self._anpr_boxes[None, :, :]).all(axis=2).any(axis=1)
+        return ~cooling
+
+    def _mark_sent(self, boxes: np.ndarray, now: float):
+        """SUB bboxes of vehicles handed to ANPR: cooling down from `now`."""
+        self._anpr_boxes = np.concatenate([self._anpr_boxes, boxes])
+        self._anpr_ts = np.concatenate([self._anpr_ts, np.full(len(boxes), now)])
+
+
+# -------------------------------------------------
+# Worker registry (one worker per camera, any source)
+# -------------------------------------------------
+_workers_lock = threading.Lock()
+
+
+def start_detection_worker(
+    cam_id: str,
+    frame_hub,
+    detection_manager,
+    **kwargs,
+) -> DetectionWorker:
+    """
+    Idempotent: returns the running worker for cam_id, starting it if needed.
+    Used by startup wiring (RTSP) and HTTP ingest (push-only cameras).
+    """
+    from app.config import ANPR_FPS, CAMERAS, DETECTION_FPS
+    from app.detection.motion import motion_gate_from_config
+    from app.detection.roi import roi_from_config
+    from app.ingest.rtsp.main_stream import MAIN_STREAM_TAPS
+    from app.shared import app_state
+
+    with _workers_lock:
+        worker = app_state.detection_workers.get(cam_id)
+        if worker is not None and worker.is_alive():
+            return worker
+
+        kwargs.setdefault("fps", DETECTION_FPS)
+        kwargs.setdefault("anpr_fps", ANPR_FPS)
+        if "roi" not in kwargs:
+            kwargs["roi"] = roi_from_config(cam_id, CAMERAS.get(cam_id))
+        if "motion_gate" not in kwargs:
+            kwargs["motion_gate"] = motion_gate_from_config(cam_id, CAMERAS.get(cam_id))
+        if "main_tap" not in kwargs:
+            kwargs["main_tap"] = MAIN_STREAM_TAPS.get(cam_id, CAMERAS.get(cam_id))
+
+        worker = DetectionWorker(
+            cam_id=cam_id,
+            frame_hub=frame_hub,
+            detection_manager=detection_manager,
+            **kwargs,
+        )
+        worker.start()
+        app_state.detection_workers[cam_id] = worker
+
+    from app.detection.scheduler import DETECTION_SCHEDULER
+
+    if DETECTION_SCHEDULER is not None:
+        DETECTION_SCHEDULER.register(worker)
+
+    logger.warning("[DETECT] worker started | cam=%s", cam_id)
+    return worker
@@ -0,0 +1,162 @@
+# app/detection/export.py
+
+"""
+Export the vehicle detector to ONNX (static input) and optionally
+quantize it to INT8, calibrated on replayed frames.
+
+    python -m app.detection.export                                 # yolov8n.onnx
+    python -m app.detection.export --int8 --calib clip.mp4         # + yolov8n.int8.onnx
+    python -m app.detection.export --int8 --calib frames_dir/ --calib-frames 300
+
+Calibration frames go through the same Letterbox as inference, so the
+activation ranges match what the runtime actually feeds the model.
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+
+from app.config import DETECTION_INPUT_SIZE, VEHICLE_MODEL_PATH
+from app.detection.backends import Letterbox, onnx_path_for
+
+logger = logging.getLogger("DetectorExport")
+
+ONNX_OPSET = 13     # QDQ INT8 needs per-channel QuantizeLinear (opset >= 13)
+
+
+def export_onnx(weights: str, imgsz: int, out_path: str) -> str:
+    from ultralytics import YOLO
+
+    exported = YOLO(weights).export(
+        format="onnx",
+        imgsz=imgsz,
+        dynamic=False,      # static 1x3xSxS: lets ORT / OpenVINO pre-plan memory
+        simplify=True,
+        opset=ONNX_OPSET,
+        batch=1,
+    )
+    if os.path.abspath(exported) != os.path.abspath(out_path):
+        shutil.move(exported, out_path)
+    logger.info("[EXPORT] %s -> %s (imgsz=%d)", weights, out_path, imgsz)
+    return out_path
+
+
+class ReplayCalibrationReader:
+    """
+    onnxruntime CalibrationDataReader over a replayed clip: every
+    `stride`-th frame, up to `limit` frames.
+    """
+
+    def __init__(self, source: str, input_name: str, imgsz: int, *, limit: int = 200, stride: int = 5):
+        from app.frames.replay import ReplayFrameProvider
+
+        self.provider = ReplayFrameProvider({"calib": source}, realtime=False)
+        self.input_name = input_name
+        self.letterbox = Letterbox(imgsz)
+        self.limit = limit
+        self.stride = max(1, stride)
+        self.fed = 0
+        self._seen = 0
+        self._pending = None
+
+    def prime(self) -> bool:
+        """Read the first calibration input now; False = the source yields no frames."""
+        if self._pending is None:
+            self._pending = self._read()
+        return self._pending is not None
+
+    def get_next(self):
+        if self._pending is not None:
+            item, self._pending = self._pending, None
+            return item
+        return self._read()
+
+    def _read(self):
+        if self.fed >= self.limit:
+            return None
+
+        while True:
+            frame = self.provider.get_frame("calib")
+            if frame is None:
+                return None
+            self._seen += 1
+            if (self._seen - 1) % self.stride == 0:
+                break
+
+        tensor, *_ = self.letterbox(frame)
+        self.fed += 1
+        # Letterbox reuses its buffer; the quantizer keeps references
+        return {self.input_name: tensor.copy()}
+
+
+def quantize_int8(fp32_path: str, out_path: str, calib_source: str, imgsz: int, *, limit: int, stride: int) -> str:
+    import onnxruntime as ort
+    from onnxruntime.quantization import QuantFormat, QuantType, quantize_static
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    input_name = ort.InferenceSession(
+        fp32_path, providers=["CPUExecutionProvider"]
+    ).get_inputs()[0].name
+
+    reader = ReplayCalibrationReader(calib_source, input_name, imgsz, limit=limit, stride=stride)
+    # Before quantizing: an empty source must not leave an uncalibrated model behind
+    if not reader.prime():
+        raise ValueError(f"no calibration frames read from {calib_source}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        prepped = os.path.join(tmp, "prepped.onnx")
+        quantized = os.path.join(tmp, "quantized.onnx")
+        quant_pre_process(fp32_path, prepped)
+
+        quantize_static(
+            prepped,
+            quantized,
+            reader,
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=True,
+        )
+        # Only a finished model replaces out_path
+        shutil.move(quantized, out_path)
+
+    logger.info("[EXPORT] INT8 %s -> %s (%d calibration frames)", fp32_path, out_path, reader.fed)
+    return out_path
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export the vehicle detector to ONNX / INT8")
+    parser.add_argument("--weights", default=VEHICLE_MODEL_PATH)
+    parser.add_argument("--imgsz", type=int, default=DETECTION_INPUT_SIZE)
+    parser.add_argument("--out", default=None, help="fp32 ONNX path (default: <weights>.onnx)")
+    parser.add_argument("--int8", action="store_true", help="also write a QDQ INT8 model")
+    parser.add_argument("--calib", default=None, help="video file or image dir for INT8 calibration")
+    parser.add_argument("--calib-frames", type=int, default=200)
+    parser.add_argument("--calib-stride", type=int, default=5, help="use every Nth frame")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.int8 and not args.calib:
+        parser.error("--int8 needs --calib (a clip from the target cameras)")
+
+    fp32_path = args.out or onnx_path_for(args.weights, "fp32")
+    export_onnx(args.weights, args.imgsz, fp32_path)
+
+    if args.int8:
+        quantize_int8(
+            fp32_path,
+            onnx_path_for(fp32_path, "int8"),
+            args.calib,
+            args.imgsz,
+            limit=args.calib_frames,
+            stride=args.calib_stride,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
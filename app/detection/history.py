@@ -0,0 +1,166 @@
+# app/detection/history.py
+
+from typing import NamedTuple
+
+import numpy as np
+
+from app.detection.detections import class_name
+
+
+class HistoryView(NamedTuple):
+    """
+    Zero-copy slices of a camera's history (oldest first).
+
+    Frame columns (one row per detection run): frame_ts, frame_count.
+    Detection columns (one row per detection): ts, bbox (N, 4), cls (COCO id), conf, track
+    (-1 = untracked). Rows of frame i are the next frame_count[i] detection rows.
+
+    Views alias the ring: valid until the writer laps them (capacity
+    appends later). Copy anything kept longer.
+    """
+
+    frame_ts: np.ndarray
+    frame_count: np.ndarray
+    ts: np.ndarray
+    bbox: np.ndarray
+    cls: np.ndarray
+    conf: np.ndarray
+    track: np.ndarray
+
+    def class_names(self) -> list:
+        return [class_name(c) for c in self.cls.tolist()]
+
+
+class DetectionHistory:
+    """
+    Fixed-capacity per-camera detection ring stored as NumPy columns.
+
+    Every row is written twice (at i and i + capacity), so the newest
+    `capacity` rows are always one contiguous slice: queries return views,
+    never copies. Single writer (the camera's DetectionWorker); readers
+    take no lock: they snapshot the write counters, which are published
+    after the rows are in place, and stay clear of the rows the next
+    append overwrites (one frame, `max_per_frame` detections).
+
+    The index must be non-decreasing for between()'s binary search, but
+    timestamps can come from clients (HTTP ingest frame_ts): append()
+    clamps each one to the previous, so a late or skewed stamp files the
+    run at the current end instead of corrupting range queries.
+    """
+
+    def __init__(self, frames: int = 1024, detections: int = 16384, max_per_frame: int = 256):
+        self.frames = frames
+        self.detections = detections
+        self.max_per_frame = min(max_per_frame, detections // 2)
+
+        F, D = frames, detections
+        self._frame_ts = np.zeros(2 * F, np.float64)
+        self._frame_start = np.zeros(2 * F, np.int64)   # absolute detection index
+        self._frame_count = np.zeros(2 * F, np.int32)
+
+        self._ts = np.zeros(2 * D, np.float64)
+        self._bbox = np.zeros((2 * D, 4), np.int32)
+        self._cls = np.zeros(2 * D, np.int16)
+        self._conf = np.zeros(2 * D, np.float32)
+        self._track = np.full(2 * D, -1, np.int32)
+
+        # Absolute write counters (published last)
+        self._frames_written = 0
+        self._dets_written = 0
+        self._last_ts = float("-inf")
+
+    def __len__(self):
+        f_lo, f_hi = self._window()
+        return f_hi - f_lo
+
+    # -------------------------------------------------
+    # Write path (single writer)
+    # -------------------------------------------------
+    def append(self, ts: float, dets: np.ndarray):
+        """dets: detections array (app.detection.detections); columns copied as-is."""
+        ts = self._last_ts = max(ts, self._last_ts)
+        D = self.detections
+        n = min(len(dets), self.max_per_frame)
+        start = self._dets_written
+
+        if n:
+            dets = dets[:n]
+            rows = (start + np.arange(n)) % D
+            for col, values in (
+                (self._ts, ts),
+                (self._bbox, dets["bbox"]),
+                (self._cls, dets["cls"]),
+                (self._conf, dets["conf"]),
+                (self._track, dets["track"]),
+            ):
+                col[rows] = values
+                col[rows + D] = values
+
+        i = self._frames_written % self.frames
+        for col, value in (
+            (self._frame_ts, ts),
+            (self._frame_start, start),
+            (self._frame_count, n),
+        ):
+            col[i] = value
+            col[i + self.frames] = value
+
+        self._dets_written = start + n
+        self._frames_written += 1
+
+    # -------------------------------------------------
+    # Read path (lock-free views)
+    # -------------------------------------------------
+    def _view(self, f_lo: int, f_hi: int) -> HistoryView:
+        """Absolute frame range [f_lo, f_hi) -> views (both still in the ring)."""
+        F, D = self.frames, self.detections
+
+        i0 = f_lo % F
+        i1 = i0 + (f_hi - f_lo)
+        frame_start = self._frame_start[i0:i1]
+        frame_count = self._frame_count[i0:i1]
+
+        if f_hi > f_lo:
+            d_lo = int(frame_start[0])
+            d_hi = int(frame_start[-1] + frame_count[-1])
+        else:
+            d_lo = d_hi = 0
+        j0 = d_lo % D
+        j1 = j0 + (d_hi - d_lo)
+
+        return HistoryView(
+            frame_ts=self._frame_ts[i0:i1],
+            frame_count=frame_count,
+            ts=self._ts[j0:j1],
+            bbox=self._bbox[j0:j1],
+            cls=self._cls[j0:j1],
+            conf=self._conf[j0:j1],
+            track=self._track[j0:j1],
+        )
+
+    def _window(self) -> tuple:
+        """Absolute frame range whose rows (frames AND detections) are intact."""
+        f_hi = self._frames_written
+        d_hi = self._dets_written
+        f_lo = max(0, f_hi - (self.frames - 1))
+
+        # Detection ring is the tighter bound when frames are busy
+        oldest_det = d_hi - (self.detections - self.max_per_frame)
+        if oldest_det > 0 and f_hi > f_lo:
+            starts = self._frame_start[f_lo % self.frames:f_lo % self.frames + (f_hi - f_lo)]
+            f_lo += int(np.searchsorted(starts, oldest_det, side="left"))
+        return f_lo, f_hi
+
+    def last(self, k: int) -> HistoryView:
+        """Last k detection runs (fewer if the ring holds fewer)."""
+        f_lo, f_hi = self._window()
+        return self._view(max(f_lo, f_hi - k), f_hi)
+
+    def between(self, t0: float, t1: float) -> HistoryView:
+        """Detection runs with t0 <= frame ts < t1."""
+        f_lo, f_hi = self._window()
+        i0 = f_lo % self.frames
+        frame_ts = self._frame_ts[i0:i0 + (f_hi - f_lo)]
+        lo = int(np.searchsorted(frame_ts, t0, side="left"))
+        hi = int(np.searchsorted(frame_ts, t1, side="left"))
+        return self._view(f_lo + lo, f_lo + hi)
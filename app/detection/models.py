@@ -3,6 +3,10 @@
 import logging
 import os
 
+from app.config import VEHICLE_MODEL_PATH
+from app.detection import detections
+from app.detection.registry import get_yolo_model
+
 logger = logging.getLogger(__name__)
 
 # COCO vehicle class IDs
@@ -12,10 +16,10 @@ VEHICLE_CLASSES = {2, 3, 5, 7}
 class VehicleDetector:
     """
     YOLO-based vehicle detector.
-    Lazy-loads model on first inference.
+    Uses the shared registry model (lazy-loaded on first inference).
     """
 
-    def __init__(self, model_path="yolov8n.pt", conf=0.4):
+    def __init__(self, model_path=VEHICLE_MODEL_PATH, conf=0.4):
         self.model_path = model_path
         self.conf = conf
         self.model = None
@@ -24,8 +28,7 @@ class VehicleDetector:
         if self.model is not None:
             return
 
-        from ultralytics import YOLO
-        self.model = YOLO(self.model_path)
+        self.model = get_yolo_model(self.model_path)
 
         logger.info(
             "[VehicleDetector] YOLO loaded (%s exists=%s)",
@@ -38,24 +41,16 @@ class VehicleDetector:
 
         self._load_model()
 
-        results = self.model(frame, conf=self.conf, verbose=False)
-
-        detections = []
-        for r in results:
-            for box in r.boxes:
-                cls = int(box.cls[0])
-                if cls not in VEHICLE_CLASSES:
-                    continue
-
-                detections.append({
-                    "class": cls,
-                    "confidence": float(box.conf[0]),
-                    "bbox": box.xyxy[0].tolist(),
-                })
+        dets = detections.from_model_output(
+            self.model(frame),
+            frame.shape,
+            classes=sorted(VEHICLE_CLASSES),
+            min_conf=self.conf,
+        )
 
         logger.info(
             "[TRACE] VehicleDetector produced %d detections",
-            len(detections),
+            len(dets),
         )
 
-        return detections
+        return dets
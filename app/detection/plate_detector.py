@@ -0,0 +1,182 @@
+# app/detection/plate_detector.py
+
+"""
+Learned plate detector: optional second stage over vehicle crops.
+
+Every backend is callable as detector(crops) -> one float32 array (N, 5)
+per crop: x1, y1, x2, y2, confidence (crop pixel coordinates, best first).
+All of a frame's vehicle crops go through the model as ONE batch.
+
+- torch:    ultralytics YOLO weights (.pt); ultralytics batches the list
+- onnx:     ONNX Runtime, YOLOv8 head with any number of plate classes
+- openvino: ONNX Runtime + OpenVINOExecutionProvider
+
+ONNX exports need a static SxS input; the batch axis may be dynamic
+(up to `batch` crops per run) or static (crops run in chunks of B).
+"""
+
+import logging
+import os
+
+import numpy as np
+
+from app.detection.backends import BACKENDS, IOU_THRESHOLD, LETTERBOX_FILL, nms, onnx_path_for, onnx_session
+
+logger = logging.getLogger("PlateDetector")
+
+PLATE_CONF_THRESHOLD = 0.35
+
+_EMPTY = np.zeros((0, 5), dtype=np.float32)
+
+
+class BatchLetterbox:
+    """
+    Letterbox crops of any size into slots of a fixed (B, 3, S, S) tensor.
+
+    Unlike backends.Letterbox (one camera, one constant frame size), every
+    crop in a batch has its own size: the canvas and a flat resize scratch
+    are allocated once at S x S and reused, never reallocated per size.
+    """
+
+    def __init__(self, size: int, batch: int):
+        self.size = size
+        self.canvas = np.full((size, size, 3), LETTERBOX_FILL, dtype=np.uint8)
+        self.scratch = np.empty(size * size * 3, dtype=np.uint8)
+        self.tensor = np.empty((batch, 3, size, size), dtype=np.float32)
+
+    def __call__(self, crop, slot: int) -> tuple:
+        """crop -> tensor[slot]; returns (scale, left, top) to undo the mapping."""
+        import cv2
+
+        h, w = crop.shape[:2]
+        scale = min(self.size / h, self.size / w)
+        nw, nh = max(1, int(round(w * scale))), max(1, int(round(h * scale)))
+        left, top = (self.size - nw) // 2, (self.size - nh) // 2
+
+        resized = self.scratch[:nh * nw * 3].reshape(nh, nw, 3)
+        cv2.resize(crop, (nw, nh), dst=resized, interpolation=cv2.INTER_LINEAR)
+
+        self.canvas[:] = LETTERBOX_FILL
+        self.canvas[top:top + nh, left:left + nw] = resized
+
+        # BGR HWC uint8 -> RGB CHW float32 [0,1], straight into the batch slot
+        np.multiply(
+            self.canvas.transpose(2, 0, 1)[::-1],
+            np.float32(1.0 / 255.0),
+            out=self.tensor[slot],
+            casting="unsafe",
+        )
+        return scale, left, top
+
+
+class TorchPlateDetector:
+    backend = "torch"
+
+    def __init__(self, weights: str, imgsz: int, conf: float = PLATE_CONF_THRESHOLD):
+        from ultralytics import YOLO
+
+        self.model = YOLO(weights)
+        self.imgsz = imgsz
+        self.conf = conf
+
+    def __call__(self, crops: list) -> list:
+        if not crops:
+            return []
+        results = self.model(list(crops), imgsz=self.imgsz, conf=self.conf, verbose=False)
+        return [r.boxes.data[:, :5].cpu().numpy().astype(np.float32, copy=False) for r in results]
+
+
+class OnnxPlateDetector:
+    def __init__(
+        self,
+        model_path: str,
+        *,
+        backend: str = "onnx",
+        batch: int = 8,
+        conf: float = PLATE_CONF_THRESHOLD,
+        iou: float = IOU_THRESHOLD,
+        threads: int = 0,
+    ):
+        self.session = onnx_session(model_path, backend, threads)
+        self.model_path = model_path
+        self.backend = backend
+
+        inp = self.session.get_inputs()[0]
+        if not isinstance(inp.shape[-1], int):
+            raise ValueError(f"{model_path}: dynamic input size {inp.shape}; export with a static imgsz")
+        self.input_name = inp.name
+        self.imgsz = int(inp.shape[-1])
+
+        # Static batch axis: always feed exactly B (unused slots are ignored)
+        self.static_batch = isinstance(inp.shape[0], int)
+        self.batch = int(inp.shape[0]) if self.static_batch else max(1, batch)
+
+        self.letterbox = BatchLetterbox(self.imgsz, self.batch)
+        self.conf = conf
+        self.iou = iou
+
+    def __call__(self, crops: list) -> list:
+        results = []
+        for i in range(0, len(crops), self.batch):
+            chunk = crops[i:i + self.batch]
+            layouts = [self.letterbox(crop, j) for j, crop in enumerate(chunk)]
+
+            tensor = self.letterbox.tensor
+            feed = tensor if self.static_batch else tensor[:len(chunk)]
+            out = self.session.run(None, {self.input_name: feed})[0]
+
+            for pred, crop, layout in zip(out, chunk, layouts):
+                results.append(self._decode(pred, crop.shape, *layout))
+        return results
+
+    def _decode(self, pred: np.ndarray, shape, scale: float, left: int, top: int) -> np.ndarray:
+        # YOLOv8 head: (4 + nc, anchors) -> (anchors, 4 + nc); any class is "a plate"
+        pred = pred.T
+        conf = pred[:, 4:].max(axis=1)
+        mask = conf >= self.conf
+        if not mask.any():
+            return _EMPTY
+
+        cxcywh = pred[mask, :4]
+        conf = conf[mask]
+
+        boxes = np.empty_like(cxcywh)
+        boxes[:, :2] = cxcywh[:, :2] - cxcywh[:, 2:] / 2
+        boxes[:, 2:] = cxcywh[:, :2] + cxcywh[:, 2:] / 2
+
+        keep = nms(boxes, conf, np.zeros(len(conf), dtype=np.float32), self.iou)
+        boxes, conf = boxes[keep], conf[keep]
+
+        # Undo letterbox -> crop pixels
+        h, w = shape[:2]
+        boxes[:, [0, 2]] = ((boxes[:, [0, 2]] - left) / scale).clip(0, w)
+        boxes[:, [1, 3]] = ((boxes[:, [1, 3]] - top) / scale).clip(0, h)
+
+        return np.column_stack((boxes, conf)).astype(np.float32, copy=False)
+
+
+def load_plate_detector(
+    weights: str,
+    *,
+    backend: str = "onnx",
+    imgsz: int = 320,
+    batch: int = 8,
+    conf: float = PLATE_CONF_THRESHOLD,
+    threads: int = 0,
+):
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown plate detector backend {backend!r} (expected one of {BACKENDS})")
+
+    if backend == "torch":
+        return TorchPlateDetector(weights, imgsz, conf=conf)
+
+    path = weights if os.path.splitext(weights)[1] == ".onnx" else onnx_path_for(weights)
+    detector = OnnxPlateDetector(path, backend=backend, batch=batch, conf=conf, threads=threads)
+    if detector.imgsz != imgsz:
+        logger.warning(
+            "[PLATE] %s was exported at %d px (PLATE_DETECTOR_INPUT_SIZE=%d)",
+            path,
+            detector.imgsz,
+            imgsz,
+        )
+    return detector
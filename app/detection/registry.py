@@ -0,0 +1,246 @@
+# app/detection/registry.py
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict
+
+import numpy as np
+
+from app.config import (
+    DETECTION_INPUT_SIZE,
+    DETECTOR_BACKEND,
+    DETECTOR_ONNX_PATH,
+    DETECTOR_PRECISION,
+    DETECTOR_THREADS,
+    PLATE_DETECTOR_BACKEND,
+    PLATE_DETECTOR_BATCH,
+    PLATE_DETECTOR_CONF,
+    PLATE_DETECTOR_INPUT_SIZE,
+    PLATE_DETECTOR_MODEL,
+    VEHICLE_MODEL_PATH,
+)
+from app.detection.backends import COCO_VEHICLE_CLASSES, TorchDetector, load_detector
+from app.detection.plate_detector import load_plate_detector
+from app.metrics import REGISTRY
+
+logger = logging.getLogger("ModelRegistry")
+
+MODEL_LOAD_SECONDS = REGISTRY.gauge(
+    "traffic_model_load_seconds",
+    "Wall time to load a model (0 until loaded)",
+    ("model",),
+)
+
+MODEL_MEMORY_BYTES = REGISTRY.gauge(
+    "traffic_model_memory_bytes",
+    "Process RSS growth while loading the model",
+    ("model",),
+)
+
+MODEL_WARMUP_SECONDS = REGISTRY.gauge(
+    "traffic_model_warmup_seconds",
+    "Wall time of the first (warmup) inference",
+    ("model",),
+)
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return 0
+
+
+def _param_bytes(model) -> int:
+    # Torch: parameter tensors; ONNX: weights file size; anything else -> 0
+    try:
+        if getattr(model, "model_path", None):
+            return os.path.getsize(model.model_path)
+        return sum(p.numel() * p.element_size() for p in model.model.parameters())
+    except Exception:
+        return 0
+
+
+def _load_vehicle_detector():
+    return load_detector(
+        VEHICLE_MODEL_PATH,
+        backend=DETECTOR_BACKEND,
+        precision=DETECTOR_PRECISION,
+        imgsz=DETECTION_INPUT_SIZE,
+        classes=COCO_VEHICLE_CLASSES.keys(),
+        onnx_path=DETECTOR_ONNX_PATH,
+        threads=DETECTOR_THREADS,
+    )
+
+
+def _load_plate_detector():
+    return load_plate_detector(
+        PLATE_DETECTOR_MODEL,
+        backend=PLATE_DETECTOR_BACKEND,
+        imgsz=PLATE_DETECTOR_INPUT_SIZE,
+        batch=PLATE_DETECTOR_BATCH,
+        conf=PLATE_DETECTOR_CONF,
+        threads=DETECTOR_THREADS,
+    )
+
+
+# Inference on one handle is serialised: at most this many inference-seconds
+# per wall second, however many cores there are (DetectionScheduler caps its budget)
+HANDLE_CONCURRENCY = 1
+
+# Per thread: seconds spent inside model calls (lock held), queueing excluded
+_inference_clock = threading.local()
+
+
+def thread_inference_seconds() -> float:
+    """Cumulative model time of the calling thread, across all handles."""
+    return getattr(_inference_clock, "seconds", 0.0)
+
+
+class ModelHandle:
+    """
+    One loaded model shared by every caller.
+
+    handle(frame) -> (N, 6) [x1, y1, x2, y2, conf, cls] (app.detection.backends);
+    plate models: handle(crops) -> [(N, 5)] (app.detection.plate_detector).
+    Ultralytics predictors and the ONNX input buffers keep per-call state,
+    so __call__ serialises inference on the handle's lock (HANDLE_CONCURRENCY).
+    Time inside the lock is added to thread_inference_seconds().
+    """
+
+    def __init__(self, name: str, model, load_sec: float, rss_bytes: int):
+        self.name = name
+        self.model = model
+        self.load_sec = load_sec
+        self.rss_bytes = rss_bytes
+        self.param_bytes = _param_bytes(model)
+        self.warmup_sec = None
+        self._lock = threading.Lock()
+
+    def __call__(self, frame):
+        with self._lock:
+            t0 = time.perf_counter()
+            try:
+                return self.model(frame)
+            finally:
+                _inference_clock.seconds = thread_inference_seconds() + time.perf_counter() - t0
+
+    def info(self) -> dict:
+        return {
+            "backend": getattr(self.model, "backend", None),
+            "load_sec": round(self.load_sec, 3),
+            "rss_bytes": self.rss_bytes,
+            "param_bytes": self.param_bytes,
+            "warmup_sec": None if self.warmup_sec is None else round(self.warmup_sec, 3),
+        }
+
+
+class ModelRegistry:
+    """
+    Process-wide model cache.
+
+    - get(name) loads on first use (exactly once, even under concurrent callers)
+    - warmup(name) runs one dummy inference so the first real frame
+      doesn't pay for lazy kernel / graph init
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], object]] = {}
+        self._handles: Dict[str, ModelHandle] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], object]):
+        with self._lock:
+            self._loaders.setdefault(name, loader)
+            self._load_locks.setdefault(name, threading.Lock())
+
+    def get(self, name: str) -> ModelHandle:
+        handle = self._handles.get(name)
+        if handle is not None:
+            return handle
+
+        with self._lock:
+            if name not in self._loaders:
+                raise KeyError(f"unknown model: {name}")
+            load_lock = self._load_locks[name]
+
+        with load_lock:
+            handle = self._handles.get(name)
+            if handle is not None:
+                return handle
+
+            rss_before = _rss_bytes()
+            t0 = time.perf_counter()
+            model = self._loaders[name]()
+            load_sec = time.perf_counter() - t0
+            rss = max(0, _rss_bytes() - rss_before)
+
+            handle = ModelHandle(name, model, load_sec, rss)
+            self._handles[name] = handle
+
+        MODEL_LOAD_SECONDS.labels(name).set(load_sec)
+        MODEL_MEMORY_BYTES.labels(name).set(rss)
+        logger.info(
+            "[MODEL] loaded | name=%s load=%.2fs rss=+%.1fMB params=%.1fMB",
+            name,
+            load_sec,
+            rss / 1e6,
+            handle.param_bytes / 1e6,
+        )
+        return handle
+
+    def warmup(self, name: str, imgsz: int = DETECTION_INPUT_SIZE, sample=None) -> ModelHandle:
+        """sample: model input for the dummy run (default: one black imgsz x imgsz frame)."""
+        handle = self.get(name)
+        if handle.warmup_sec is not None:
+            return handle
+
+        if sample is None:
+            sample = np.zeros((imgsz, imgsz, 3), dtype=np.uint8)
+        t0 = time.perf_counter()
+        handle(sample)
+        handle.warmup_sec = time.perf_counter() - t0
+
+        MODEL_WARMUP_SECONDS.labels(name).set(handle.warmup_sec)
+        logger.info("[MODEL] warm | name=%s first_inference=%.2fs", name, handle.warmup_sec)
+        return handle
+
+    def loaded(self) -> dict:
+        return {name: h.info() for name, h in list(self._handles.items())}
+
+
+# 🔒 Singleton (process-wide)
+MODEL_REGISTRY = ModelRegistry()
+
+VEHICLE_MODEL = "vehicle"
+MODEL_REGISTRY.register(VEHICLE_MODEL, _load_vehicle_detector)
+
+
+PLATE_MODEL = "plate"
+if PLATE_DETECTOR_MODEL:
+    MODEL_REGISTRY.register(PLATE_MODEL, _load_plate_detector)
+
+
+def get_vehicle_model() -> ModelHandle:
+    return MODEL_REGISTRY.get(VEHICLE_MODEL)
+
+
+def get_plate_model() -> ModelHandle | None:
+    """None when no PLATE_DETECTOR_MODEL is configured (Canny proposals)."""
+    if not PLATE_DETECTOR_MODEL:
+        return None
+    return MODEL_REGISTRY.get(PLATE_MODEL)
+
+
+def get_yolo_model(path: str) -> ModelHandle:
+    """Shared torch handle for arbitrary YOLO weights (one load per path)."""
+    if path == VEHICLE_MODEL_PATH:
+        return get_vehicle_model()
+
+    name = f"yolo:{path}"
+    MODEL_REGISTRY.register(name, lambda: TorchDetector(path, DETECTION_INPUT_SIZE))
+    return MODEL_REGISTRY.get(name)
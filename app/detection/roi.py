@@ -0,0 +1,148 @@
+# app/detection/roi.py
+
+import logging
+from typing import Callable, List, Sequence
+
+import numpy as np
+
+from app.detection import detections
+from app.metrics import REGISTRY
+
+logger = logging.getLogger("DetectionROI")
+
+ROI_PIXEL_FRACTION = REGISTRY.gauge(
+    "traffic_roi_pixel_fraction",
+    "Fraction of frame pixels fed to the detector (1 = full frame)",
+    ("camera",),
+)
+
+# A detection belongs to the ROI when this point of its bbox is inside the
+# polygon mask: bottom-centre = where the vehicle touches the road
+ANCHOR_Y = 1.0
+
+
+def _merge_rects(rects: list) -> list:
+    """Union overlapping rects so no pixel is inferred twice."""
+    rects = sorted(rects)
+    merged = True
+    while merged:
+        merged = False
+        out = []
+        for r in rects:
+            for i, m in enumerate(out):
+                if r[0] < m[2] and m[0] < r[2] and r[1] < m[3] and m[1] < r[3]:
+                    out[i] = (min(r[0], m[0]), min(r[1], m[1]), max(r[2], m[2]), max(r[3], m[3]))
+                    merged = True
+                    break
+            else:
+                out.append(r)
+        rects = out
+    return rects
+
+
+class DetectionROI:
+    """
+    Per-camera ROI polygons that crop detector input.
+
+    polygons: list of [(x, y), ...] in NORMALISED [0..1] picture coordinates
+    (resolution independent: SUB stream, reduced decode and MAIN frames all
+    share one config). On letterboxed frames they span the content rect
+    (FrameHub.content_rect), not the padding.
+
+    - inference runs only on the tight bounding rect of each ROI
+      (overlapping rects are merged)
+    - boxes are mapped back to frame coordinates
+    - detections whose bottom-centre falls outside the polygon mask are dropped
+
+    Rects + mask are compiled once per frame size + content rect.
+    """
+
+    def __init__(self, polygons: Sequence[Sequence[Sequence[float]]]):
+        self.polygons = [np.asarray(p, dtype=np.float32).reshape(-1, 2) for p in polygons]
+        for p in self.polygons:
+            if len(p) < 3:
+                raise ValueError(f"ROI polygon needs >= 3 points, got {len(p)}")
+            if p.min() < 0.0 or p.max() > 1.0:
+                raise ValueError("ROI polygon points must be normalised to [0, 1]")
+
+        self._shape = None
+        self._content = None
+        self.rects: List[tuple] = []
+        self.mask = None
+
+    def _compile(self, h: int, w: int, content: tuple | None = None):
+        cx, cy, cw, ch = content or (0.0, 0.0, float(w), float(h))
+        if self._shape == (h, w) and self._content == (cx, cy, cw, ch):
+            return
+        import cv2
+
+        mask = np.zeros((h, w), dtype=np.uint8)
+        rects = []
+        for poly in self.polygons:
+            pts = np.round(poly * (cw - 1, ch - 1) + (cx, cy)).astype(np.int32)
+            cv2.fillPoly(mask, [pts], 1)
+            x, y, rw, rh = cv2.boundingRect(pts)
+            rects.append((x, y, min(w, x + rw), min(h, y + rh)))
+
+        self.rects = _merge_rects(rects)
+        self.mask = mask
+        self._shape = (h, w)
+        self._content = (cx, cy, cw, ch)
+
+        area = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in self.rects)
+        logger.info(
+            "[ROI] compiled | frame=%dx%d rects=%d inferred=%.0f%% of pixels",
+            w,
+            h,
+            len(self.rects),
+            100.0 * area / max(h * w, 1),
+        )
+
+    def pixel_fraction(self) -> float | None:
+        if self._shape is None:
+            return None
+        h, w = self._shape
+        area = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in self.rects)
+        return area / max(h * w, 1)
+
+    def inside(self, boxes: np.ndarray) -> np.ndarray:
+        """(N, 4) frame-coordinate boxes -> bool mask: anchor point inside the ROI."""
+        h, w = self._shape
+        boxes = boxes.astype(np.int64)
+        ax = np.clip((boxes[:, 0] + boxes[:, 2]) // 2, 0, w - 1)
+        ay = np.clip(boxes[:, 1] + ((boxes[:, 3] - boxes[:, 1]) * ANCHOR_Y).astype(np.int64) - 1, 0, h - 1)
+        return self.mask[ay, ax].astype(bool)
+
+    def contains(self, bbox) -> bool:
+        return bool(self.inside(np.asarray(bbox).reshape(1, 4))[0])
+
+    def detect(self, frame, detect_fn: Callable, content: tuple | None = None) -> np.ndarray:
+        """
+        detect_fn(frame) -> detections array (app.detection.detections), run per ROI rect.
+        content: (x, y, w, h) of the picture in a letterboxed frame (None = whole frame).
+        """
+        h, w = frame.shape[:2]
+        self._compile(h, w, content)
+
+        parts = []
+        for rx1, ry1, rx2, ry2 in self.rects:
+            crop = frame[ry1:ry2, rx1:rx2]
+            if crop.size == 0:
+                continue
+
+            dets = detections.shifted(detect_fn(crop), rx1, ry1)
+            parts.append(dets[self.inside(dets["bbox"])])
+
+        return detections.concat(parts)
+
+
+def roi_from_config(cam_id: str, cam_cfg: dict | None) -> DetectionROI | None:
+    """CAMERAS[cam]["roi"] -> DetectionROI (None = full frame)."""
+    polygons = (cam_cfg or {}).get("roi")
+    if not polygons:
+        ROI_PIXEL_FRACTION.labels(cam_id).set(1.0)
+        return None
+
+    roi = DetectionROI(polygons)
+    ROI_PIXEL_FRACTION.labels(cam_id).set_function(lambda: roi.pixel_fraction() or 1.0)
+    return roi
@@ -0,0 +1,257 @@
+# app/detection/scheduler.py
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+logger = logging.getLogger("DetectionScheduler")
+
+# Used for a camera's per-tick cost until it has run inference once
+DEFAULT_INFERENCE_SEC = 0.05
+
+# Cameras never drop below this, even when the budget is blown
+FLOOR_FPS = 0.05
+
+
+@dataclass
+class _CamState:
+    latency: float | None = None    # EWMA seconds per inference
+    vehicles: float = 0.0           # EWMA vehicles per inference
+    run_share: float = 1.0          # EWMA share of ticks that ran inference (motion gate)
+    motion: bool | None = None
+    misses: int = 0
+    # previous cumulative counters (worker totals)
+    prev: Tuple[int, int, float, int] = (0, 0, 0.0, 0)
+
+
+def plan_rates(
+    states: Dict[str, _CamState],
+    *,
+    budget: float,
+    fps_bounds: Tuple[float, float],
+    anpr_bounds: Tuple[float, float],
+    busy_vehicles: float,
+) -> Tuple[Dict[str, Tuple[float, float]], float]:
+    """
+    Pure rate plan: cam_id -> (fps, anpr_fps), plus the planned load
+    (inference-seconds per second).
+
+    1. activity in [0, 1] from recent vehicle count (motion counts as >= 0.25)
+    2. desired fps = lo + (hi - lo) * activity
+    3. cost per camera = fps * latency * run_share
+    4. over budget: shrink the part above `lo` first (busy cameras keep
+       their lead); if even `lo` everywhere doesn't fit, scale everyone
+       proportionally (graceful degradation, never below FLOOR_FPS)
+    """
+    lo, hi = fps_bounds
+    a_lo, a_hi = anpr_bounds
+
+    known = [s.latency for s in states.values() if s.latency]
+    fallback = sum(known) / len(known) if known else DEFAULT_INFERENCE_SEC
+
+    desired, activity, unit = {}, {}, {}
+    for cam_id, s in states.items():
+        act = min(1.0, s.vehicles / busy_vehicles) if busy_vehicles > 0 else 1.0
+        if s.motion:
+            act = max(act, 0.25)
+        activity[cam_id] = act
+        desired[cam_id] = lo + (hi - lo) * act
+        unit[cam_id] = (s.latency or fallback) * max(s.run_share, 0.05)
+
+    cost_min = sum(lo * unit[c] for c in states)
+    cost_desired = sum(desired[c] * unit[c] for c in states)
+
+    if cost_desired <= budget:
+        fps = desired
+    elif cost_min <= budget:
+        f = (budget - cost_min) / max(cost_desired - cost_min, 1e-9)
+        fps = {c: lo + (desired[c] - lo) * f for c in states}
+    else:
+        f = budget / max(cost_min, 1e-9)
+        fps = {c: max(FLOOR_FPS, lo * f) for c in states}
+
+    plan = {}
+    for cam_id in states:
+        # ANPR follows activity, throttled by the same budget squeeze
+        # (base and activity share scaled separately: busy stays >= quiet)
+        squeeze = min(1.0, fps[cam_id] / desired[cam_id]) if desired[cam_id] else 1.0
+        base = a_lo * min(1.0, fps[cam_id] / lo) if lo else a_lo
+        anpr = base + (a_hi - a_lo) * activity[cam_id] * squeeze
+        plan[cam_id] = (round(fps[cam_id], 3), round(min(anpr, fps[cam_id]), 3))
+
+    load = sum(plan[c][0] * unit[c] for c in states)
+    return plan, load
+
+
+class DetectionScheduler(threading.Thread):
+    """
+    Adjusts every DetectionWorker's detection / ANPR rate within bounds,
+    keeping total inference time under a global budget
+    (`budget` = inference-seconds per wall second, i.e. cores for the detector),
+    capped at `concurrency`: cameras sharing one serialised model handle
+    can never use more than 1 inference-second per second.
+
+    Inputs per camera (EWMA over `period` windows): inference latency,
+    vehicles per inference, share of ticks the motion gate let through,
+    current motion. Starts lazily on the first register().
+    """
+
+    def __init__(
+        self,
+        *,
+        budget: float,
+        fps_bounds: Tuple[float, float],
+        anpr_bounds: Tuple[float, float],
+        concurrency: float | None = None,
+        period: float = 2.0,
+        busy_vehicles: float = 4.0,
+        alpha: float = 0.5,
+    ):
+        super().__init__(daemon=True, name="DetectionScheduler")
+        self.budget = budget if concurrency is None else min(budget, concurrency)
+        self.fps_bounds = fps_bounds
+        self.anpr_bounds = anpr_bounds
+        self.period = period
+        self.busy_vehicles = busy_vehicles
+        self.alpha = alpha
+
+        self._workers = {}
+        self._states: Dict[str, _CamState] = {}
+        self._lock = threading.Lock()
+        self._tick_lock = threading.Lock()
+        self._started = False
+        self.load = 0.0
+        self.running = True
+
+    def register(self, worker):
+        with self._lock:
+            self._workers[worker.cam_id] = worker
+            # Optimistic prior: a new camera starts mid-range, not at the floor
+            self._states[worker.cam_id] = _CamState(vehicles=self.busy_vehicles / 2)
+            if not self._started:
+                self._started = True
+                self.start()
+        # New camera: replan now instead of waiting a period
+        self.tick()
+
+    def unregister(self, cam_id: str):
+        with self._lock:
+            self._workers.pop(cam_id, None)
+            self._states.pop(cam_id, None)
+
+    def run(self):
+        logger.info(
+            "[SCHED] started | budget=%.2f fps=%s anpr=%s",
+            self.budget,
+            self.fps_bounds,
+            self.anpr_bounds,
+        )
+        while self.running:
+            time.sleep(self.period)
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("[SCHED] tick failed")
+
+    def _observe(self, worker, s: _CamState):
+        ticks, inferences, inference_sec, vehicles = (
+            worker.frames_processed,
+            worker.inferences,
+            worker.inference_sec,
+            worker.vehicles_seen,
+        )
+        p_ticks, p_inf, p_sec, p_veh = s.prev
+        d_ticks, d_inf = ticks - p_ticks, inferences - p_inf
+        s.prev = (ticks, inferences, inference_sec, vehicles)
+
+        a = self.alpha
+        if d_inf > 0:
+            latency = (inference_sec - p_sec) / d_inf
+            s.latency = latency if s.latency is None else a * latency + (1 - a) * s.latency
+            s.vehicles = a * ((vehicles - p_veh) / d_inf) + (1 - a) * s.vehicles
+        if d_ticks > 0:
+            s.run_share = a * (d_inf / d_ticks) + (1 - a) * s.run_share
+
+        gate = worker.motion_gate
+        s.motion = gate.last_motion >= gate.threshold if gate is not None else None
+        s.misses = worker.deadline_misses
+
+    def tick(self):
+        with self._lock:
+            for cam_id in [c for c, w in self._workers.items() if not w.is_alive()]:
+                self._workers.pop(cam_id)
+                self._states.pop(cam_id)
+            workers = dict(self._workers)
+            states = {c: self._states[c] for c in workers}
+
+        if not workers:
+            return
+
+        with self._tick_lock:
+            self._apply(workers, states)
+
+    def _apply(self, workers: dict, states: Dict[str, _CamState]):
+        for cam_id, worker in workers.items():
+            self._observe(worker, states[cam_id])
+
+        plan, self.load = plan_rates(
+            states,
+            budget=self.budget,
+            fps_bounds=self.fps_bounds,
+            anpr_bounds=self.anpr_bounds,
+            busy_vehicles=self.busy_vehicles,
+        )
+
+        for cam_id, (fps, anpr_fps) in plan.items():
+            worker = workers[cam_id]
+            if (fps, anpr_fps) != (worker.fps, worker.anpr_fps):
+                worker.set_rates(fps, anpr_fps)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            workers = dict(self._workers)
+            states = {c: self._states[c] for c in workers}
+
+        return {
+            "budget": self.budget,
+            "planned_load": round(self.load, 3),
+            "fps_bounds": self.fps_bounds,
+            "anpr_bounds": self.anpr_bounds,
+            "cameras": {
+                cam_id: {
+                    "fps": w.fps,
+                    "anpr_fps": w.anpr_fps,
+                    "latency_ms": None if states[cam_id].latency is None else round(states[cam_id].latency * 1000, 2),
+                    "vehicles": round(states[cam_id].vehicles, 2),
+                    "run_share": round(states[cam_id].run_share, 3),
+                    "motion": states[cam_id].motion,
+                    "deadline_misses": w.deadline_misses,
+                }
+                for cam_id, w in workers.items()
+            },
+        }
+
+
+def _build() -> DetectionScheduler | None:
+    from app.config import (
+        ADAPTIVE_SCHEDULER,
+        ANPR_FPS_BOUNDS,
+        DETECTION_BUDGET,
+        DETECTION_FPS_BOUNDS,
+    )
+    from app.detection.registry import HANDLE_CONCURRENCY
+
+    if not ADAPTIVE_SCHEDULER:
+        return None
+    return DetectionScheduler(
+        budget=DETECTION_BUDGET,
+        concurrency=HANDLE_CONCURRENCY,
+        fps_bounds=DETECTION_FPS_BOUNDS,
+        anpr_bounds=ANPR_FPS_BOUNDS,
+    )
+
+
+# 🔒 Singleton (None when ADAPTIVE_SCHEDULER=0: fixed DETECTION_FPS / ANPR_FPS)
+DETECTION_SCHEDULER = _build()
@@ -1,57 +1,21 @@
 # app/detection/vehicle_detector.py
 import logging
-from ultralytics import YOLO
 
-logger = logging.getLogger("VehicleDetector")
-
-# Load once at import (important for performance)
-_MODEL = YOLO("yolov8n.pt")
+from app.detection import detections
+from app.detection.registry import get_vehicle_model
 
-# COCO vehicle classes
-VEHICLE_CLASSES = {
-    2: "car",
-    3: "motorcycle",
-    5: "bus",
-    7: "truck",
-}
+logger = logging.getLogger("VehicleDetector")
 
 
 def detect_vehicles(frame):
     """
-    Run YOLO vehicle detection on a frame.
+    Run vehicle detection on a frame (backend per DETECTOR_BACKEND).
 
     Returns:
-        List[dict]:
-            {
-                "bbox": (x1, y1, x2, y2),
-                "confidence": float,
-                "class": str
-            }
+        np.ndarray (DETECTION_DTYPE): one row per vehicle
+        (bbox int32[4] clamped to the frame, conf, cls COCO id, track -1)
     """
-    results = _MODEL(frame, verbose=False)
-
-    h, w = frame.shape[:2]
-    vehicles = []
-
-    for r in results:
-        for box in r.boxes:
-            cls_id = int(box.cls)
-            if cls_id not in VEHICLE_CLASSES:
-                continue
-
-            x1, y1, x2, y2 = map(int, box.xyxy[0])
-
-            # Clamp bounds
-            x1 = max(0, x1)
-            y1 = max(0, y1)
-            x2 = min(w, x2)
-            y2 = min(h, y2)
-
-            vehicles.append({
-                "bbox": (x1, y1, x2, y2),
-                "confidence": float(box.conf),
-                "class": VEHICLE_CLASSES[cls_id],
-            })
+    dets = detections.from_model_output(get_vehicle_model()(frame), frame.shape)
 
-    logger.debug("Detected %d vehicles", len(vehicles))
-    return vehicles
+    logger.debug("Detected %d vehicles", len(dets))
+    return dets
@@ -4,6 +4,8 @@ import time
 import logging
 from typing import List, Dict
 
+from app.detection import detections as dets
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,7 +28,9 @@ class EventsEngine:
 
     def process_camera(self, cam_id: str) -> List[Dict]:
         try:
-            detections = self.detection_manager.get(cam_id)
+            entry = self.detection_manager.get(cam_id)
+            # None = nothing recent (camera idle / stale): no events, not a crash
+            detections = dets.to_dicts(entry["vehicles"]) if entry is not None else []
 
             logger.info(
                 "[TRACE][%s] Event engine received %d detections",
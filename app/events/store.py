@@ -1,6 +1,6 @@
 # app/events/store.py
 
-from typing import List
+from typing import Iterable, List
 from app.events.schema import TrafficEvent
 import threading
 
@@ -22,6 +22,16 @@ class InMemoryEventStore:
         with self._lock:
             self._events.append(event)
 
+    def add_many(self, events: Iterable[TrafficEvent]):
+        """
+        Batch insert: ONE lock acquisition for the whole batch.
+        """
+        events = list(events)
+        if not events:
+            return
+        with self._lock:
+            self._events.extend(events)
+
     def all(self) -> List[TrafficEvent]:
         with self._lock:
             return list(self._events)
@@ -1 +0,0 @@
-print("🖼️ app.frames package loaded")
\ No newline at end of file
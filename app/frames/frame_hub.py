@@ -1,46 +1,136 @@
 # app/frames/frame_hub.py
 
 import threading
+import time
 import logging
+from typing import NamedTuple
+
+from app.tracing import new_trace_id
 
 logger = logging.getLogger("FrameHub")
 
+# Channels: one camera can publish several renditions of the same stream
+DETECT = "detect"     # detector input (default; HTTP ingest, replay, single-output RTSP)
+PREVIEW = "preview"   # MJPEG preview rendition (dual-output RTSP)
+
+
+def content_rect(frame_w: int, frame_h: int, source_size=None) -> tuple:
+    """
+    (x, y, w, h) of the picture inside a letterboxed frame_w x frame_h
+    frame (ffmpeg scale=decrease + centred pad). Without the source size
+    the picture is assumed to fill the frame.
+    """
+    if not source_size:
+        return 0.0, 0.0, float(frame_w), float(frame_h)
+    sw, sh = source_size
+    f = min(frame_w / sw, frame_h / sh)
+    w, h = sw * f, sh * f
+    return (frame_w - w) / 2, (frame_h - h) / 2, w, h
+
+
+class FrameEntry(NamedTuple):
+    frame: object
+    ts: float      # capture / arrival time (epoch seconds)
+    seq: int       # per-camera + channel, monotonically increasing
+    trace_id: str | None = None   # app.tracing: follows the frame to its events
+
 
 class FrameHub:
     """
     Stage-2 overwrite-only hub.
     MAIN frames only.
+
+    Sources: RTSP readers AND HTTP ingest (same path downstream).
+    Each camera holds the latest frame per channel (DETECT by default).
+    RTSP readers also report the native picture size they letterbox
+    (set_source_size), so normalised polygons land on the picture.
     """
 
     def __init__(self):
-        self._frames = {}
+        self._frames = {}   # cam_id -> {channel: FrameEntry}
         self._locks = {}
+        self._seq = {}      # cam_id -> {channel: seq}
+        self._sources = {}  # cam_id -> native (w, h) of a letterboxed source
 
     def register(self, cam_id: str):
         if cam_id not in self._locks:
             self._locks[cam_id] = threading.Lock()
-            self._frames[cam_id] = None
+            self._frames[cam_id] = {}
+            self._seq[cam_id] = {}
             logger.info(f"[FrameHub] Registered {cam_id}")
 
-    def update(self, cam_id: str, frame):
+    def update(
+        self,
+        cam_id: str,
+        frame,
+        ts: float | None = None,
+        channel: str = DETECT,
+        trace_id: str | None = None,
+    ):
+        lock = self._locks.get(cam_id)
+        if not lock:
+            return
+        with lock:
+            logger.debug(f"[FrameHub] Updating frame for {cam_id}/{channel}")
+            seqs = self._seq[cam_id]
+            seq = seqs.get(channel, 0) + 1
+            seqs[channel] = seq
+            self._frames[cam_id][channel] = FrameEntry(
+                frame,
+                time.time() if ts is None else ts,
+                seq,
+                trace_id or new_trace_id(),
+            )
+
+    def set_source_size(self, cam_id: str, size: tuple):
+        self._sources[cam_id] = size
+
+    def source_size(self, cam_id: str) -> tuple | None:
+        """Native (w, h) behind the camera's letterboxed frames; None = frames are the picture."""
+        return self._sources.get(cam_id)
+
+    def content_rect(self, cam_id: str, shape) -> tuple:
+        """(x, y, w, h) of the picture inside one of the camera's frames."""
+        return content_rect(shape[1], shape[0], self._sources.get(cam_id))
+
+    def clear(self, cam_id: str, channel: str):
+        """Drop a channel (its source stopped producing it)."""
         lock = self._locks.get(cam_id)
         if not lock:
             return
         with lock:
-            logger.debug(f"[FrameHub] Updating frame for {cam_id}")
-            self._frames[cam_id] = frame
+            self._frames[cam_id].pop(channel, None)
 
     # -------------------------------------------------
     # Read path
     # -------------------------------------------------
-    def latest(self, cam_id: str):
+    def latest_entry(self, cam_id: str, channel: str = DETECT) -> FrameEntry | None:
         lock = self._locks.get(cam_id)
         if not lock:
             return None
         with lock:
-            logger.debug(f"[FrameHub] Retrieving latest frame for {cam_id}")
-            return self._frames.get(cam_id)
+            return self._frames[cam_id].get(channel)
+
+    def latest(self, cam_id: str, channel: str = DETECT):
+        entry = self.latest_entry(cam_id, channel)
+        logger.debug(f"[FrameHub] Retrieving latest frame for {cam_id}/{channel}")
+        return entry.frame if entry is not None else None
+
+    def latest_preview(self, cam_id: str):
+        """PREVIEW rendition, falling back to DETECT for single-output sources."""
+        frame = self.latest(cam_id, PREVIEW)
+        return frame if frame is not None else self.latest(cam_id, DETECT)
 
     # 🔹 Compatibility alias (DetectionWorker expects this)
     def get_latest(self, cam_id: str):
         return self.latest(cam_id)
+
+    def camera_ids(self):
+        return list(self._locks.keys())
+
+    def channels(self, cam_id: str) -> list:
+        lock = self._locks.get(cam_id)
+        if not lock:
+            return []
+        with lock:
+            return list(self._frames[cam_id].keys())
@@ -0,0 +1,211 @@
+# app/frames/mock.py
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from app.detection import detections
+from app.frames.base import FrameProvider
+
+logger = logging.getLogger("MockFrameProvider")
+
+# Detector-facing class label for every synthetic object
+MOCK_CLASS = "car"
+
+
+class _MovingBox:
+    __slots__ = ("x", "y", "w", "h", "vx", "vy", "color")
+
+    def __init__(self, rng: np.random.Generator, width: int, height: int):
+        self.w = int(rng.integers(width // 10, width // 5))
+        self.h = int(self.w * rng.uniform(0.6, 0.9))
+        self.x = float(rng.integers(0, width - self.w))
+        self.y = float(rng.integers(0, height - self.h))
+        self.vx = float(rng.uniform(-8, 8))
+        self.vy = float(rng.uniform(-4, 4))
+        self.color = tuple(int(c) for c in rng.integers(60, 230, size=3))
+
+    def step(self, width: int, height: int):
+        self.x += self.vx
+        self.y += self.vy
+        if not 0 <= self.x <= width - self.w:
+            self.vx = -self.vx
+            self.x = min(max(self.x, 0), width - self.w)
+        if not 0 <= self.y <= height - self.h:
+            self.vy = -self.vy
+            self.y = min(max(self.y, 0), height - self.h)
+
+    def bbox(self):
+        x1, y1 = int(self.x), int(self.y)
+        return (x1, y1, x1 + self.w, y1 + self.h)
+
+
+class _MockCamera:
+    def __init__(self, seed: int, width: int, height: int, objects: int):
+        self.rng = np.random.default_rng(seed)
+        self.width = width
+        self.height = height
+        self.background = None   # lazy: idle cameras of a shared clip never render
+        self.boxes = [_MovingBox(self.rng, width, height) for _ in range(objects)]
+
+    def render(self):
+        if self.background is None:
+            self.background = self.rng.integers(
+                30, 80, size=(self.height, self.width, 3), dtype=np.uint8
+            )
+        frame = self.background.copy()
+        bboxes = []
+        for box in self.boxes:
+            box.step(self.width, self.height)
+            x1, y1, x2, y2 = box.bbox()
+            frame[y1:y2, x1:x2] = box.color
+            bboxes.append((x1, y1, x2, y2))
+        return frame, bboxes
+
+
+class MockFrameProvider(FrameProvider):
+    """
+    Synthetic multi-camera source: procedurally moving rectangles.
+
+    - prerendered=N: render `clips` clips of N frames ONCE; cameras cycle
+      them at staggered offsets (generator cost ~0, so load tests measure
+      the engine, not the mock). Memory = clips * N * W * H * 3 bytes.
+    - prerendered=0: render every frame per camera (independent motion)
+    - Ground-truth boxes are kept per frame object for StubDetector
+    """
+
+    def __init__(
+        self,
+        camera_ids: List[str],
+        *,
+        width: int = 1280,
+        height: int = 720,
+        objects: int = 4,
+        prerendered: int = 25,
+        clips: int = 1,
+        seed: int = 0,
+    ):
+        self.width = width
+        self.height = height
+        self.prerendered = prerendered
+
+        self._cameras = {
+            cam_id: _MockCamera(seed + idx, width, height, objects)
+            for idx, cam_id in enumerate(camera_ids)
+        }
+        self._index = {cam_id: 0 for cam_id in camera_ids}
+
+        # id(frame) -> bboxes (bounded; prerendered frames are permanent)
+        self._truth: "OrderedDict[int, list]" = OrderedDict()
+        self._truth_lock = threading.Lock()
+        self._truth_cap = max(4 * len(camera_ids), 64)
+
+        self._clips: Dict[str, list] = {}
+        if prerendered:
+            rendered = []
+            for cam in list(self._cameras.values())[:max(clips, 1)]:
+                clip = []
+                for _ in range(prerendered):
+                    frame, bboxes = cam.render()
+                    frame.setflags(write=False)
+                    clip.append(frame)
+                    self._truth[id(frame)] = bboxes
+                rendered.append(clip)
+
+            for idx, cam_id in enumerate(camera_ids):
+                self._clips[cam_id] = rendered[idx % len(rendered)]
+                self._index[cam_id] = idx * 7   # stagger shared clips
+
+    def camera_ids(self):
+        return list(self._cameras.keys())
+
+    def get_frame(self, camera_id: str):
+        cam = self._cameras.get(camera_id)
+        if cam is None:
+            return None
+
+        idx = self._index[camera_id]
+        self._index[camera_id] = idx + 1
+
+        if self.prerendered:
+            return self._clips[camera_id][idx % self.prerendered]
+
+        frame, bboxes = cam.render()
+        with self._truth_lock:
+            self._truth[id(frame)] = bboxes
+            while len(self._truth) > self._truth_cap:
+                self._truth.popitem(last=False)
+        return frame
+
+    def truth(self, frame) -> list:
+        with self._truth_lock:
+            return self._truth.get(id(frame), [])
+
+
+class StubDetector:
+    """
+    Drop-in for detect_vehicles(frame) on mock frames.
+
+    Returns the provider's ground-truth boxes; cost_ms burns CPU to emulate
+    inference (busy loop, NOT sleep — saturation must be real).
+    """
+
+    def __init__(self, provider: MockFrameProvider, cost_ms: float = 0.0):
+        self.provider = provider
+        self.cost_ms = cost_ms
+
+    def __call__(self, frame) -> np.ndarray:
+        if self.cost_ms > 0:
+            deadline = time.thread_time() + self.cost_ms / 1000.0
+            while time.thread_time() < deadline:
+                pass
+
+        return detections.from_boxes(self.provider.truth(frame), conf=0.9, cls=MOCK_CLASS)
+
+
+class MockFramePump(threading.Thread):
+    """
+    ONE thread publishing every mock camera into FrameHub at `fps`
+    (200 cameras must not mean 200 generator threads).
+    """
+
+    def __init__(
+        self,
+        provider: MockFrameProvider,
+        frame_hub,
+        *,
+        fps: float = 10.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        super().__init__(daemon=True, name="MockFramePump")
+        self.provider = provider
+        self.frame_hub = frame_hub
+        self.interval = 1.0 / max(fps, 0.1)
+        self.clock = clock
+        self.running = True
+        self.published = 0
+        self.late_ticks = 0
+
+    def run(self):
+        cameras = self.provider.camera_ids()
+        for cam_id in cameras:
+            self.frame_hub.register(cam_id)
+
+        next_tick = time.monotonic()
+        while self.running:
+            for cam_id in cameras:
+                frame = self.provider.get_frame(cam_id)
+                self.frame_hub.update(cam_id, frame, ts=self.clock())
+                self.published += 1
+
+            next_tick += self.interval
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                self.late_ticks += 1
+                next_tick = time.monotonic()
@@ -0,0 +1,192 @@
+# app/frames/replay.py
+
+import glob
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterator
+
+from app.frames.base import FrameProvider
+
+logger = logging.getLogger("ReplayFrameProvider")
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+DEFAULT_IMAGE_DIR_FPS = 25.0
+
+
+def _iter_video(path: str):
+    import cv2
+
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ValueError(f"cannot open video: {path}")
+    try:
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                return
+            yield frame
+    finally:
+        cap.release()
+
+
+def _iter_images(paths: list):
+    import cv2
+
+    for path in paths:
+        frame = cv2.imread(path, cv2.IMREAD_COLOR)
+        if frame is None:
+            logger.warning("[REPLAY] unreadable image skipped: %s", path)
+            continue
+        yield frame
+
+
+def _source_fps(path: str) -> float:
+    if os.path.isdir(path):
+        return DEFAULT_IMAGE_DIR_FPS
+
+    import cv2
+
+    cap = cv2.VideoCapture(path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS)
+    finally:
+        cap.release()
+    return fps if fps and fps > 0 else DEFAULT_IMAGE_DIR_FPS
+
+
+class _ReplayStream:
+    def __init__(self, path: str, fps: float | None, loop: bool):
+        self.path = path
+        self.fps = fps or _source_fps(path)
+        self.loop = loop
+        self.index = 0
+        self.started_at = None
+        self._frames = self._open()
+
+    def _open(self) -> Iterator:
+        if os.path.isdir(self.path):
+            paths = sorted(
+                p for p in glob.glob(os.path.join(self.path, "*"))
+                if p.lower().endswith(IMAGE_EXTENSIONS)
+            )
+            if not paths:
+                raise ValueError(f"no images in {self.path}")
+            return _iter_images(paths)
+        return _iter_video(self.path)
+
+    def next_frame(self):
+        frame = next(self._frames, None)
+        if frame is None and self.loop:
+            self._frames = self._open()
+            frame = next(self._frames, None)
+        return frame
+
+
+class ReplayFrameProvider(FrameProvider):
+    """
+    Deterministic file-backed camera source (video file OR image directory).
+
+    - realtime=True: frames are paced at the source FPS (clock-driven)
+    - realtime=False: as fast as the consumer asks
+    - clock / sleep are injectable (tests, simulated time)
+    - get_frame() returns None once a non-looping source is exhausted
+    """
+
+    def __init__(
+        self,
+        sources: Dict[str, str],
+        *,
+        fps: float | None = None,
+        realtime: bool = True,
+        loop: bool = False,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.realtime = realtime
+        self.clock = clock
+        self.sleep = sleep
+        self._streams = {
+            cam_id: _ReplayStream(path, fps, loop)
+            for cam_id, path in sources.items()
+        }
+
+    def camera_ids(self):
+        return list(self._streams.keys())
+
+    def fps(self, camera_id: str) -> float:
+        return self._streams[camera_id].fps
+
+    def get_frame(self, camera_id: str):
+        stream = self._streams.get(camera_id)
+        if stream is None:
+            return None
+
+        if self.realtime:
+            now = self.clock()
+            if stream.started_at is None:
+                stream.started_at = now
+            due = stream.started_at + stream.index / stream.fps
+            if due > now:
+                self.sleep(due - now)
+
+        frame = stream.next_frame()
+        if frame is not None:
+            stream.index += 1
+        return frame
+
+
+class ReplayPump(threading.Thread):
+    """
+    Pushes one replay camera into FrameHub (same path as RTSPReader).
+
+    wait_for: optional callable(seq) -> bool; when set, the pump waits until
+    it returns True for the FrameHub seq it just published before sending
+    the next frame (lossless, consumer-bound benchmarks).
+    """
+
+    def __init__(
+        self,
+        provider: ReplayFrameProvider,
+        cam_id: str,
+        frame_hub,
+        *,
+        limit: int | None = None,
+        wait_for: Callable[[int], bool] | None = None,
+    ):
+        super().__init__(daemon=True, name=f"ReplayPump-{cam_id}")
+        self.provider = provider
+        self.cam_id = cam_id
+        self.frame_hub = frame_hub
+        self.limit = limit
+        self.wait_for = wait_for
+
+        self.published = 0
+        self.finished = threading.Event()
+        self.running = True
+
+    def run(self):
+        self.frame_hub.register(self.cam_id)
+
+        try:
+            while self.running:
+                if self.limit is not None and self.published >= self.limit:
+                    break
+
+                frame = self.provider.get_frame(self.cam_id)
+                if frame is None:
+                    break
+
+                self.frame_hub.update(self.cam_id, frame, ts=self.provider.clock())
+                self.published += 1
+
+                if self.wait_for is not None:
+                    seq = self.frame_hub.latest_entry(self.cam_id).seq
+                    while self.running and not self.wait_for(seq):
+                        time.sleep(0.0005)
+        except Exception:
+            logger.exception("[REPLAY] crash | cam=%s", self.cam_id)
+        finally:
+            self.finished.set()
+            logger.info("[REPLAY] done | cam=%s frames=%d", self.cam_id, self.published)
@@ -0,0 +1,63 @@
+# app/frames/viewers.py
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+from app.metrics import REGISTRY
+
+PREVIEW_VIEWERS_GAUGE = REGISTRY.gauge(
+    "traffic_preview_viewers",
+    "Open MJPEG preview streams",
+    ("camera",),
+)
+
+
+class ViewerRegistry:
+    """
+    Live preview viewers per camera.
+
+    active(cam) stays True for `linger` seconds after the last viewer left,
+    so a page reload doesn't flap the camera's decoder configuration.
+    """
+
+    def __init__(self, linger: float = 15.0):
+        self.linger = linger
+        self._counts: Dict[str, int] = {}
+        self._left_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, cam_id: str):
+        with self._lock:
+            self._counts[cam_id] = self._counts.get(cam_id, 0) + 1
+            PREVIEW_VIEWERS_GAUGE.labels(cam_id).set(self._counts[cam_id])
+
+    def release(self, cam_id: str):
+        with self._lock:
+            count = max(0, self._counts.get(cam_id, 0) - 1)
+            self._counts[cam_id] = count
+            if count == 0:
+                self._left_at[cam_id] = time.monotonic()
+            PREVIEW_VIEWERS_GAUGE.labels(cam_id).set(count)
+
+    @contextmanager
+    def watching(self, cam_id: str):
+        self.acquire(cam_id)
+        try:
+            yield
+        finally:
+            self.release(cam_id)
+
+    def count(self, cam_id: str) -> int:
+        return self._counts.get(cam_id, 0)
+
+    def active(self, cam_id: str) -> bool:
+        if self._counts.get(cam_id, 0) > 0:
+            return True
+        left_at = self._left_at.get(cam_id)
+        return left_at is not None and time.monotonic() - left_at < self.linger
+
+
+# 🔒 Singleton (process-wide)
+PREVIEW_VIEWERS = ViewerRegistry()
@@ -0,0 +1,93 @@
+# app/ingest/frame/coalesce.py
+
+import threading
+import time
+
+# ---- CONFIG ----
+COALESCE_WINDOW_SEC = 30.0   # suppress identical repeats inside this window
+
+# Higher rank = stronger evidence (an upgrade is always emitted)
+EVENT_RANK = {
+    "plate.candidate": 1,
+    "plate.confirmed": 2,
+}
+
+
+class EventCoalescer:
+    """
+    Per-vehicle plate event coalescing + dedup.
+
+    Keys:
+    - (camera_id, track): the vehicle (DetectionWorker's VehicleTracker);
+      a candidate and the later confirmed read often differ by an OCR
+      character and must still coalesce
+    - (camera_id, None, plate_text): the read; a vehicle whose track was
+      lost and re-acquired under a new id must not repeat it
+    (vehicle_idx is NOT stable across frames, so it is never used).
+    Value = (rank, ts, plate) of the last emit.
+
+    Emits when, for every key that applies (untracked: the text key only):
+    - key seen for the first time (first reach of threshold)
+    - event is an upgrade (candidate -> confirmed), whatever its text
+    - window expired since the last emit for that key
+
+    Everything else is suppressed.
+    """
+
+    def __init__(self, window_sec: float = COALESCE_WINDOW_SEC):
+        self.window_sec = window_sec
+        self._last = {}   # key -> (rank, ts, plate)
+        self._lock = threading.Lock()
+
+        self.passed = 0
+        self.suppressed = 0
+
+    def should_emit(
+        self,
+        *,
+        event_type: str,
+        camera_id: str,
+        track,
+        plate: str,
+        now: float | None = None,
+    ) -> bool:
+        now = time.time() if now is None else now
+        rank = EVENT_RANK.get(event_type, 0)
+        keys = [(camera_id, None, plate)]
+        if track is not None:
+            keys.append((camera_id, track))
+
+        with self._lock:
+            for key in keys:
+                prev = self._last.get(key)
+                if prev is not None:
+                    prev_rank, prev_ts, _ = prev
+                    if rank <= prev_rank and now - prev_ts < self.window_sec:
+                        self.suppressed += 1
+                        return False
+
+            for key in keys:
+                prev = self._last.get(key)
+                self._last[key] = (max(rank, prev[0]) if prev else rank, now, plate)
+            self.passed += 1
+
+            if len(self._last) > 4096:
+                self._expire(now)
+
+            return True
+
+    def _expire(self, now: float):
+        for key, (_, ts, _) in list(self._last.items()):
+            if now - ts >= self.window_sec:
+                del self._last[key]
+
+    def stats(self) -> dict:
+        return {
+            "passed": self.passed,
+            "suppressed": self.suppressed,
+            "keys": len(self._last),
+        }
+
+
+# 🔒 Singleton (shared by all DetectionWorkers)
+EVENT_COALESCER = EventCoalescer()
@@ -0,0 +1,103 @@
+# app/ingest/frame/decode.py
+
+import struct
+
+import numpy as np
+
+from app.config import DETECTION_INPUT_SIZE
+
+# JPEG start-of-frame markers (carry the image dimensions)
+_SOF_MARKERS = {
+    0xC0, 0xC1, 0xC2, 0xC3,
+    0xC5, 0xC6, 0xC7,
+    0xC9, 0xCA, 0xCB,
+    0xCD, 0xCE, 0xCF,
+}
+
+
+def jpeg_dimensions(payload: bytes) -> tuple[int, int] | None:
+    """
+    Read (width, height) from the JPEG header WITHOUT decoding.
+    Returns None for non-JPEG / truncated input.
+    """
+    n = len(payload)
+    if n < 4 or payload[0] != 0xFF or payload[1] != 0xD8:
+        return None
+
+    i = 2
+    while i + 9 < n:
+        if payload[i] != 0xFF:
+            return None
+
+        marker = payload[i + 1]
+
+        # Fill bytes / standalone markers (no length field)
+        if marker == 0xFF:
+            i += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:
+            i += 2
+            continue
+
+        if marker in _SOF_MARKERS:
+            h, w = struct.unpack(">HH", payload[i + 5:i + 9])
+            return w, h
+
+        seg_len = struct.unpack(">H", payload[i + 2:i + 4])[0]
+        i += 2 + seg_len
+
+    return None
+
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def png_dimensions(payload: bytes) -> tuple[int, int] | None:
+    """(width, height) from the PNG IHDR chunk; None for non-PNG / truncated input."""
+    if len(payload) < 24 or bytes(payload[:8]) != _PNG_SIGNATURE or bytes(payload[12:16]) != b"IHDR":
+        return None
+    return struct.unpack(">II", payload[16:24])
+
+
+def image_dimensions(payload: bytes) -> tuple[int, int] | None:
+    """
+    Cheap synchronous sniff (magic + header, no decode) of a JPEG / PNG upload.
+    None => not an image we can decode: reject before queueing.
+    """
+    dims = jpeg_dimensions(payload) or png_dimensions(payload)
+    if dims is None or 0 in dims:
+        return None
+    return dims
+
+
+def reduced_decode_flags(
+    payload: bytes,
+    target: int = DETECTION_INPUT_SIZE,
+) -> int | None:
+    """
+    Pick IMREAD_REDUCED_COLOR_{4,2} so the decoded longest side is still
+    >= target (detector input). None => full-size decode.
+
+    Only JPEG benefits (libjpeg DCT scaling); other formats decode full size.
+    """
+    import cv2
+
+    dims = jpeg_dimensions(payload)
+    if dims is None:
+        return None
+
+    longest = max(dims)
+    if longest // 4 >= target:
+        return cv2.IMREAD_REDUCED_COLOR_4
+    if longest // 2 >= target:
+        return cv2.IMREAD_REDUCED_COLOR_2
+    return None
+
+
+def decode_image(payload: bytes, flags: int | None = None):
+    import cv2
+
+    return cv2.imdecode(
+        np.frombuffer(payload, np.uint8),
+        cv2.IMREAD_COLOR if flags is None else flags,
+    )
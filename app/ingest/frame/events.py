@@ -1,7 +1,171 @@
+# app/ingest/frame/events.py
+
 import logging
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+from app.events.schema import TrafficEvent
+from app.events.store import EVENT_STORE
+from app.metrics import EVENTS_TOTAL, GLASS_TO_EVENT, REGISTRY
+from app.tracing import current_trace
 
 logger = logging.getLogger("events")
 
+# ---- CONFIG ----
+EVENT_QUEUE_MAXSIZE = 10_000   # bounded: pipeline never waits on consumers
+EVENT_BATCH_SIZE = 256         # max events per store insert
+EVENT_FLUSH_INTERVAL = 0.25    # seconds (max latency for a partial batch)
+
+
+class EventSink(threading.Thread):
+    """
+    Background sink: ANPR pipeline -> EVENT_STORE.
+
+    - emit() is non-blocking (put_nowait); full queue => event dropped + counted
+    - Sink thread drains up to EVENT_BATCH_SIZE events at a time
+    - Converts raw payloads into TrafficEvent records off the hot path
+    - ONE store lock acquisition per batch (store.add_many)
+    """
+
+    def __init__(
+        self,
+        store,
+        maxsize: int = EVENT_QUEUE_MAXSIZE,
+        batch_size: int = EVENT_BATCH_SIZE,
+        flush_interval: float = EVENT_FLUSH_INTERVAL,
+    ):
+        super().__init__(daemon=True, name="EventSink")
+        self.store = store
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._start_lock = threading.Lock()
+
+        self.emitted = 0
+        self.dropped = 0
+        self.stored = 0
+
+        REGISTRY.gauge(
+            "traffic_event_queue_depth", "Events waiting for the sink thread"
+        ).labels().set_function(self._queue.qsize)
+        self._dropped_total = REGISTRY.counter(
+            "traffic_events_dropped_total", "Events dropped on a full sink queue"
+        ).labels()
+
+    # -------------------------------------------------
+    # Producer side (hot path)
+    # -------------------------------------------------
+    def emit(self, event_type: str, payload: dict) -> bool:
+        self._ensure_started()
+
+        try:
+            self._queue.put_nowait((time.time(), event_type, payload))
+        except queue.Full:
+            self.dropped += 1
+            self._dropped_total.inc()
+            if self.dropped % 1000 == 1:
+                logger.warning(
+                    "[EVENT] queue full → dropping (dropped=%d)",
+                    self.dropped,
+                )
+            return False
+
+        self.emitted += 1
+        EVENTS_TOTAL.labels(payload.get("camera_id", ""), event_type).inc()
+        return True
+
+    def _ensure_started(self):
+        if self.is_alive():
+            return
+        with self._start_lock:
+            if not self.is_alive() and self.ident is None:
+                self.start()
+
+    # -------------------------------------------------
+    # Consumer side (sink thread)
+    # -------------------------------------------------
+    def run(self):
+        logger.info("[EVENT] sink started")
+
+        while True:
+            try:
+                batch = self._drain()
+                if batch:
+                    self._flush(batch)
+            except Exception:
+                logger.exception("[EVENT] sink failure")
+
+    def _drain(self) -> list:
+        # Block for the first event, then take whatever else is ready
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _flush(self, batch: list):
+        records = []
+        for ts, event_type, payload in batch:
+            try:
+                records.append(_to_traffic_event(ts, event_type, payload))
+            except Exception:
+                logger.exception("[EVENT] bad payload | type=%s", event_type)
+
+        self.store.add_many(records)
+        self.stored += len(records)
+
+        logger.debug("[EVENT] stored batch of %d", len(records))
+
+    def stats(self) -> dict:
+        return {
+            "emitted": self.emitted,
+            "dropped": self.dropped,
+            "stored": self.stored,
+            "queued": self._queue.qsize(),
+        }
+
+
+def _to_traffic_event(ts: float, event_type: str, payload: dict) -> TrafficEvent:
+    metadata = dict(payload)
+    camera_id = metadata.pop("camera_id")
+    confidence = metadata.pop("confidence", 0.0)
+
+    return TrafficEvent(
+        event_id=str(uuid.uuid4()),
+        event_type=event_type,
+        camera_id=camera_id,
+        timestamp=datetime.fromtimestamp(ts, tz=timezone.utc),
+        confidence=float(confidence),
+        metadata=metadata,
+    )
+
+
+# 🔒 Singleton (thread starts lazily on first emit)
+EVENT_SINK = EventSink(EVENT_STORE)
+
 
 def emit_event(event_type: str, **payload):
+    # Tag with the frame's trace (DetectionWorker thread) + glass-to-event latency
+    trace = current_trace()
+    if trace is not None:
+        payload.setdefault("trace_id", trace.trace_id)
+        payload.setdefault("capture_ts", trace.capture_ts)
+    if "capture_ts" in payload:
+        latency = time.time() - payload["capture_ts"]
+        GLASS_TO_EVENT.labels(payload.get("camera_id", ""), event_type).observe(latency)
+        if trace is not None:
+            trace.add_event(event_type, latency)
+
     logger.info("[EVENT] %s | %s", event_type, payload)
+    EVENT_SINK.emit(event_type, payload)
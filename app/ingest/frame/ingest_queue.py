@@ -0,0 +1,276 @@
+# app/ingest/frame/ingest_queue.py
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict
+
+from app.ingest.frame.decode import decode_image
+from app.metrics import CAMERA_CPU_SECONDS, REGISTRY, observe_stage
+
+logger = logging.getLogger("FrameIngestQueue")
+
+# ---- CONFIG ----
+INGEST_WORKERS = 4            # asyncio worker tasks
+INGEST_DECODE_THREADS = 2     # cv2.imdecode runs here (never on the loop)
+INGEST_MAX_DEPTH = 64         # total queued frames
+INGEST_MAX_PER_CAMERA = 8     # per-camera cap (one camera can't starve others)
+RETRY_AFTER_MAX_SEC = 30
+
+
+def _decode_timed(payload: bytes, flags: int | None):
+    # Runs in the decode pool: thread_time == CPU spent on THIS decode
+    cpu0 = time.thread_time()
+    frame = decode_image(payload, flags)
+    return frame, time.thread_time() - cpu0
+
+
+@dataclass
+class IngestItem:
+    camera_id: str
+    frame_ts: float
+    payload: bytes
+    enqueued_at: float
+    decode_flags: int | None = None
+
+
+class FrameIngestQueue:
+    """
+    Bounded HTTP frame ingest queue.
+
+    - Fixed number of asyncio worker tasks (tracked, cancellable)
+    - Per-camera FIFO + round-robin across cameras (fairness)
+    - cv2.imdecode off the event loop (dedicated thread pool)
+    - submit() is loop-local & non-blocking: False => caller returns 429
+    - retry_after() derives from real depth / observed drain rate
+
+    All state is touched ONLY from the event loop thread (no locks).
+    """
+
+    def __init__(
+        self,
+        handler: Callable[..., Awaitable],
+        *,
+        workers: int = INGEST_WORKERS,
+        decode_threads: int = INGEST_DECODE_THREADS,
+        max_depth: int = INGEST_MAX_DEPTH,
+        max_per_camera: int = INGEST_MAX_PER_CAMERA,
+    ):
+        self.handler = handler
+        self.workers = workers
+        self.decode_threads = decode_threads
+        self.max_depth = max_depth
+        self.max_per_camera = max_per_camera
+
+        self._queues: Dict[str, Deque[IngestItem]] = {}
+        self._ready: Deque[str] = deque()   # round-robin order
+        self._items: asyncio.Semaphore | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._pool: ThreadPoolExecutor | None = None
+        self._depth = 0
+
+        # 📊 Metrics
+        self._accepted = 0
+        self._rejected = 0
+        self._processed = 0
+        self._decode_failed = 0
+        self._handler_failed = 0
+        self._busy = 0
+        self._drain_rate = 0.0      # EMA, frames/sec
+        self._decode_ms = 0.0       # EMA
+        self._wait_ms = 0.0         # EMA (enqueue -> dequeue)
+        self._last_done = None
+
+        REGISTRY.gauge(
+            "traffic_ingest_queue_depth", "Frames waiting in the HTTP ingest queue"
+        ).labels().set_function(lambda: self._depth)
+        self._rejected_total = REGISTRY.counter(
+            "traffic_ingest_rejected_total", "HTTP frames rejected with 429", ("camera",)
+        )
+
+    # -------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------
+    def _ensure_started(self):
+        if self._tasks:
+            return
+
+        self._items = asyncio.Semaphore(0)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.decode_threads,
+            thread_name_prefix="frame-decode",
+        )
+        self._tasks = [
+            asyncio.create_task(self._worker(i), name=f"frame-ingest-{i}")
+            for i in range(self.workers)
+        ]
+
+        logger.info(
+            "[INGEST] queue started | workers=%d decode_threads=%d depth=%d",
+            self.workers,
+            self.decode_threads,
+            self.max_depth,
+        )
+
+    async def shutdown(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+        self._queues.clear()
+        self._ready.clear()
+        self._depth = 0
+
+    # -------------------------------------------------
+    # Producer side (route handlers)
+    # -------------------------------------------------
+    def submit(
+        self,
+        *,
+        camera_id: str,
+        frame_ts: float,
+        payload: bytes,
+        decode_flags: int | None = None,
+    ) -> bool:
+        self._ensure_started()
+
+        q = self._queues.get(camera_id)
+        if q is None:
+            q = self._queues[camera_id] = deque()
+
+        if self._depth >= self.max_depth or len(q) >= self.max_per_camera:
+            self._rejected += 1
+            self._rejected_total.labels(camera_id).inc()
+            return False
+
+        if not q:
+            self._ready.append(camera_id)
+
+        q.append(
+            IngestItem(
+                camera_id=camera_id,
+                frame_ts=frame_ts,
+                payload=payload,
+                enqueued_at=time.monotonic(),
+                decode_flags=decode_flags,
+            )
+        )
+        self._depth += 1
+        self._accepted += 1
+        self._items.release()
+        return True
+
+    def free_slots(self, camera_id: str) -> int:
+        q = self._queues.get(camera_id)
+        per_camera = self.max_per_camera - (len(q) if q else 0)
+        return max(0, min(self.max_depth - self._depth, per_camera))
+
+    def retry_after(self) -> int:
+        """
+        Seconds until the current backlog is expected to drain.
+        """
+        if self._drain_rate <= 0.0:
+            return 1
+        eta = (self._depth + 1) / self._drain_rate
+        return max(1, min(RETRY_AFTER_MAX_SEC, math.ceil(eta)))
+
+    # -------------------------------------------------
+    # Consumer side (worker tasks)
+    # -------------------------------------------------
+    def _pop(self) -> IngestItem:
+        camera_id = self._ready.popleft()
+        q = self._queues[camera_id]
+        item = q.popleft()
+
+        # Round-robin: camera goes to the back if it still has work
+        if q:
+            self._ready.append(camera_id)
+
+        self._depth -= 1
+        return item
+
+    async def _worker(self, idx: int):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            await self._items.acquire()
+            item = self._pop()
+
+            self._busy += 1
+            started = time.monotonic()
+            self._wait_ms = _ema(self._wait_ms, (started - item.enqueued_at) * 1000.0)
+
+            try:
+                frame, cpu = await loop.run_in_executor(
+                    self._pool, _decode_timed, item.payload, item.decode_flags
+                )
+                decode_s = time.monotonic() - started
+                self._decode_ms = _ema(self._decode_ms, decode_s * 1000.0)
+                observe_stage(item.camera_id, "decode", decode_s)
+                CAMERA_CPU_SECONDS.labels(item.camera_id, "decode").inc(cpu)
+
+                if frame is None:
+                    self._decode_failed += 1
+                    logger.warning("[INGEST] invalid image | cam=%s", item.camera_id)
+                    continue
+
+                await self.handler(
+                    camera_id=item.camera_id,
+                    frame_ts=item.frame_ts,
+                    frame=frame,
+                )
+
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._handler_failed += 1
+                logger.exception("[INGEST] worker %d failure | cam=%s", idx, item.camera_id)
+            finally:
+                self._busy -= 1
+                self._processed += 1
+                self._mark_done()
+
+    def _mark_done(self):
+        now = time.monotonic()
+        if self._last_done is not None:
+            dt = max(now - self._last_done, 1e-3)
+            self._drain_rate = _ema(self._drain_rate, 1.0 / dt)
+        self._last_done = now
+
+    # -------------------------------------------------
+    # Metrics
+    # -------------------------------------------------
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "busy_workers": self._busy,
+            "depth": self._depth,
+            "max_depth": self.max_depth,
+            "per_camera_depth": {
+                cam: len(q) for cam, q in self._queues.items() if q
+            },
+            "accepted": self._accepted,
+            "rejected": self._rejected,
+            "processed": self._processed,
+            "decode_failed": self._decode_failed,
+            "handler_failed": self._handler_failed,
+            "drain_rate_fps": round(self._drain_rate, 2),
+            "decode_ms_avg": round(self._decode_ms, 2),
+            "queue_wait_ms_avg": round(self._wait_ms, 2),
+            "retry_after_sec": self.retry_after(),
+        }
+
+
+def _ema(prev: float, value: float, alpha: float = 0.2) -> float:
+    if prev == 0.0:
+        return value
+    return prev + alpha * (value - prev)
@@ -1,37 +1,80 @@
-python3 - <<'EOF'
+# app/ingest/frame/ocr.py
 
-# TRAFFIC/app/ingest/frame/ocr.py
+import logging
+import re
+from dataclasses import dataclass
 
-import time
-import numpy as np
 import cv2
-from paddleocr import PaddleOCR
-
-print("Initializing PaddleOCR (GPU)...")
-ocr = PaddleOCR(
-    use_angle_cls=True,
-    lang="en",
-    use_gpu=True,
-    show_log=False,
-)
+import numpy as np
+
+from app.ingest.frame.policy import ENABLE_HEAVY_OCR
+
+logger = logging.getLogger("PlateOCR")
 
-# 🔥 Warmup (critical)
-dummy = np.zeros((64, 256, 3), dtype=np.uint8)
-ocr.ocr(dummy, cls=True)
-
-# Test image
-img = np.zeros((120, 320, 3), dtype=np.uint8)
-cv2.putText(
-    img, "TS09AB1234",
-    (5, 80),
-    cv2.FONT_HERSHEY_SIMPLEX,
-    1.6, (255, 255, 255), 3
+_TESSERACT_CONFIG = (
+    "--psm 7 --oem 1 "
+    "-c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
 )
+_CLEAN_RE = re.compile(r"[^A-Z0-9]")
+
+
+@dataclass
+class OCRResult:
+    text: str
+    confidence: float   # 0..1
+    engine: str
+
+
+def _preprocess(plate_crop: np.ndarray, mode: str) -> np.ndarray:
+    gray = cv2.cvtColor(plate_crop, cv2.COLOR_BGR2GRAY)
+
+    # Tesseract wants ~30px+ glyphs; SUB-stream plates are tiny
+    scale = max(1.0, 64.0 / max(gray.shape[0], 1))
+    if scale > 1.0:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+
+    if mode == "heavy" and ENABLE_HEAVY_OCR:
+        gray = cv2.bilateralFilter(gray, 7, 50, 50)
+
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return binary
+
+
+def run_ocr(plate_crop: np.ndarray, mode: str = "light") -> OCRResult:
+    """
+    Single-line plate OCR (Tesseract).
+
+    Returns empty text / 0.0 confidence on failure (never raises).
+    """
+    if plate_crop is None or plate_crop.size == 0:
+        return OCRResult("", 0.0, "tesseract")
+
+    try:
+        import pytesseract
+
+        data = pytesseract.image_to_data(
+            _preprocess(plate_crop, mode),
+            config=_TESSERACT_CONFIG,
+            output_type=pytesseract.Output.DICT,
+        )
+    except Exception as e:
+        logger.debug("[OCR] tesseract failed: %s", e)
+        return OCRResult("", 0.0, "tesseract")
+
+    words = []
+    confs = []
+    for text, conf in zip(data["text"], data["conf"]):
+        text = _CLEAN_RE.sub("", text.upper())
+        conf = float(conf)
+        if text and conf >= 0:
+            words.append(text)
+            confs.append(conf)
 
-t0 = time.time()
-res = ocr.ocr(img, cls=True)
-lat = (time.time() - t0) * 1000
+    if not words:
+        return OCRResult("", 0.0, "tesseract")
 
-print("OCR result:", res)
-print(f"Latency: {lat:.1f} ms")
-EOF
+    return OCRResult(
+        text="".join(words),
+        confidence=sum(confs) / len(confs) / 100.0,
+        engine="tesseract",
+    )
@@ -5,7 +5,9 @@ import time
 from collections import defaultdict
 
 from app.ingest.frame.types import Vehicle
-from app.ingest.frame.plate_proposal import propose_plate_regions
+from app.config import PLATE_DETECTOR_MAX_PER_VEHICLE
+from app.detection.registry import get_plate_model
+from app.ingest.frame.plate_proposal import detect_plate_regions, propose_plate_regions
 from app.ingest.frame.logger import (
     log_pipeline_start,
     log_plate_summary,
@@ -15,10 +17,12 @@ from app.ingest.frame.ocr import run_ocr
 from app.ingest.frame.quality_gate import cheap_plate_gate
 from app.ingest.frame.debug_dump import maybe_dump_plate_crop
 from app.ingest.frame.events import emit_event
+from app.ingest.frame.coalesce import EVENT_COALESCER
 from app.ingest.frame.policy import (
     CALIBRATION_PLATE_POLICY,
     CONFIRMED_CONF_THRESHOLD,
 )
+from app.metrics import PLATE_CANDIDATES, stage_timer
 
 logger = logging.getLogger(__name__)
 
@@ -120,6 +124,58 @@ def _aggregate_text(key):
     return best_text, best_votes, best_score
 
 
+def _emit_coalesced(event_type, *, camera_id, track, **payload):
+    """
+    Emit through the per-vehicle coalescer (dedup + upgrade-only).
+    """
+    if not EVENT_COALESCER.should_emit(
+        event_type=event_type,
+        camera_id=camera_id,
+        track=track,
+        plate=payload["plate"],
+    ):
+        return
+
+    with stage_timer(camera_id, "event_emit"):
+        emit_event(event_type, camera_id=camera_id, **payload)
+
+
+_plate_model_failed = False
+
+
+def _plate_model():
+    """Learned plate detector handle, or None -> Canny proposals (also after a load failure)."""
+    global _plate_model_failed
+    if _plate_model_failed:
+        return None
+    try:
+        return get_plate_model()
+    except Exception:
+        _plate_model_failed = True
+        logger.exception("[PLATE] plate model unavailable, using Canny proposals")
+        return None
+
+
+def _propose_plates(camera_id, crops):
+    """Per-crop plate proposals: one learned-detector batch per frame, or Canny per crop."""
+    model = _plate_model()
+    if model is not None:
+        with stage_timer(camera_id, "plate_detect"):
+            plate_sets = detect_plate_regions(crops, model, limit=PLATE_DETECTOR_MAX_PER_VEHICLE)
+        proposer = "model"
+    else:
+        plate_sets = []
+        for crop in crops:
+            with stage_timer(camera_id, "plate_proposal"):
+                plate_sets.append(propose_plate_regions(crop, policy=CALIBRATION_PLATE_POLICY))
+        proposer = "canny"
+
+    candidates = PLATE_CANDIDATES.labels(camera_id, proposer)
+    for plates in plate_sets:
+        candidates.observe(len(plates))
+    return plate_sets
+
+
 # -------------------------------------------------
 # Main pipeline
 # -------------------------------------------------
@@ -132,8 +188,9 @@ def run_frame_pipeline(*, camera_id, frame_ts, frame, vehicles):
     now = time.time()
     _cleanup_history(now)
 
-    for v_idx, v in enumerate(vehicles):
-        vehicle = Vehicle.from_detection(v, frame)
+    # Vehicles big enough to read a plate from (proposals run on all of them at once)
+    batch = []
+    for v_idx, vehicle in enumerate(Vehicle.from_detections(vehicles, frame)):
 
         if vehicle.crop is None:
             continue
@@ -142,15 +199,21 @@ def run_frame_pipeline(*, camera_id, frame_ts, frame, vehicles):
         if h < 40 or w < 80:
             continue
 
-        plates = propose_plate_regions(
-            vehicle.crop,
-            policy=CALIBRATION_PLATE_POLICY,
-        )
+        batch.append((v_idx, vehicle))
+
+    plate_sets = _propose_plates(camera_id, [vehicle.crop for _, vehicle in batch])
+
+    for (v_idx, vehicle), plates in zip(batch, plate_sets):
 
         log_plate_summary(camera_id, v_idx, len(plates))
         log_plate_candidates(camera_id, v_idx, plates)
 
         key = (camera_id, v_idx)
+        track = vehicle.track
+
+        # Best event per vehicle for THIS frame (emitted once, after proposals)
+        best_candidate = None
+        best_confirmed = None
 
         for p_idx, plate in enumerate(plates):
             try:
@@ -163,7 +226,8 @@ def run_frame_pipeline(*, camera_id, frame_ts, frame, vehicles):
                 # -------------------------
                 # OCR
                 # -------------------------
-                ocr = run_ocr(plate["crop"], mode="light")
+                with stage_timer(camera_id, "ocr"):
+                    ocr = run_ocr(plate["crop"], mode="light")
 
                 logger.info(
                     "[OCR] cam=%s vehicle=%d plate=%d text=%r conf=%.3f",
@@ -188,46 +252,44 @@ def run_frame_pipeline(*, camera_id, frame_ts, frame, vehicles):
                 # -------------------------
                 if agg_text and votes >= MIN_VOTES_FOR_CANDIDATE:
                     decision = "candidate"
-                    emit_event(
-                        "plate.candidate",
-                        camera_id=camera_id,
-                        vehicle_idx=v_idx,
-                        plate_idx=p_idx,
-                        plate=agg_text,
-                        confidence=min(score / 3.0, 1.0),
-                    )
+                    confidence = min(score / 3.0, 1.0)
+                    if best_candidate is None or confidence > best_candidate["confidence"]:
+                        best_candidate = {
+                            "plate_idx": p_idx,
+                            "plate": agg_text,
+                            "confidence": confidence,
+                        }
 
                 if ocr.confidence >= CONFIRMED_CONF_THRESHOLD:
                     decision = "confirmed"
-                    emit_event(
-                        "plate.confirmed",
-                        camera_id=camera_id,
-                        vehicle_idx=v_idx,
-                        plate_idx=p_idx,
-                        plate=ocr.text,
-                        confidence=ocr.confidence,
-                    )
+                    if best_confirmed is None or ocr.confidence > best_confirmed["confidence"]:
+                        best_confirmed = {
+                            "plate_idx": p_idx,
+                            "plate": ocr.text,
+                            "confidence": ocr.confidence,
+                        }
 
                 # -------------------------
                 # Debug dump
                 # -------------------------
-                maybe_dump_plate_crop(
-                    cam_id=camera_id,
-                    frame_ts=frame_ts,
-                    vehicle_idx=v_idx,
-                    plate_idx=p_idx,
-                    vehicle_crop=vehicle.crop,
-                    plate_crop=plate["crop"],
-                    bbox=plate.get("bbox"),
-                    plate_metrics={
-                        "area_ratio": plate["area_ratio"],
-                        "aspect": plate["aspect"],
-                        "blur": plate["blur"],
-                        "skew": plate["skew"],
-                    },
-                    ocr_result=ocr,
-                    decision=decision,
-                )
+                with stage_timer(camera_id, "debug_dump"):
+                    maybe_dump_plate_crop(
+                        cam_id=camera_id,
+                        frame_ts=frame_ts,
+                        vehicle_idx=v_idx,
+                        plate_idx=p_idx,
+                        vehicle_crop=vehicle.crop,
+                        plate_crop=plate["crop"],
+                        bbox=plate.get("bbox"),
+                        plate_metrics={
+                            "area_ratio": plate["area_ratio"],
+                            "aspect": plate["aspect"],
+                            "blur": plate["blur"],
+                            "skew": plate["skew"],
+                        },
+                        ocr_result=ocr,
+                        decision=decision,
+                    )
 
             except Exception as e:
                 logger.exception(
@@ -238,4 +300,25 @@ def run_frame_pipeline(*, camera_id, frame_ts, frame, vehicles):
                     e,
                 )
 
+        # -------------------------
+        # Coalesced emission (once per vehicle per frame)
+        # -------------------------
+        if best_candidate is not None:
+            _emit_coalesced(
+                "plate.candidate",
+                camera_id=camera_id,
+                track=track,
+                vehicle_idx=v_idx,
+                **best_candidate,
+            )
+
+        if best_confirmed is not None:
+            _emit_coalesced(
+                "plate.confirmed",
+                camera_id=camera_id,
+                track=track,
+                vehicle_idx=v_idx,
+                **best_confirmed,
+            )
+
     return {"vehicles": vehicles, "plates": []}
@@ -150,3 +150,62 @@ def propose_plate_regions(
     )
 
     return proposals
+
+
+# ------------------------------------
+# Learned plate detector (batched)
+# ------------------------------------
+def plate_regions_from_boxes(
+    vehicle_crop: np.ndarray,
+    boxes: np.ndarray,
+    *,
+    limit: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Plate model boxes (N, 5) [x1, y1, x2, y2, conf] in crop coordinates ->
+    proposals in propose_plate_regions() format (+ "score"), best first.
+    """
+    h, w = vehicle_crop.shape[:2]
+    img_area = float(h * w)
+
+    boxes = boxes[np.argsort(-boxes[:, 4], kind="stable")][:limit]
+
+    proposals: List[Dict] = []
+    for x1, y1, x2, y2, score in boxes.tolist():
+        x, y = max(int(x1), 0), max(int(y1), 0)
+        x2, y2 = min(int(round(x2)), w), min(int(round(y2)), h)
+        cw, ch = x2 - x, y2 - y
+        if cw <= 0 or ch <= 0:
+            continue
+
+        # Copy: the crop outlives the frame buffer (OCR, debug dumps)
+        crop = vehicle_crop[y:y2, x:x2].copy()
+        crop_gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+        area = float(cw * ch)
+
+        proposals.append({
+            "bbox": (x, y, cw, ch),  # RELATIVE TO vehicle_crop
+            "crop": crop,
+            "area": area,
+            "area_ratio": area / img_area,
+            "aspect": cw / max(ch, 1),
+            "blur": _estimate_blur(crop_gray),
+            "skew": _estimate_skew(crop_gray),
+            "score": score,
+        })
+
+    return proposals
+
+
+def detect_plate_regions(vehicle_crops: List[np.ndarray], model, *, limit: Optional[int] = None) -> List[List[Dict]]:
+    """
+    One learned-detector batch over all of a frame's vehicle crops.
+    Returns per-crop proposal lists (same order as vehicle_crops).
+    """
+    if not vehicle_crops:
+        return []
+
+    return [
+        plate_regions_from_boxes(crop, boxes, limit=limit)
+        for crop, boxes in zip(vehicle_crops, model(vehicle_crops))
+    ]
@@ -1,14 +1,15 @@
 # app/ingest/frame/router.py
 
+import math
 import time
-import asyncio
+import struct
 import logging
-import numpy as np
-import cv2
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, Request, UploadFile, File, Form, HTTPException
 
-from app.ingest.frame.service import ingest_frame_async
+from app.ingest.frame.decode import image_dimensions, reduced_decode_flags
+from app.ingest.frame.ingest_queue import FrameIngestQueue
+from app.ingest.frame.service import admit_camera, ingest_frame_async, is_push_camera
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +18,48 @@ router = APIRouter(
     tags=["frame-ingest"],
 )
 
-MAX_INFLIGHT = 8
-_inflight = 0
+# 🔒 Singleton: bounded worker pool (decode off-loop, per-camera fairness)
+INGEST_QUEUE = FrameIngestQueue(handler=ingest_frame_async)
+
+# ---- Batch upload ----
+MAX_BATCH_FRAMES = 64
+MAX_BATCH_BYTES = 32 * 1024 * 1024
+
+# Raw batch record: >dI = capture ts (float64, 0 => server time) + JPEG length
+_RECORD_HEADER = struct.Struct(">dI")
+
+# ---- Client capture stamps (epoch seconds) ----
+# Detection history is ordered by them: one far-future stamp (ms sent as
+# seconds, inf) would pin every later row of the camera, nan breaks the search
+MAX_FRAME_TS_AHEAD = 60.0           # client clock skew
+MAX_FRAME_TS_AGE = 3600.0           # buffered uploads after an outage
+
+
+def _check_frame_ts(ts: float, now: float, idx: int | None = None):
+    if math.isfinite(ts) and now - MAX_FRAME_TS_AGE <= ts <= now + MAX_FRAME_TS_AHEAD:
+        return
+    where = "" if idx is None else f" (record {idx})"
+    raise HTTPException(
+        status_code=400,
+        detail=f"frame_ts must be epoch seconds within -{MAX_FRAME_TS_AGE:g}/+{MAX_FRAME_TS_AHEAD:g} s of server time{where}",
+    )
+
+
+def _too_busy() -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="Ingest queue full",
+        headers={"Retry-After": str(INGEST_QUEUE.retry_after())},
+    )
+
+
+def _check_camera(camera_id: str):
+    """4xx before queueing: only configured / allow-listed cameras get a pipeline."""
+    if admit_camera(camera_id):
+        return
+    if is_push_camera(camera_id):
+        raise HTTPException(status_code=403, detail="Push camera limit reached")
+    raise HTTPException(status_code=404, detail="Unknown camera_id")
 
 
 @router.post("")
@@ -27,38 +68,28 @@ async def ingest_frame(
     frame_ts: float | None = Form(None),
     image: UploadFile = File(...),
 ):
+    _check_camera(camera_id)
     if image.content_type not in ("image/jpeg", "image/png"):
         raise HTTPException(status_code=415, detail="Unsupported image type")
 
     image_bytes = await image.read()
-    frame = cv2.imdecode(
-        np.frombuffer(image_bytes, np.uint8),
-        cv2.IMREAD_COLOR,
-    )
-
-    if frame is None:
+    # Decode is deferred to the worker pool; sniff the header now so a
+    # corrupt / non-image upload still gets its 400 instead of "accepted"
+    if image_dimensions(image_bytes) is None:
         raise HTTPException(status_code=400, detail="Invalid image")
 
-    ts = frame_ts or time.time()
-
-    global _inflight
-    if _inflight >= MAX_INFLIGHT:
-        raise HTTPException(status_code=429, detail="Too many frames in flight")
-
-    _inflight += 1
-
-    async def _run():
-        global _inflight
-        try:
-            await ingest_frame_async(
-                camera_id=camera_id,
-                frame_ts=ts,
-                frame=frame,
-            )
-        finally:
-            _inflight -= 1
+    now = time.time()
+    if frame_ts:
+        _check_frame_ts(frame_ts, now)
+    ts = frame_ts or now
 
-    asyncio.create_task(_run())
+    # Decode happens in the worker pool (never on the event loop)
+    if not INGEST_QUEUE.submit(
+        camera_id=camera_id,
+        frame_ts=ts,
+        payload=image_bytes,
+    ):
+        raise _too_busy()
 
     logger.info("Frame accepted: %s", camera_id)
 
@@ -67,3 +98,200 @@ async def ingest_frame(
         "camera_id": camera_id,
         "timestamp": ts,
     }
+
+
+def _parse_length_prefixed(body: bytes | bytearray) -> list[tuple[float | None, memoryview]]:
+    """
+    Split an application/octet-stream batch into (frame_ts, jpeg) records.
+    Payloads are zero-copy views into the request body.
+    """
+    view = memoryview(body)
+    records = []
+    offset = 0
+
+    while offset < len(view):
+        if offset + _RECORD_HEADER.size > len(view):
+            raise HTTPException(status_code=400, detail="Truncated record header")
+
+        ts, length = _RECORD_HEADER.unpack_from(view, offset)
+        offset += _RECORD_HEADER.size
+
+        if length == 0 or offset + length > len(view):
+            raise HTTPException(status_code=400, detail="Truncated record payload")
+
+        records.append((ts or None, view[offset:offset + length]))
+        offset += length
+
+    return records
+
+
+def _check_declared_size(request: Request, allowance: int = 0):
+    """413 before reading when the declared body is already over MAX_BATCH_BYTES (+ framing)."""
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > MAX_BATCH_BYTES + allowance:
+        raise HTTPException(status_code=413, detail="Batch too large")
+
+
+async def _read_body_limited(request: Request) -> bytearray:
+    """Request body, streamed: 413 as soon as it passes MAX_BATCH_BYTES (chunked / lying clients)."""
+    _check_declared_size(request)
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > MAX_BATCH_BYTES:
+            raise HTTPException(status_code=413, detail="Batch too large")
+    return body
+
+
+async def _read_multipart_batch(request: Request):
+    form = await request.form()
+
+    camera_id = form.get("camera_id")
+    images = form.getlist("images")
+    stamps = form.getlist("frame_ts")
+
+    if stamps and len(stamps) != len(images):
+        raise HTTPException(status_code=400, detail="frame_ts count must match images")
+
+    records = []
+    total = 0
+    for idx, image in enumerate(images):
+        if not hasattr(image, "read"):
+            raise HTTPException(status_code=400, detail="images must be files")
+        if image.content_type not in ("image/jpeg", "image/png"):
+            raise HTTPException(status_code=415, detail="Unsupported image type")
+
+        ts = None
+        if stamps:
+            try:
+                ts = float(stamps[idx])
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail=f"frame_ts must be numeric (record {idx})")
+
+        payload = await image.read()
+        total += len(payload)
+        if total > MAX_BATCH_BYTES:
+            raise HTTPException(status_code=413, detail="Batch too large")
+        records.append((ts, payload))
+
+    return camera_id, records
+
+
+@router.post("/batch")
+async def ingest_frame_batch(
+    request: Request,
+    camera_id: str | None = None,
+    reduce: str = "auto",
+):
+    """
+    Many frames per request (same camera).
+
+    Body:
+    - multipart/form-data: camera_id, images (repeated), frame_ts (optional, repeated)
+    - application/octet-stream: repeated [>dI header][JPEG bytes], camera_id in query
+
+    reduce=auto decodes JPEGs at 1/2 or 1/4 scale (IMREAD_REDUCED_COLOR_*)
+    while the longest side stays >= the detector input size; reduce=off
+    keeps full resolution (better plate crops).
+
+    Decoded frames go straight to FrameHub (latest frame wins) and are
+    picked up by the camera's DetectionWorker, like single-frame ingest.
+    So only the NEWEST frames that fit the camera's queue room are queued
+    (INGEST_MAX_PER_CAMERA); older ones would be overwritten in FrameHub
+    anyway and are reported as "superseded", not rejected (no retry).
+    "partial" + retry_after_sec only when the global queue refused frames.
+
+    Limits: MAX_BATCH_FRAMES records, MAX_BATCH_BYTES of image data (both encodings),
+    frame_ts within MAX_FRAME_TS_AGE / MAX_FRAME_TS_AHEAD of server time.
+    """
+    if reduce not in ("auto", "off"):
+        raise HTTPException(status_code=400, detail="reduce must be auto|off")
+    if camera_id:
+        _check_camera(camera_id)   # before reading the body
+
+    content_type = request.headers.get("content-type", "")
+
+    if content_type.startswith("multipart/form-data"):
+        # Refuse before parsing when the declared body is already too big (+ multipart framing)
+        _check_declared_size(request, allowance=64 * 1024)
+        form_camera_id, records = await _read_multipart_batch(request)
+        camera_id = camera_id or form_camera_id
+    elif content_type.startswith("application/octet-stream"):
+        records = _parse_length_prefixed(await _read_body_limited(request))
+    else:
+        raise HTTPException(status_code=415, detail="Unsupported batch encoding")
+
+    if not camera_id:
+        raise HTTPException(status_code=400, detail="camera_id required")
+    _check_camera(camera_id)
+    if not records:
+        raise HTTPException(status_code=400, detail="Empty batch")
+    if len(records) > MAX_BATCH_FRAMES:
+        raise HTTPException(status_code=413, detail="Too many frames in batch")
+    now = time.time()
+    for idx, (ts, payload) in enumerate(records):
+        if ts:      # 0 / absent = server time
+            _check_frame_ts(ts, now, idx)
+        if image_dimensions(payload) is None:
+            raise HTTPException(status_code=400, detail=f"Invalid image (record {idx})")
+
+    slots = INGEST_QUEUE.free_slots(camera_id)
+    if slots == 0:
+        raise _too_busy()
+
+    # Newest `slots` frames, submitted in capture order (stable: ties keep record order)
+    by_capture = sorted(range(len(records)), key=lambda i: records[i][0] or now)
+    queued = [records[i] for i in by_capture[-slots:]]
+    superseded = len(records) - len(queued)
+    accepted = 0
+
+    for ts, payload in queued:
+        flags = reduced_decode_flags(payload) if reduce == "auto" else None
+
+        if not INGEST_QUEUE.submit(
+            camera_id=camera_id,
+            frame_ts=ts or now,
+            payload=payload,
+            decode_flags=flags,
+        ):
+            break
+        accepted += 1
+
+    if accepted == 0:
+        raise _too_busy()
+
+    rejected = len(queued) - accepted
+
+    logger.info(
+        "Batch accepted: %s frames=%d superseded=%d rejected=%d",
+        camera_id,
+        accepted,
+        superseded,
+        rejected,
+    )
+
+    response = {
+        "status": "accepted" if rejected == 0 else "partial",
+        "camera_id": camera_id,
+        "accepted": accepted,
+        "superseded": superseded,
+        "rejected": rejected,
+    }
+    if rejected:
+        response["retry_after_sec"] = INGEST_QUEUE.retry_after()
+
+    return response
+
+
+@router.get("/metrics")
+async def ingest_metrics():
+    """
+    📊 Ingest queue depth / throughput / rejection metrics
+    (async: reads queue state on the loop thread that owns it)
+    """
+    return INGEST_QUEUE.stats()
+
+
+@router.on_event("shutdown")
+async def _shutdown_ingest_queue():
+    await INGEST_QUEUE.shutdown()
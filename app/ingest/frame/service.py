@@ -1,11 +1,51 @@
+# app/ingest/frame/service.py
+
 import asyncio
 import logging
+import threading
 
-from app.ingest.frame.pipeline import process_frame
+from app.config import CAMERAS, PUSH_CAMERAS, PUSH_CAMERAS_MAX
+from app.metrics import FRAMES_TOTAL
 from app.shared import app_state
 
 logger = logging.getLogger(__name__)
 
+# Push-only cameras admitted so far (never released: their workers run for good)
+_push_cameras: set = set()
+_push_lock = threading.Lock()
+
+
+def is_push_camera(camera_id: str) -> bool:
+    """On the PUSH_CAMERAS allow-list (or the list is "*")."""
+    return camera_id in PUSH_CAMERAS or "*" in PUSH_CAMERAS
+
+
+def admit_camera(camera_id: str) -> bool:
+    """
+    May HTTP frames for camera_id start / feed a pipeline?
+
+    Configured CAMERAS always; allow-listed push cameras while fewer than
+    PUSH_CAMERAS_MAX are admitted (admitting reserves the slot).
+    """
+    if camera_id in CAMERAS:
+        return True
+    if not is_push_camera(camera_id):
+        return False
+    with _push_lock:
+        if camera_id in _push_cameras:
+            return True
+        if len(_push_cameras) >= PUSH_CAMERAS_MAX:
+            return False
+        _push_cameras.add(camera_id)
+    logger.info("[SERVICE] push camera admitted | cam=%s (%d/%d)", camera_id, len(_push_cameras), PUSH_CAMERAS_MAX)
+    return True
+
+
+def _start_worker(camera_id: str, frame_hub, detection_manager):
+    from app.detection.detector import start_detection_worker
+
+    start_detection_worker(camera_id, frame_hub, detection_manager)
+
 
 async def ingest_frame_async(
     *,
@@ -13,14 +53,32 @@ async def ingest_frame_async(
     frame_ts: float,
     frame,
 ):
-    logger.info("[SERVICE] ingest frame | cam=%s", camera_id)
-
-    # vehicles empty for HTTP ingest (no detection yet)
-    return await asyncio.to_thread(
-        process_frame,
-        camera_id=camera_id,
-        frame_ts=frame_ts,
-        frame=frame,
-        vehicles=[],
-        frame_store=app_state.frames,
-    )
+    """
+    HTTP ingest -> FrameHub -> DetectionWorker (same path as RTSP cameras).
+
+    - Overwrite-only: latest frame wins (no per-frame backlog)
+    - Detection / ANPR rate limits come from the camera's DetectionWorker
+    - Push-only cameras get a worker on their first frame (admit_camera)
+    """
+    frame_hub = app_state.frame_hub
+    detection_manager = app_state.detection_manager
+
+    if frame_hub is None or detection_manager is None:
+        logger.warning("[SERVICE] pipeline not ready → frame dropped | cam=%s", camera_id)
+        return
+
+    if not admit_camera(camera_id):
+        logger.warning("[SERVICE] camera not admitted → frame dropped | cam=%s", camera_id)
+        return
+
+    frame_hub.register(camera_id)
+    frame_hub.update(camera_id, frame, ts=frame_ts)
+    FRAMES_TOTAL.labels(camera_id, "http").inc()
+
+    if camera_id not in app_state.detection_workers:
+        # First frame of a push-only camera: may import the detector (slow)
+        await asyncio.to_thread(
+            _start_worker, camera_id, frame_hub, detection_manager
+        )
+
+    logger.debug("[SERVICE] ingest frame | cam=%s", camera_id)
@@ -2,6 +2,8 @@
 from dataclasses import dataclass
 import numpy as np
 
+from app.detection.detections import class_name
+
 
 @dataclass
 class Vehicle:
@@ -9,15 +11,38 @@ class Vehicle:
     confidence: float
     cls: str
     crop: np.ndarray
+    track: int | None = None
 
     @staticmethod
-    def from_detection(det: dict, frame: np.ndarray) -> "Vehicle":
-        x1, y1, x2, y2 = det["bbox"]
-        crop = frame[y1:y2, x1:x2]
+    def from_detection(det, frame: np.ndarray) -> "Vehicle":
+        """One row of a detections array (app.detection.detections)."""
+        bbox = tuple(det["bbox"].tolist())
+        x1, y1, x2, y2 = bbox
+        track = int(det["track"])
 
         return Vehicle(
-            bbox=det["bbox"],
-            confidence=det["confidence"],
-            cls=det["class"],
-            crop=crop,
+            bbox=bbox,
+            confidence=float(det["conf"]),
+            cls=class_name(det["cls"]),
+            crop=frame[y1:y2, x1:x2],
+            track=None if track < 0 else track,
         )
+
+    @staticmethod
+    def from_detections(dets: np.ndarray, frame: np.ndarray) -> list:
+        """Whole array -> Vehicles (columns converted once, not per field)."""
+        return [
+            Vehicle(
+                bbox=(x1, y1, x2, y2),
+                confidence=conf,
+                cls=class_name(cls),
+                crop=frame[y1:y2, x1:x2],
+                track=None if track < 0 else track,
+            )
+            for (x1, y1, x2, y2), conf, cls, track in zip(
+                dets["bbox"].tolist(),
+                dets["conf"].tolist(),
+                dets["cls"].tolist(),
+                dets["track"].tolist(),
+            )
+        ]
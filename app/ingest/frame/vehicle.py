@@ -1,60 +1,27 @@
-# app/detection/vehicle_detector.py
+# app/ingest/frame/vehicle.py
 
 import logging
-from ultralytics import YOLO
 
-logger = logging.getLogger("DETECTION")
-
-# Load once at import (correct)
-_model = YOLO("yolov8n.pt")
+from app.detection import detections
+from app.detection.registry import get_vehicle_model
 
-# COCO vehicle class mapping
-VEHICLE_CLASS_MAP = {
-    2: "car",
-    3: "motorcycle",
-    5: "bus",
-    7: "truck",
-}
+logger = logging.getLogger("DETECTION")
 
 
 def detect_vehicles(frame, roi=None):
     """
     Headless vehicle detector.
 
-    Returns list of dicts:
-      {
-        "class": str,
-        "confidence": float,
-        "bbox": [x1, y1, x2, y2]
-      }
+    Returns a DETECTION_DTYPE array (app.detection.detections):
+      bbox [x1, y1, x2, y2] (int32, clamped), conf, cls (COCO id), track
     """
 
-    results = _model(frame, verbose=False)
-
-    vehicles = []
-    h, w = frame.shape[:2]
-
-    for r in results:
-        for box in r.boxes:
-            cls_id = int(box.cls)
-
-            if cls_id not in VEHICLE_CLASS_MAP:
-                continue
-
-            x1, y1, x2, y2 = map(int, box.xyxy[0])
-            x1, y1 = max(0, x1), max(0, y1)
-            x2, y2 = min(w, x2), min(h, y2)
-
-            vehicles.append({
-                "bbox": [x1, y1, x2, y2],
-                "class": VEHICLE_CLASS_MAP[cls_id],  # ✅ semantic label
-                "confidence": float(box.conf),
-            })
+    dets = detections.from_model_output(get_vehicle_model()(frame), frame.shape)
 
     logger.info(
         "[VEHICLE] detected %d vehicles (%s)",
-        len(vehicles),
-        ", ".join(v["class"] for v in vehicles) or "none",
+        len(dets),
+        ", ".join(detections.class_names(dets)) or "none",
     )
 
-    return vehicles
+    return dets
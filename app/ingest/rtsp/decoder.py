@@ -0,0 +1,67 @@
+# app/ingest/rtsp/decoder.py
+
+import os
+from dataclasses import dataclass, replace
+
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+@dataclass(frozen=True)
+class DecoderOptions:
+    """
+    What a camera's ffmpeg decodes and ships.
+
+    - detect_fps: fps filter on the detect branch, matched to the consumer
+      (None = every decoded frame)
+    - keyframes_only: `-skip_frame nokey`; the decoder only touches
+      I-frames (one every GOP, typically 1-2 s). For very low-rate cameras.
+    - gop_sec: the camera's keyframe interval (stall deadline in keyframe-only mode)
+    - preview: emit the preview branch (only while someone is watching)
+    - detect_size: detect branch (w, h); plate-quality when ANPR crops
+      from it (no MAIN tap)
+    """
+
+    detect_fps: float | None = 5.0
+    detect_size: tuple = (640, 360)
+    keyframes_only: bool = False
+    gop_sec: float = 2.0
+    preview: bool = False
+
+    def input_args(self) -> list:
+        return ["-skip_frame", "nokey"] if self.keyframes_only else []
+
+
+def resolve_options(cam_cfg: dict | None, viewers_active: bool) -> DecoderOptions:
+    """
+    Camera config + live preview state -> DecoderOptions.
+
+    CAMERAS[cam]["decoder"] = {"fps": 1.0, "keyframes_only": True, "gop_sec": 4} overrides
+    the defaults. Active viewers force full decoding plus the preview branch;
+    they leave -> back to the cheap configuration. Cameras without a MAIN
+    tap detect on SUB_ANPR_STREAM_SIZE (their plate crops come from it).
+    """
+    from app.config import DETECT_STREAM_FPS, DETECT_STREAM_SIZE, MAIN_STREAM_ANPR, SUB_ANPR_STREAM_SIZE
+
+    cfg = (cam_cfg or {}).get("decoder", {})
+    main_tap = MAIN_STREAM_ANPR and bool((cam_cfg or {}).get("main"))
+    options = DecoderOptions(
+        detect_fps=cfg.get("fps", DETECT_STREAM_FPS),
+        detect_size=tuple(DETECT_STREAM_SIZE if main_tap else SUB_ANPR_STREAM_SIZE),
+        keyframes_only=bool(cfg.get("keyframes_only", False)),
+        gop_sec=float(cfg.get("gop_sec", DecoderOptions.gop_sec)),
+    )
+    if viewers_active:
+        options = replace(options, keyframes_only=False, preview=True)
+    return options
+
+
+def process_cpu_seconds(pid: int) -> float | None:
+    """utime + stime of a child process (Linux /proc); None if unavailable."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # comm (field 2) may contain spaces: split after its closing paren
+    fields = stat[stat.rindex(")") + 2:].split()
+    return (int(fields[11]) + int(fields[12])) / _CLK_TCK
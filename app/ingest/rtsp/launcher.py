@@ -2,7 +2,6 @@
 
 from typing import Dict
 from app.ingest.rtsp.reader import RTSPReader
-import threading
 import logging
 
 logger = logging.getLogger("RTSPLauncher")
@@ -11,30 +10,40 @@ logger = logging.getLogger("RTSPLauncher")
 class RTSPLauncher:
     """
     RTSP lifecycle manager (Stage-2).
+    One RTSPReader thread per camera (RTSP_SUPERVISOR=threads).
     """
 
     def __init__(self, frame_hub):
         self._readers: Dict[str, RTSPReader] = {}
         self.frame_hub = frame_hub
 
-    def add_camera(self, cam_id: str, rtsp_url: str):
+    def add_camera(self, cam_id: str, rtsp_url: str, cam_cfg: dict | None = None):
         if cam_id in self._readers:
             return
 
-        def initialize_reader():
-            try:
-                reader = RTSPReader(
-                    cam_id=cam_id,
-                    rtsp_url=rtsp_url,
-                    frame_hub=self.frame_hub,
-                )
-                self._readers[cam_id] = reader
-                reader.start()
-            except Exception as e:
-                logger.error(f"Failed to initialize RTSPReader for cam_id={cam_id}: {e}")
-
-        thread = threading.Thread(target=initialize_reader, daemon=True)
-        thread.start()
+        # Construction is cheap (no I/O): connecting happens on the reader thread
+        try:
+            reader = RTSPReader(
+                cam_id=cam_id,
+                rtsp_url=rtsp_url,
+                frame_hub=self.frame_hub,
+                cam_cfg=cam_cfg,
+            )
+        except Exception as e:
+            logger.error(f"Failed to initialize RTSPReader for cam_id={cam_id}: {e}")
+            return
+        self._readers[cam_id] = reader
+        reader.start()
+
+    def stop(self):
+        for reader in list(self._readers.values()):
+            reader.stop()
+
+    def decoder_status(self) -> dict:
+        return {
+            cam_id: r.decoder_status()
+            for cam_id, r in list(self._readers.items())
+        }
 
     def has_camera(self, cam_id: str) -> bool:
         return cam_id in self._readers
@@ -0,0 +1,303 @@
+# app/ingest/rtsp/main_stream.py
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+import numpy as np
+
+from app.frames.frame_hub import FrameEntry, content_rect
+from app.metrics import REGISTRY
+
+logger = logging.getLogger("MainStreamTap")
+
+MAIN = "main"   # channel of the tap's single output
+
+MAIN_TAP_TOTAL = REGISTRY.counter(
+    "traffic_main_tap_total",
+    "ANPR frames looked up in the MAIN stream tap (result = hit | miss)",
+    ("camera", "result"),
+)
+
+MAIN_TAP_OPEN = REGISTRY.gauge(
+    "traffic_main_tap_open",
+    "MAIN stream tap reader running (1) or idle (0)",
+    ("camera",),
+)
+
+
+class FrameRing:
+    """
+    Last `size` MAIN frames with their arrival time.
+
+    Duck-types the FrameHub write path (register / update / clear /
+    set_source_size) so a plain RTSPReader can publish into it.
+    """
+
+    def __init__(self, size: int):
+        self._frames = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._seq = 0
+        self.source_size = None     # native MAIN (w, h), reported by the reader
+
+    def register(self, cam_id: str):
+        pass
+
+    def set_source_size(self, cam_id: str, size: tuple):
+        self.source_size = size
+
+    def update(
+        self,
+        cam_id: str,
+        frame,
+        ts: float | None = None,
+        channel: str = MAIN,
+        trace_id: str | None = None,
+    ):
+        with self._lock:
+            self._seq += 1
+            self._frames.append(
+                FrameEntry(frame, time.time() if ts is None else ts, self._seq, trace_id)
+            )
+
+    def clear(self, cam_id: str | None = None, channel: str | None = None):
+        with self._lock:
+            self._frames.clear()
+
+    def closest(self, ts: float, max_skew: float) -> FrameEntry | None:
+        """Frame whose arrival time is nearest `ts`, if within `max_skew` seconds."""
+        with self._lock:
+            frames = list(self._frames)
+        best = min(frames, key=lambda e: abs(e.ts - ts), default=None)
+        if best is None or abs(best.ts - ts) > max_skew:
+            return None
+        return best
+
+    def __len__(self):
+        return len(self._frames)
+
+
+# -------------------------------------------------
+# SUB -> MAIN coordinate mapping
+# -------------------------------------------------
+def map_boxes(boxes: np.ndarray, src_rect: tuple, dst_rect: tuple, dst_shape) -> np.ndarray:
+    """(N, 4) boxes in one rendition -> same field-of-view boxes in another (clamped int32)."""
+    sx, sy, sw, sh = src_rect
+    dx, dy, dw, dh = dst_rect
+    H, W = dst_shape[:2]
+
+    offset = np.array((sx, sy, sx, sy))
+    scale = np.array((dw / sw, dh / sh, dw / sw, dh / sh))
+    origin = np.array((dx, dy, dx, dy))
+    mapped = np.rint(origin + (np.asarray(boxes, np.float64) - offset) * scale)
+    return np.clip(mapped, 0, (W, H, W, H)).astype(np.int32)
+
+
+class MainStreamTap:
+    """
+    On-demand high-resolution twin of a camera's SUB stream (plate crops).
+
+    Detection keeps running on SUB; demand() (a plate crop is due) opens a
+    MAIN stream reader, which fills a short FrameRing. frame_at() returns
+    the MAIN frame closest in time to a SUB frame, and map_vehicles()
+    moves SUB bboxes into its coordinates. Without demand for `idle_after`
+    seconds the reader is stopped: no MAIN decode while no plate crop is due.
+    For `connect_after` seconds after opening, connecting() tells callers
+    to wait for the ring instead of cropping from SUB.
+
+    The mapping needs both streams' native sizes (the picture inside each
+    letterboxed rendition): reported by the readers from ffmpeg's input
+    banner, or set by CAMERAS[cam]["sub_size"] / ["main_size"] ([w, h]).
+    While either is unknown map_vehicles() refuses (None) instead of
+    guessing, and the crop stays on SUB.
+    """
+
+    def __init__(
+        self,
+        cam_id: str,
+        rtsp_url: str,
+        *,
+        size: tuple,
+        fps: float,
+        buffer: int,
+        max_skew: float,
+        idle_after: float,
+        connect_after: float = 0.0,
+        cam_cfg: dict | None = None,
+    ):
+        self.cam_id = cam_id
+        self.rtsp_url = rtsp_url
+        self.size = size
+        self.fps = fps
+        self.max_skew = max_skew
+        self.idle_after = idle_after
+        self.connect_after = connect_after
+        self.ring = FrameRing(buffer)
+
+        cam_cfg = cam_cfg or {}
+        self.sub_size = cam_cfg.get("sub_size")
+        self.main_size = cam_cfg.get("main_size")
+
+        self._reader = None
+        self._unmapped_logged = False
+        self._last_demand = 0.0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+        self.opens = 0
+
+        self._hit = MAIN_TAP_TOTAL.labels(cam_id, "hit")
+        self._miss = MAIN_TAP_TOTAL.labels(cam_id, "miss")
+        self._open_gauge = MAIN_TAP_OPEN.labels(cam_id)
+
+    @property
+    def is_open(self) -> bool:
+        return self._reader is not None and self._reader.is_alive()
+
+    def demand(self):
+        """A plate crop is due: keep (or bring) the MAIN reader up."""
+        self._last_demand = time.monotonic()
+        if self.is_open:
+            return
+        with self._lock:
+            if not self.is_open:
+                self._open()
+
+    def _open(self):
+        from app.ingest.rtsp.reader import ReaderOutput, RTSPReader
+
+        self.ring.clear()
+        # Own metric / log identity: must not collide with the SUB reader's
+        self._reader = RTSPReader(
+            cam_id=f"{self.cam_id}/{MAIN}",
+            rtsp_url=self.rtsp_url,
+            frame_hub=self.ring,
+            outputs=[ReaderOutput(MAIN, *self.size, self.fps)],
+        )
+        self._reader.start()
+        self._opened_at = time.monotonic()
+        self.opens += 1
+        self._open_gauge.set(1)
+        logger.info("[MAIN] %s tap opened (%dx%d@%g)", self.cam_id, *self.size, self.fps)
+
+    def connecting(self, now_m: float | None = None) -> bool:
+        """Opened less than connect_after ago and no MAIN frame yet."""
+        now_m = time.monotonic() if now_m is None else now_m
+        return self.is_open and len(self.ring) == 0 and now_m - self._opened_at < self.connect_after
+
+    def idle_check(self, now_m: float | None = None):
+        now_m = time.monotonic() if now_m is None else now_m
+        with self._lock:
+            if self._reader is None or now_m - self._last_demand < self.idle_after:
+                return
+            self._reader.stop()
+            self._reader = None
+            self.ring.clear()
+            self._open_gauge.set(0)
+        logger.info("[MAIN] %s tap idle -> closed", self.cam_id)
+
+    def frame_at(self, ts: float) -> FrameEntry | None:
+        entry = self.ring.closest(ts, self.max_skew)
+        (self._hit if entry is not None else self._miss).inc()
+        return entry
+
+    def map_vehicles(self, vehicles: np.ndarray, sub_shape, main_shape, sub_source=None) -> np.ndarray | None:
+        """
+        Copy of a detections array with bboxes in MAIN coordinates.
+        sub_source: native SUB (w, h) reported by its reader (FrameHub.source_size).
+        None when either native size is unknown.
+        """
+        sub_size = self.sub_size or sub_source
+        main_size = self.main_size or self.ring.source_size
+        if not sub_size or not main_size:
+            if not self._unmapped_logged:
+                self._unmapped_logged = True
+                logger.warning(
+                    "[MAIN] %s native size unknown (sub=%s main=%s): plate crops stay on SUB",
+                    self.cam_id,
+                    sub_size,
+                    main_size,
+                )
+            return None
+
+        src = content_rect(sub_shape[1], sub_shape[0], sub_size)
+        dst = content_rect(main_shape[1], main_shape[0], main_size)
+        mapped = vehicles.copy()
+        mapped["bbox"] = map_boxes(vehicles["bbox"], src, dst, main_shape)
+        return mapped
+
+    def status(self) -> dict:
+        return {
+            "open": self.is_open,
+            "buffered": len(self.ring),
+            "opens": self.opens,
+            "idle_sec": round(time.monotonic() - self._last_demand, 1) if self._last_demand else None,
+            "state": self._reader.state if self._reader is not None else None,
+        }
+
+
+class MainStreamTaps:
+    """Per-camera taps (cameras with a "main" URL) + one idle reaper thread."""
+
+    def __init__(self, tick: float = 1.0):
+        self.tick = tick
+        self._taps: Dict[str, MainStreamTap] = {}
+        self._lock = threading.Lock()
+        self._reaper = None
+
+    def get(self, cam_id: str, cam_cfg: dict | None) -> MainStreamTap | None:
+        from app.config import (
+            MAIN_STREAM_ANPR,
+            MAIN_STREAM_BUFFER,
+            MAIN_STREAM_CONNECT_SEC,
+            MAIN_STREAM_FPS,
+            MAIN_STREAM_IDLE_SEC,
+            MAIN_STREAM_MAX_SKEW,
+            MAIN_STREAM_SIZE,
+            MOTION_KEEPALIVE_SEC,
+        )
+
+        if not MAIN_STREAM_ANPR or not cam_cfg or not cam_cfg.get("main"):
+            return None
+
+        # Idle timeout clear of the motion keep-alive: demand from keep-alive
+        # inferences alone must not close + reopen (RTSP handshake) every cycle
+        motion = cam_cfg.get("motion")
+        keepalive = motion.get("keepalive", MOTION_KEEPALIVE_SEC) if isinstance(motion, dict) else MOTION_KEEPALIVE_SEC
+        idle_after = max(MAIN_STREAM_IDLE_SEC, 2 * keepalive)
+
+        with self._lock:
+            tap = self._taps.get(cam_id)
+            if tap is None:
+                tap = self._taps[cam_id] = MainStreamTap(
+                    cam_id,
+                    cam_cfg["main"],
+                    size=MAIN_STREAM_SIZE,
+                    fps=MAIN_STREAM_FPS,
+                    buffer=MAIN_STREAM_BUFFER,
+                    max_skew=MAIN_STREAM_MAX_SKEW,
+                    idle_after=idle_after,
+                    connect_after=MAIN_STREAM_CONNECT_SEC,
+                    cam_cfg=cam_cfg,
+                )
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap, daemon=True, name="MainStreamTaps")
+                self._reaper.start()
+        return tap
+
+    def _reap(self):
+        while True:
+            time.sleep(self.tick)
+            for tap in list(self._taps.values()):
+                try:
+                    tap.idle_check()
+                except Exception:
+                    logger.exception("[MAIN] idle check failed for %s", tap.cam_id)
+
+    def status(self) -> dict:
+        return {cam_id: tap.status() for cam_id, tap in list(self._taps.items())}
+
+
+# 🔒 Singleton (process-wide)
+MAIN_STREAM_TAPS = MainStreamTaps()
@@ -1,19 +1,150 @@
 # app/ingest/rtsp/reader.py
 
+import os
+import random
+import re
+import selectors
 import subprocess
 import threading
 import time
 import logging
+from dataclasses import asdict
+from typing import NamedTuple
+
 import numpy as np
 import imageio_ffmpeg
 
+from app.frames.frame_hub import DETECT, PREVIEW
+from app.frames.viewers import PREVIEW_VIEWERS
+from app.ingest.rtsp.decoder import DecoderOptions, process_cpu_seconds, resolve_options
+from app.metrics import (
+    CAMERA_CPU_SECONDS,
+    FRAME_AGE,
+    FRAMES_TOTAL,
+    LAST_FRAME_TS,
+    RTSP_CONNECTED,
+    RTSP_RECONNECTS,
+    RTSP_STATE,
+)
+from app.tracing import new_trace_id
+
 logger = logging.getLogger("RTSPReader")
 
+# Pipe read size: a few hundred KB per syscall instead of 4 KB slivers
+READ_CHUNK = 1 << 18
+
+# 🐕 Watchdog: no detect frame for this long -> kill + reap ffmpeg
+# Both stretch with the expected frame interval (low fps / keyframe-only GOP)
+CONNECT_DEADLINE = 15.0     # spawn -> first frame (RTSP handshake + first GOP)
+STALL_DEADLINE = 5.0        # between frames once streaming (floor)
+STALL_INTERVALS = 3         # expected frame intervals without a frame = stalled
+WATCHDOG_TICK = 0.5         # selector timeout (deadline check granularity)
+
+# Reconnect backoff: restart_delay * 2^(n-1), capped, 50-100% jitter;
+# a run that streamed STABLE_AFTER seconds resets the failure count
+BACKOFF_CAP = 60.0
+STABLE_AFTER = 30.0
+
+CONNECTING = "connecting"
+STREAMING = "streaming"
+STALLED = "stalled"
+BACKOFF = "backoff"
+STOPPED = "stopped"
+STATES = (CONNECTING, STREAMING, STALLED, BACKOFF, STOPPED)
+
+# ffmpeg input banner: "Stream #0:0: Video: h264 (Main), yuv420p(progressive), 704x576 [SAR 12:11 ...]"
+# Storage size (not DAR): it is what scale=...:force_original_aspect_ratio letterboxes
+_INPUT_VIDEO = re.compile(rb"Stream #0:\d+.*: Video: .*?\b(\d{2,5})x(\d{2,5})\b")
+STDERR_LINE_MAX = 4096
+
 
-class RTSPReader(threading.Thread):
+class FrameAssembler:
     """
-    MAIN RTSP reader.
-    Pushes frames into FrameHub.
+    Raw bgr24 pipe bytes -> (H, W, 3) uint8 frames.
+    One instance per ffmpeg process (a restart never inherits a partial frame).
+    """
+
+    def __init__(self, width: int, height: int):
+        self.shape = (height, width, 3)
+        self.frame_size = width * height * 3
+        self._buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> list:
+        self._buffer.extend(chunk)
+
+        frames = []
+        while len(self._buffer) >= self.frame_size:
+            frame_bytes = self._buffer[:self.frame_size]
+            self._buffer = self._buffer[self.frame_size:]
+
+            frames.append(
+                np.frombuffer(frame_bytes, np.uint8).reshape(self.shape)
+            )
+        return frames
+
+    def feed_latest(self, chunk: bytes) -> tuple:
+        """
+        Like feed(), but only materialises the newest complete frame:
+        returns (frame | None, complete_frames_in_buffer). Older frames of a
+        backlog are skipped without a copy (overwrite-only consumers).
+        """
+        self._buffer.extend(chunk)
+
+        n = len(self._buffer) // self.frame_size
+        if n == 0:
+            return None, 0
+
+        end = n * self.frame_size
+        frame = np.frombuffer(
+            bytes(self._buffer[end - self.frame_size:end]), np.uint8
+        ).reshape(self.shape)
+        del self._buffer[:end]
+        return frame, n
+
+
+class ReaderOutput(NamedTuple):
+    """One raw rendition produced by the camera's ffmpeg process."""
+    channel: str            # FrameHub channel
+    width: int
+    height: int
+    fps: float | None       # None = source rate
+
+
+def outputs_for(options: DecoderOptions) -> list:
+    """Dual-mode reader outputs for the camera's current DecoderOptions."""
+    from app.config import PREVIEW_STREAM_FPS, PREVIEW_STREAM_SIZE
+
+    # Keyframe-only: the GOP already sets the rate; an fps filter would
+    # just duplicate keyframes to fill the gaps
+    detect_fps = None if options.keyframes_only else options.detect_fps
+    outputs = [ReaderOutput(DETECT, *options.detect_size, detect_fps)]
+    if options.preview:
+        outputs.append(ReaderOutput(PREVIEW, *PREVIEW_STREAM_SIZE, PREVIEW_STREAM_FPS))
+    return outputs
+
+
+# Legacy RTSP_READER_MODE=single: one 1280x720 source-rate output, unmanaged
+LEGACY_OUTPUTS = [ReaderOutput(DETECT, 1280, 720, None)]
+
+
+class RTSPStream:
+    """
+    One camera's ffmpeg stream, independent of how its pipes are read.
+
+    Owns the decoder configuration, the ffmpeg command line, publishing to
+    FrameHub, the connect/stall watchdog, the state machine and reconnect
+    backoff. RTSPReader drives it from its own thread with blocking reads;
+    the asyncio supervisor (app.ingest.rtsp.supervisor) drives many of them
+    from a few event loops.
+
+    Dual mode is managed by DecoderOptions: the detect branch is rate
+    limited to the consumer (optionally keyframe-only) and the preview
+    branch only exists while the preview has viewers. An options change
+    restarts ffmpeg immediately with the new graph.
+
+    Every output is letterboxed; the native picture size, read from
+    ffmpeg's input banner on stderr, goes to frame_hub.set_source_size()
+    so consumers can find the picture inside the padding.
     """
 
     def __init__(
@@ -21,96 +152,434 @@ class RTSPReader(threading.Thread):
         cam_id: str,
         rtsp_url: str,
         frame_hub,
-        width: int = 1280,   # 🔽 PREVIEW RESOLUTION
-        height: int = 720,   # 🔽 PREVIEW RESOLUTION
+        outputs: list | None = None,
         restart_delay: float = 2.0,
+        cam_cfg: dict | None = None,
     ):
-        super().__init__(daemon=True)
         self.cam_id = cam_id
         self.rtsp_url = rtsp_url
         self.frame_hub = frame_hub
-        self.width = width
-        self.height = height
+        self.cam_cfg = cam_cfg
         self.restart_delay = restart_delay
+
+        # Static outputs (explicit / legacy single mode) or DecoderOptions-managed
+        from app.config import RTSP_READER_MODE
+
+        if outputs is None and RTSP_READER_MODE == "single":
+            outputs = LEGACY_OUTPUTS
+        self._static_outputs = outputs
+        self.options = None if outputs else self._desired_options()
+        self.outputs = outputs or outputs_for(self.options)
         self.running = False
         self.process = None
+        self.source_size = None         # native (w, h), from ffmpeg's stderr
+        self._stderr_buf = b""
+        self._stderr_parsed = False
+
+        # 🐕 Watchdog / reconnect state
+        self.state = STOPPED
+        self._last_frame_mono = None    # last DETECT frame (frame_age)
+        self._run_last_frame = None     # last detect (first output) frame, this ffmpeg run
+        self._spawned_at = None
+        self._stream_started = None
 
         # 📊 FPS tracking
-        self._frame_count = 0
+        self._frame_counts = {DETECT: 0, PREVIEW: 0}
         self._last_fps_log = time.time()
         self._fps_log_interval = 5.0  # seconds
 
-    def _cmd(self):
+        # 📊 Metric children
+        self._frames_total = FRAMES_TOTAL.labels(cam_id, "rtsp")
+        self._connected = RTSP_CONNECTED.labels(cam_id)
+        self._last_frame_ts = LAST_FRAME_TS.labels(cam_id)
+        self._cpu = CAMERA_CPU_SECONDS.labels(cam_id, "reader")
+        self._ffmpeg_cpu = CAMERA_CPU_SECONDS.labels(cam_id, "ffmpeg")
+        self._ffmpeg_cpu_mark = 0.0
+        self._reconnects = RTSP_RECONNECTS
+        self._state_gauges = {st: RTSP_STATE.labels(cam_id, st) for st in STATES}
+        FRAME_AGE.labels(cam_id).set_function(lambda: self.frame_age() or 0.0)
+        self._state_gauges[STOPPED].set(1)
+
+    # -------------------------------------------------
+    # Decoder configuration
+    # -------------------------------------------------
+    def _desired_options(self) -> DecoderOptions:
+        return resolve_options(self.cam_cfg, PREVIEW_VIEWERS.active(self.cam_id))
+
+    def _needs_reconfigure(self) -> bool:
+        if self._static_outputs is not None:
+            return False
+        return self._desired_options() != self.options
+
+    def _apply_options(self):
+        if self._static_outputs is not None:
+            return
+        previous = self.options
+        self.options = self._desired_options()
+        self.outputs = outputs_for(self.options)
+
+        if previous != self.options:
+            logger.info("[RTSP] %s decoder -> %s", self.cam_id, self.options)
+        if not self.options.preview:
+            self.frame_hub.clear(self.cam_id, PREVIEW)   # viewers fall back to DETECT
+
+    def _sample_ffmpeg_cpu(self):
+        if self.process is None:
+            return
+        cpu = process_cpu_seconds(self.process.pid)
+        if cpu is not None and cpu > self._ffmpeg_cpu_mark:
+            self._ffmpeg_cpu.inc(cpu - self._ffmpeg_cpu_mark)
+            self._ffmpeg_cpu_mark = cpu
+
+    def decoder_status(self) -> dict:
+        return {
+            "state": self.state,
+            "options": None if self.options is None else asdict(self.options),
+            "outputs": [o._asdict() for o in self.outputs],
+            "ffmpeg_pid": self.process.pid if self.process is not None else None,
+        }
+
+    @staticmethod
+    def _branch(output: ReaderOutput) -> str:
+        # Letterbox into exactly WxH: FrameAssembler needs fixed frame sizes
+        w, h = output.width, output.height
+        chain = [] if output.fps is None else [f"fps={output.fps:g}"]
+        chain += [
+            f"scale={w}:{h}:force_original_aspect_ratio=decrease",
+            f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2",
+        ]
+        return ",".join(chain)
+
+    def _cmd(self, fds: list):
+        """fds: pipe fd per output (stdout for the first)."""
         ffmpeg = imageio_ffmpeg.get_ffmpeg_exe()
-        return [
+        cmd = [
             ffmpeg,
             "-rtsp_transport", "tcp",
-            "-i", self.rtsp_url,
-            "-an",
-            "-vf", f"scale={self.width}:{self.height}",
-            "-pix_fmt", "bgr24",
-            "-f", "rawvideo",
             "-fflags", "nobuffer",
             "-flags", "low_delay",
             "-probesize", "32",
             "-analyzeduration", "0",
-            "pipe:1",
+            "-hide_banner",
+            "-nostats",     # stderr: input banner + warnings only (_on_stderr)
+            *(self.options.input_args() if self.options is not None else []),
+            "-i", self.rtsp_url,
+            "-an",
         ]
 
-    def run(self):
+        if len(self.outputs) == 1:
+            cmd += ["-vf", self._branch(self.outputs[0])]
+            maps = [None]
+        else:
+            n = len(self.outputs)
+            graph = f"[0:v]split={n}" + "".join(f"[s{i}]" for i in range(n))
+            for i, output in enumerate(self.outputs):
+                graph += f";[s{i}]{self._branch(output)}[o{i}]"
+            cmd += ["-filter_complex", graph]
+            maps = [f"[o{i}]" for i in range(n)]
+
+        for i, (output, fd) in enumerate(zip(self.outputs, fds)):
+            if maps[i] is not None:
+                cmd += ["-map", maps[i]]
+            cmd += [
+                "-pix_fmt", "bgr24",
+                "-f", "rawvideo",
+                "pipe:1" if i == 0 else f"pipe:{fd}",
+            ]
+        return cmd
+
+    def _log_spawned(self):
+        logger.info(
+            "[RTSP] %s ffmpeg up (%s%s)",
+            self.cam_id,
+            ", ".join(f"{o.channel}={o.width}x{o.height}@{o.fps or 'src'}" for o in self.outputs),
+            ", keyframes only" if self.options and self.options.keyframes_only else "",
+        )
+
+    # -------------------------------------------------
+    # Frame path
+    # -------------------------------------------------
+    def _publish(self, output: ReaderOutput, frame, now: float):
+        # Capture stamp: ts + trace id travel with the frame (app.tracing)
+        self.frame_hub.update(
+            self.cam_id,
+            frame,
+            ts=now,
+            channel=output.channel,
+            trace_id=new_trace_id(),
+        )
+        self._frame_counts[output.channel] = self._frame_counts.get(output.channel, 0) + 1
+
+        if output.channel == DETECT:
+            self._frames_total.inc()
+            self._last_frame_ts.set(now)
+            self._last_frame_mono = time.monotonic()
+
+    def _on_stderr(self, chunk: bytes):
+        """ffmpeg stderr (always drained): picks the input picture size from the banner."""
+        if self._stderr_parsed:
+            return
+        *lines, self._stderr_buf = (self._stderr_buf + chunk).split(b"\n")
+        self._stderr_buf = self._stderr_buf[-STDERR_LINE_MAX:]
+        for line in lines:
+            if line.startswith(b"Output #"):
+                self._stderr_parsed = True     # output streams follow: not the source
+                return
+            match = _INPUT_VIDEO.search(line)
+            if match:
+                self._stderr_parsed = True
+                self._set_source_size((int(match.group(1)), int(match.group(2))))
+                return
+
+    def _set_source_size(self, size: tuple):
+        if size != self.source_size:
+            logger.info("[RTSP] %s source %dx%d", self.cam_id, *size)
+        self.source_size = size
+        self.frame_hub.set_source_size(self.cam_id, size)
+
+    def _on_chunk(self, output: ReaderOutput, assembler: FrameAssembler, chunk: bytes):
+        # Overwrite-only hub: only the newest frame of a read matters
+        frame, n = assembler.feed_latest(chunk)
+        if frame is None:
+            return
+        self._publish(output, frame, time.time())
+        self._frame_counts[output.channel] += n - 1
+        if output.channel != self.outputs[0].channel:
+            return   # watchdog follows the detect output only: a live preview must not mask its stall
+        self._run_last_frame = time.monotonic()
+        if self._stream_started is None:
+            self._stream_started = self._run_last_frame
+            self._set_state(STREAMING)
+
+    def _log_fps(self, now: float):
+        self._sample_ffmpeg_cpu()
+
+        elapsed = now - self._last_fps_log
         logger.info(
-            "[RTSP] Connecting MAIN stream: %s (%dx%d)",
+            "[RTSP] %s decode FPS: %s",
+            self.cam_id,
+            " ".join(f"{c}={n / elapsed:.1f}" for c, n in self._frame_counts.items()),
+        )
+        self._frame_counts = dict.fromkeys(self._frame_counts, 0)
+        self._last_fps_log = now
+
+    # -------------------------------------------------
+    # State machine: connecting -> streaming -> (stalled | eof) -> backoff
+    # -------------------------------------------------
+    def _set_state(self, state: str):
+        if state == self.state:
+            return
+        previous, self.state = self.state, state
+        self._state_gauges[previous].set(0)
+        self._state_gauges[state].set(1)
+        self._connected.set(1 if state == STREAMING else 0)
+        logger.info("[RTSP] %s %s -> %s", self.cam_id, previous, state)
+
+    def backoff_delay(self, failures: int) -> float:
+        """Exponential (base * 2^(n-1)), capped, with jitter in [50%, 100%]."""
+        delay = min(BACKOFF_CAP, self.restart_delay * (2 ** max(failures - 1, 0)))
+        return delay * random.uniform(0.5, 1.0)
+
+    def frame_age(self) -> float | None:
+        return None if self._last_frame_mono is None else time.monotonic() - self._last_frame_mono
+
+    def _begin_run(self):
+        """ffmpeg just spawned: reset per-run watchdog state."""
+        self._run_last_frame = None
+        self._stream_started = None
+        self._spawned_at = time.monotonic()
+        self._stderr_buf = b""
+        self._stderr_parsed = False
+
+    def frame_interval(self) -> float:
+        """Expected seconds between frames of the first (detect) output; 0 = source rate."""
+        if self.options is not None and self.options.keyframes_only:
+            return self.options.gop_sec
+        fps = self.outputs[0].fps
+        return 1.0 / fps if fps else 0.0
+
+    def deadlines(self) -> tuple:
+        """(connect, stall) watchdog deadlines for the current outputs."""
+        interval = self.frame_interval()
+        return CONNECT_DEADLINE + interval, max(STALL_DEADLINE, STALL_INTERVALS * interval)
+
+    def _watchdog(self) -> str | None:
+        """Per-tick checks while streaming; returns a reason to end the run."""
+        # 🐕 Read deadline (a stalled socket never closes the pipe)
+        now_m = time.monotonic()
+        connect_deadline, stall_deadline = self.deadlines()
+        if self._run_last_frame is None:
+            if now_m - self._spawned_at > connect_deadline:
+                self._set_state(STALLED)
+                return "connect_timeout"
+        elif now_m - self._run_last_frame > stall_deadline:
+            self._set_state(STALLED)
+            return "stalled"
+
+        now = time.time()
+        if now - self._last_fps_log >= self._fps_log_interval:
+            self._log_fps(now)
+
+        if self._needs_reconfigure():
+            return "reconfigure"
+        return None
+
+    def _backoff(self, reason: str, failures: int) -> tuple:
+        """A run ended (not reconfigure / stop): -> (failures, delay)."""
+        streamed = (
+            time.monotonic() - self._stream_started
+            if self._stream_started is not None
+            else 0.0
+        )
+        failures = 1 if streamed >= STABLE_AFTER else failures + 1
+        self._reconnects.labels(self.cam_id, reason).inc()
+
+        delay = self.backoff_delay(failures)
+        self._set_state(BACKOFF)
+        logger.warning(
+            "[RTSP] %s ended (%s, streamed %.0fs) -> retry #%d in %.1fs",
             self.cam_id,
-            self.width,
-            self.height,
+            reason,
+            streamed,
+            failures,
+            delay,
         )
+        return failures, delay
+
+
+class RTSPReader(RTSPStream, threading.Thread):
+    """
+    MAIN RTSP reader.
+    Pushes frames into FrameHub.
+
+    One ffmpeg process per camera. With several outputs (dual mode) ffmpeg
+    splits the decoded stream once, rate-limits + scales each branch and
+    writes each to its own pipe (stdout + extra fds); one thread drains
+    all pipes with a selector and publishes every output to its channel.
+    """
+
+    def __init__(self, cam_id: str, rtsp_url: str, frame_hub, **kwargs):
+        threading.Thread.__init__(self, daemon=True, name=f"RTSPReader-{cam_id}")
+        RTSPStream.__init__(self, cam_id, rtsp_url, frame_hub, **kwargs)
+        self._wake = threading.Event()
+        self._cpu_mark = 0.0
+
+    def _spawn(self):
+        """Start ffmpeg; returns {read_fd: ReaderOutput} for every output pipe."""
+        self._apply_options()
+        self._ffmpeg_cpu_mark = 0.0
+
+        extra = [os.pipe() for _ in self.outputs[1:]]
+        try:
+            self.process = subprocess.Popen(
+                self._cmd([None] + [w for _, w in extra]),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                pass_fds=[w for _, w in extra],
+            )
+        finally:
+            for _, w in extra:
+                os.close(w)   # child holds its copy; EOF reaches us when it exits
+
+        fds = [self.process.stdout.fileno()] + [r for r, _ in extra]
+        return dict(zip(fds, self.outputs)), [r for r, _ in extra]
+
+    def _log_fps(self, now: float):
+        cpu_now = time.thread_time()
+        self._cpu.inc(cpu_now - self._cpu_mark)
+        self._cpu_mark = cpu_now
+        super()._log_fps(now)
+
+    def stop(self):
+        self.running = False
+        self._wake.set()
+        process = self.process
+        if process is not None and process.poll() is None:
+            process.kill()
+
+    def _reap(self, extra_fds: list):
+        """Kill (if still alive) and reap ffmpeg; close every pipe we own."""
+        process = self.process
+        if process is None:
+            return
+        self._sample_ffmpeg_cpu()
+        if process.poll() is None:
+            process.kill()
+        try:
+            process.wait(timeout=5.0)
+        except subprocess.TimeoutExpired:
+            logger.error("[RTSP] %s ffmpeg pid=%s did not exit after SIGKILL", self.cam_id, process.pid)
+        for pipe in (process.stdout, process.stderr):
+            if pipe is not None:
+                pipe.close()
+        for fd in extra_fds:
+            os.close(fd)
+
+    def _stream_once(self) -> str:
+        """
+        One ffmpeg lifetime. Returns why it ended:
+        reconfigure | eof | connect_timeout | stalled | error | stopped
+        """
+        extra_fds = []
+        self._cpu_mark = time.thread_time()
+        try:
+            self._set_state(CONNECTING)
+            pipes, extra_fds = self._spawn()
+            self._log_spawned()
+            assemblers = {
+                fd: FrameAssembler(o.width, o.height) for fd, o in pipes.items()
+            }
+            self._begin_run()
+
+            stderr_fd = self.process.stderr.fileno()
+
+            with selectors.DefaultSelector() as sel:
+                for fd in pipes:
+                    sel.register(fd, selectors.EVENT_READ)
+                sel.register(stderr_fd, selectors.EVENT_READ)
+
+                while self.running:
+                    for key, _ in sel.select(timeout=WATCHDOG_TICK):
+                        chunk = os.read(key.fd, READ_CHUNK)
+                        if key.fd == stderr_fd:
+                            # Drained even once parsed: a full pipe would block ffmpeg
+                            if chunk:
+                                self._on_stderr(chunk)
+                            else:
+                                sel.unregister(stderr_fd)
+                            continue
+                        if not chunk:
+                            return "eof"    # any pipe closing = ffmpeg gone
+                        self._on_chunk(pipes[key.fd], assemblers[key.fd], chunk)
+
+                    reason = self._watchdog()
+                    if reason is not None:
+                        return reason
+            return "stopped"
+
+        except Exception:
+            logger.exception("[RTSP] Crash on %s", self.cam_id)
+            return "error"
+        finally:
+            self._cpu.inc(time.thread_time() - self._cpu_mark)
+            self._reap(extra_fds)
+
+    def run(self):
+        logger.info("[RTSP] Connecting MAIN stream: %s", self.cam_id)
 
         self.running = True
         self.frame_hub.register(self.cam_id)
 
-        frame_size = self.width * self.height * 3
-        buffer = bytearray()
-
+        failures = 0
         while self.running:
-            try:
-                self.process = subprocess.Popen(
-                    self._cmd(),
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.DEVNULL,
-                    bufsize=10**8,
-                )
+            reason = self._stream_once()
+            if not self.running:
+                break
+            if reason == "reconfigure":
+                continue   # same camera, new graph: no reconnect delay
 
-                while self.running:
-                    chunk = self.process.stdout.read(4096)
-                    if not chunk:
-                        break
-
-                    buffer.extend(chunk)
-
-                    while len(buffer) >= frame_size:
-                        frame_bytes = buffer[:frame_size]
-                        buffer = buffer[frame_size:]
-
-                        frame = np.frombuffer(
-                            frame_bytes, np.uint8
-                        ).reshape((self.height, self.width, 3))
-
-                        self.frame_hub.update(self.cam_id, frame)
-
-                        # 📊 FPS accounting
-                        self._frame_count += 1
-                        now = time.time()
-                        if now - self._last_fps_log >= self._fps_log_interval:
-                            fps = self._frame_count / (now - self._last_fps_log)
-                            logger.info(
-                                "[RTSP] %s decode FPS: %.1f",
-                                self.cam_id,
-                                fps,
-                            )
-                            self._frame_count = 0
-                            self._last_fps_log = now
-
-            except Exception:
-                logger.exception("[RTSP] Crash on %s", self.cam_id)
-
-            time.sleep(self.restart_delay)
+            failures, delay = self._backoff(reason, failures)
+            # No ffmpeg, no reads: a dead camera costs nothing while backing off
+            self._wake.wait(delay)
+
+        self._set_state(STOPPED)
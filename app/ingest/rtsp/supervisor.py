@@ -0,0 +1,401 @@
+# app/ingest/rtsp/supervisor.py
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict
+
+from app.ingest.rtsp.reader import (
+    CONNECTING,
+    READ_CHUNK,
+    STOPPED,
+    WATCHDOG_TICK,
+    FrameAssembler,
+    RTSPStream,
+)
+
+logger = logging.getLogger("RTSPSupervisor")
+
+
+class _PidfdChildWatcher(asyncio.AbstractChildWatcher):
+    """
+    Child exit as a readable pidfd on whichever loop spawned the child
+    (what Python 3.12 does by default). 3.11's stock PidfdChildWatcher is
+    bound to one loop, and the default ThreadedChildWatcher parks a
+    waitpid thread per child: O(cameras) threads.
+    """
+
+    def __init__(self):
+        self._callbacks = {}    # pid -> (loop, pidfd)
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def is_active(self):
+        return True
+
+    def close(self):
+        pass
+
+    def attach_loop(self, loop):
+        pass
+
+    def add_child_handler(self, pid, callback, *args):
+        loop = asyncio.get_running_loop()
+        pidfd = os.pidfd_open(pid)
+        with self._lock:
+            self._callbacks[pid] = (loop, pidfd)
+        loop.add_reader(pidfd, self._do_wait, pid, callback, args)
+
+    def _do_wait(self, pid, callback, args):
+        with self._lock:
+            loop, pidfd = self._callbacks.pop(pid)
+        loop.remove_reader(pidfd)
+        try:
+            _, status = os.waitpid(pid, 0)
+            returncode = os.waitstatus_to_exitcode(status)
+        except ChildProcessError:
+            returncode = 255    # reaped elsewhere
+        finally:
+            os.close(pidfd)
+        callback(pid, returncode, *args)
+
+    def remove_child_handler(self, pid):
+        with self._lock:
+            entry = self._callbacks.pop(pid, None)
+        if entry is None:
+            return False
+        loop, pidfd = entry
+        loop.remove_reader(pidfd)
+        os.close(pidfd)
+        return True
+
+
+_watcher_lock = threading.Lock()
+
+
+def install_child_watcher() -> bool:
+    """Python < 3.12 on Linux >= 5.3: pidfd child watcher for all loops (idempotent)."""
+    if sys.version_info >= (3, 12) or not hasattr(os, "pidfd_open"):
+        return False
+    try:
+        os.close(os.pidfd_open(os.getpid()))
+    except OSError:
+        logger.warning("[RTSP] pidfd unavailable (kernel < 5.3): one waitpid thread per ffmpeg")
+        return False
+
+    with _watcher_lock:
+        policy = asyncio.get_event_loop_policy()
+        if not isinstance(policy.get_child_watcher(), _PidfdChildWatcher):
+            policy.set_child_watcher(_PidfdChildWatcher())
+    return True
+
+
+class AsyncRTSPStream(RTSPStream):
+    """
+    RTSPStream driven by an asyncio loop instead of a thread.
+
+    ffmpeg runs under asyncio.create_subprocess_exec; each output pipe is
+    drained by a small task (non-blocking reads). The connect/stall
+    watchdog is ticked by the shard for all of its cameras at once, so an
+    idle camera costs no wakeups of its own.
+    """
+
+    def __init__(self, cam_id: str, rtsp_url: str, frame_hub, *, loop, **kwargs):
+        super().__init__(cam_id, rtsp_url, frame_hub, **kwargs)
+        self.loop = loop
+        self._wake = asyncio.Event()
+        self._ended = None      # Future[reason] of the current ffmpeg run
+        self._live = False      # spawned, watchdog armed
+        self._pipes = []        # extra output pipes (file objects)
+        self._transports = []
+
+    # -------------------------------------------------
+    # Control (stop is thread-safe; the rest runs on the loop)
+    # -------------------------------------------------
+    def _end(self, reason: str):
+        if self._ended is not None and not self._ended.done():
+            self._ended.set_result(reason)
+
+    def _wake_up(self):
+        self._end("stopped")
+        self._wake.set()
+
+    def stop(self):
+        self.running = False
+        try:
+            self.loop.call_soon_threadsafe(self._wake_up)
+        except RuntimeError:
+            pass   # loop already closed
+
+    def tick(self):
+        """Shard watchdog tick: end the run on a missed deadline / reconfigure."""
+        if not self._live or self._ended.done():
+            return
+        reason = self._watchdog()
+        if reason is not None:
+            self._end(reason)
+
+    async def _sleep(self, delay: float):
+        try:
+            await asyncio.wait_for(self._wake.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+    # -------------------------------------------------
+    # ffmpeg lifetime
+    # -------------------------------------------------
+    async def _spawn(self) -> list:
+        """Start ffmpeg; returns [(StreamReader, ReaderOutput)] per output pipe."""
+        self._apply_options()
+        self._ffmpeg_cpu_mark = 0.0
+        self.process = None
+
+        extra = [os.pipe() for _ in self.outputs[1:]]
+        self._pipes = [os.fdopen(r, "rb", buffering=0) for r, _ in extra]
+        try:
+            self.process = await asyncio.create_subprocess_exec(
+                *self._cmd([None] + [w for _, w in extra]),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                pass_fds=[w for _, w in extra],
+                limit=READ_CHUNK,
+            )
+        finally:
+            for _, w in extra:
+                os.close(w)   # child holds its copy; EOF reaches us when it exits
+
+        streams = [self.process.stdout]
+        for pipe in self._pipes:
+            reader = asyncio.StreamReader(limit=READ_CHUNK)
+            transport, _ = await self.loop.connect_read_pipe(
+                lambda reader=reader: asyncio.StreamReaderProtocol(reader),
+                pipe,
+            )
+            self._transports.append(transport)
+            streams.append(reader)
+        return list(zip(streams, self.outputs))
+
+    async def _pump(self, stream, output):
+        assembler = FrameAssembler(output.width, output.height)
+        while True:
+            chunk = await stream.read(READ_CHUNK)
+            if not chunk:
+                self._end("eof")    # any pipe closing = ffmpeg gone
+                return
+            cpu = time.thread_time()
+            self._on_chunk(output, assembler, chunk)
+            self._cpu.inc(time.thread_time() - cpu)
+
+    async def _pump_stderr(self):
+        # Drained even once parsed: a full pipe would block ffmpeg
+        while True:
+            chunk = await self.process.stderr.read(READ_CHUNK)
+            if not chunk:
+                return
+            self._on_stderr(chunk)
+
+    def _pump_done(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("[RTSP] Crash on %s", self.cam_id, exc_info=task.exception())
+            self._end("error")
+
+    async def _drain_and_wait(self):
+        # stdout / stderr must reach EOF before asyncio closes the subprocess transport
+        async def drain(stream):
+            while await stream.read(READ_CHUNK):
+                pass
+
+        await asyncio.gather(drain(self.process.stdout), drain(self.process.stderr))
+        await self.process.wait()
+
+    async def _reap(self):
+        """Kill (if still alive) and reap ffmpeg; close every pipe we own."""
+        for transport in self._transports:
+            transport.close()
+        for pipe in self._pipes:
+            pipe.close()
+        self._transports, self._pipes = [], []
+
+        process = self.process
+        if process is None:
+            return
+        self._sample_ffmpeg_cpu()
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+        try:
+            await asyncio.wait_for(self._drain_and_wait(), 5.0)
+        except asyncio.TimeoutError:
+            logger.error("[RTSP] %s ffmpeg pid=%s did not exit after SIGKILL", self.cam_id, process.pid)
+
+    async def _stream_once(self) -> str:
+        """
+        One ffmpeg lifetime. Returns why it ended:
+        reconfigure | eof | connect_timeout | stalled | error | stopped
+        """
+        self._ended = self.loop.create_future()
+        pumps = []
+        try:
+            self._set_state(CONNECTING)
+            streams = await self._spawn()
+            self._log_spawned()
+            self._begin_run()
+            self._live = True
+
+            for stream, output in streams:
+                task = asyncio.create_task(self._pump(stream, output))
+                task.add_done_callback(self._pump_done)
+                pumps.append(task)
+            task = asyncio.create_task(self._pump_stderr())
+            task.add_done_callback(self._pump_done)
+            pumps.append(task)
+            return await self._ended
+
+        except Exception:
+            logger.exception("[RTSP] Crash on %s", self.cam_id)
+            return "error"
+        finally:
+            self._live = False
+            for task in pumps:
+                task.cancel()
+            await asyncio.gather(*pumps, return_exceptions=True)
+            await self._reap()
+
+    async def run(self):
+        logger.info("[RTSP] Connecting MAIN stream: %s", self.cam_id)
+
+        self.running = True
+        self.frame_hub.register(self.cam_id)
+
+        failures = 0
+        try:
+            while self.running:
+                reason = await self._stream_once()
+                if not self.running:
+                    break
+                if reason == "reconfigure":
+                    continue   # same camera, new graph: no reconnect delay
+
+                failures, delay = self._backoff(reason, failures)
+                # No ffmpeg, no reads: a dead camera costs nothing while backing off
+                await self._sleep(delay)
+        finally:
+            self._set_state(STOPPED)
+
+
+class _Shard(threading.Thread):
+    """One event loop thread running a subset of the cameras."""
+
+    def __init__(self, index: int):
+        super().__init__(daemon=True, name=f"RTSPShard-{index}")
+        self.index = index
+        self.loop = asyncio.new_event_loop()
+        self.streams: Dict[str, AsyncRTSPStream] = {}
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.create_task(self._watchdog())
+        self.loop.run_forever()
+
+    async def _watchdog(self):
+        # 🐕 One timer per shard instead of one per camera
+        while True:
+            await asyncio.sleep(WATCHDOG_TICK)
+            for stream in list(self.streams.values()):
+                try:
+                    stream.tick()
+                except Exception:
+                    logger.exception("[RTSP] watchdog tick failed for %s", stream.cam_id)
+
+    def _add(self, stream: AsyncRTSPStream):
+        self.streams[stream.cam_id] = stream
+        task = self.loop.create_task(stream.run())
+        task.add_done_callback(lambda _: self.streams.pop(stream.cam_id, None))
+
+    def submit(self, stream: AsyncRTSPStream):
+        self.loop.call_soon_threadsafe(self._add, stream)
+
+
+class RTSPSupervisor:
+    """
+    RTSP lifecycle manager on asyncio (RTSP_SUPERVISOR=asyncio).
+
+    Same interface as RTSPLauncher, but every camera's ffmpeg is read by
+    one of `shards` event-loop threads (least-loaded assignment) instead of
+    a thread per camera: hundreds of streams from a handful of threads,
+    no per-camera thread stack, and pipe reads only wake the loop when a
+    pipe has data. Decoding itself still happens in each camera's ffmpeg.
+
+    Child exit is a pidfd on the shard's loop (3.12 default; installed
+    explicitly on 3.11, see install_child_watcher), so no thread per ffmpeg.
+    Only a kernel without pidfd (< 5.3) falls back to a waitpid thread each.
+    """
+
+    def __init__(self, frame_hub, shards: int | None = None):
+        from app.config import RTSP_SUPERVISOR_SHARDS
+
+        self.frame_hub = frame_hub
+        self._streams: Dict[str, AsyncRTSPStream] = {}
+        self._assigned: Dict[str, _Shard] = {}
+        self._lock = threading.Lock()
+
+        install_child_watcher()
+        n = max(1, shards or RTSP_SUPERVISOR_SHARDS)
+        self._shards = [_Shard(i) for i in range(n)]
+        for shard in self._shards:
+            shard.start()
+        logger.info("[RTSP] asyncio supervisor up | shards=%d", n)
+
+    def add_camera(self, cam_id: str, rtsp_url: str, cam_cfg: dict | None = None):
+        with self._lock:
+            if cam_id in self._streams:
+                return
+
+            load = {s.index: 0 for s in self._shards}
+            for shard in self._assigned.values():
+                load[shard.index] += 1
+            shard = self._shards[min(load, key=load.get)]
+
+            try:
+                stream = AsyncRTSPStream(
+                    cam_id=cam_id,
+                    rtsp_url=rtsp_url,
+                    frame_hub=self.frame_hub,
+                    cam_cfg=cam_cfg,
+                    loop=shard.loop,
+                )
+            except Exception as e:
+                logger.error(f"Failed to initialize RTSP stream for cam_id={cam_id}: {e}")
+                return
+            self._streams[cam_id] = stream
+            self._assigned[cam_id] = shard
+
+        shard.submit(stream)
+
+    def stop(self):
+        for stream in list(self._streams.values()):
+            stream.stop()
+
+    def decoder_status(self) -> dict:
+        with self._lock:
+            items = [(c, s, self._assigned[c].index) for c, s in self._streams.items()]
+        return {
+            cam_id: {**stream.decoder_status(), "shard": index}
+            for cam_id, stream, index in items
+        }
+
+    def has_camera(self, cam_id: str) -> bool:
+        return cam_id in self._streams
+
+    def get_latest_frame(self, cam_id: str):
+        return self.frame_hub.latest(cam_id)
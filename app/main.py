@@ -1,84 +1,19 @@
 # app/main.py
 
-# =================================================
-# 🔥 PHASE 1 — FORENSIC PYTHON STARTUP LOGGING
-# =================================================
 import os
 import shutil
-import sys
 import uuid
 import logging
 
-FORENSIC_STARTUP = True
-
-if FORENSIC_STARTUP:
-    print("\n========== PYTHON STARTUP DEBUG ==========")
-    print("CWD:", os.getcwd())
-    print("__file__:", __file__)
-    print("sys.executable:", sys.executable)
-    print("sys.argv:", sys.argv)
-
-    print("\n--- sys.path ---")
-    for p in sys.path:
-        print("  -", p)
-
-    print("\n--- Filesystem probes ---")
-    for path in ["/", "/app", "/app/app"]:
-        try:
-            print(f"ls {path} ->", os.listdir(path))
-        except Exception as e:
-            print(f"ls {path} FAILED:", repr(e))
-
-    print("\n--- Import sanity checks ---")
-    try:
-        import app
-        print("✅ import app SUCCESS:", app)
-        print("   app.__file__:", getattr(app, "__file__", None))
-    except Exception as e:
-        print("❌ import app FAILED:", repr(e))
-
-    print("==========================================\n")
-
-# =================================================
-# NORMAL IMPORTS
-# =================================================
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
-from app.config import CAMERAS
+from app.config import CAMERAS, RTSP_SUPERVISOR
 from app.shared import app_state
+from app.startup import STARTUP
 
-logger = logging.getLogger(__name__)
-
-# =================================================
-# 🔥 Startup cleanup (Gate-2 debug)
-# =================================================
 PLATE_DEBUG_DIR = "/tmp/plate_debug"
 
-try:
-    shutil.rmtree(PLATE_DEBUG_DIR, ignore_errors=True)
-    os.makedirs(PLATE_DEBUG_DIR, exist_ok=True)
-
-    print(
-        f"[STARTUP] Cleared plate debug dir: {PLATE_DEBUG_DIR}",
-        flush=True,
-    )
-
-    files = os.listdir(PLATE_DEBUG_DIR)
-    jpgs = [f for f in files if f.lower().endswith(".jpg")]
-
-    print(
-        f"[STARTUP] Plate debug dir verification: "
-        f"{len(files)} files, {len(jpgs)} JPGs → {files}",
-        flush=True,
-    )
-
-except Exception as e:
-    print(
-        f"[STARTUP] Plate debug cleanup/verify FAILED: {e}",
-        flush=True,
-    )
-
 # =================================================
 # LOGGING SETUP (GLOBAL, BOOT-ID SAFE)
 # =================================================
@@ -129,34 +64,31 @@ logger.warning(
 # =================================================
 # STARTUP — RUNTIME WIRING ONLY
 # =================================================
-@app.on_event("startup")
-def startup():
-    logger.warning(
-        "🔥 STARTUP ENTERED | pid=%s | cwd=%s | PYTHONPATH=%s",
-        os.getpid(),
-        os.getcwd(),
-        os.getenv("PYTHONPATH"),
-    )
+def _clear_debug_dir():
+    # Empty (not remove) the dir: it is mounted as static files
+    removed = 0
+    for name in os.listdir(PLATE_DEBUG_DIR):
+        path = os.path.join(PLATE_DEBUG_DIR, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            os.remove(path)
+        removed += 1
 
-    # -------------------------------
-    # FrameHub init (MAIN frames)
-    # -------------------------------
-    from app.frames.frame_hub import FrameHub
+    logger.info("[Startup] Cleared plate debug dir: %s (%d entries)", PLATE_DEBUG_DIR, removed)
 
-    frame_hub = FrameHub()
-    app_state.frame_hub = frame_hub
-
-    for cam_id in CAMERAS.keys():
-        frame_hub.register(cam_id)
 
-    logger.info("[Startup] FrameHub initialized & cameras registered")
+def _wire_cameras(frame_hub):
+    # RTSP ingestion (SUB stream ONLY): a reader thread per camera, or every
+    # camera on a few asyncio event loops (RTSP_SUPERVISOR=asyncio)
+    if RTSP_SUPERVISOR == "asyncio":
+        from app.ingest.rtsp.supervisor import RTSPSupervisor
 
-    # -------------------------------
-    # RTSP ingestion (SUB stream ONLY)
-    # -------------------------------
-    from app.ingest.rtsp.launcher import RTSPLauncher
+        rtsp_launcher = RTSPSupervisor(frame_hub)
+    else:
+        from app.ingest.rtsp.launcher import RTSPLauncher
 
-    rtsp_launcher = RTSPLauncher(frame_hub)
+        rtsp_launcher = RTSPLauncher(frame_hub)
     app_state.rtsp_launcher = rtsp_launcher
 
     for cam_id, cam_cfg in CAMERAS.items():
@@ -169,7 +101,8 @@ def startup():
 
         rtsp_launcher.add_camera(
             cam_id=cam_id,
-            rtsp_url=cam_cfg["sub"],  # 🔒 SUB stream only (by design)
+            rtsp_url=cam_cfg["sub"],  # 🔒 SUB stream for detection; MAIN opens on demand for plates
+            cam_cfg=cam_cfg,
         )
 
         logger.warning(
@@ -177,37 +110,75 @@ def startup():
             cam_id,
         )
 
-    logger.warning(
-        "[Startup] RTSP ingestion LIVE (SUB stream, OCR calibration expected to fail)"
-    )
 
-    # -------------------------------
-    # Detection Manager + Workers
-    # -------------------------------
-    from app.detection.detection_manager import DetectionManager
-    from app.detection.detector import DetectionWorker
-
-    detection_manager = DetectionManager()
-    app_state.detection_manager = detection_manager
+def _start_detection(frame_hub, detection_manager):
+    # Imports the pipeline (cv2, OCR); the model itself loads in model_warmup
+    from app.detection.detector import start_detection_worker
 
     for cam_id in CAMERAS.keys():
-        worker = DetectionWorker(
-            cam_id=cam_id,
-            frame_hub=frame_hub,
-            detection_manager=detection_manager,
-            fps=2,
-        )
-        worker.start()
+        start_detection_worker(cam_id, frame_hub, detection_manager)
 
         logger.warning(
             "[Startup] DetectionWorker started | cam=%s",
             cam_id,
         )
 
+
+def _warmup_model():
+    import numpy as np
+
+    from app.config import PLATE_DETECTOR_INPUT_SIZE, PLATE_DETECTOR_MODEL
+    from app.detection.registry import MODEL_REGISTRY, PLATE_MODEL, VEHICLE_MODEL
+
+    MODEL_REGISTRY.warmup(VEHICLE_MODEL)
+
+    # Optional: the pipeline falls back to Canny proposals without it,
+    # so a broken plate model must not fail the stage (and /ready)
+    if PLATE_DETECTOR_MODEL:
+        crop = np.zeros((PLATE_DETECTOR_INPUT_SIZE, PLATE_DETECTOR_INPUT_SIZE, 3), dtype=np.uint8)
+        try:
+            MODEL_REGISTRY.warmup(PLATE_MODEL, sample=[crop])
+        except Exception:
+            logger.exception("[Startup] plate model warmup failed, plate proposals fall back to Canny")
+
+
+@app.on_event("startup")
+def startup():
+    """
+    Only cheap, in-memory wiring runs inline; everything slow is a
+    background stage (see /ready for progress).
+    """
     logger.warning(
-        "[Startup] STAGE-1 COMPLETE ✅ | Vehicle detection live | OCR = calibration only"
+        "🔥 STARTUP ENTERED | pid=%s | cwd=%s | PYTHONPATH=%s",
+        os.getpid(),
+        os.getcwd(),
+        os.getenv("PYTHONPATH"),
+    )
+
+    from app.frames.frame_hub import FrameHub
+    from app.detection.detection_manager import DetectionManager
+
+    frame_hub = FrameHub()
+    app_state.frame_hub = frame_hub
+
+    for cam_id in CAMERAS.keys():
+        frame_hub.register(cam_id)
+
+    detection_manager = DetectionManager()
+    app_state.detection_manager = detection_manager
+
+    STARTUP.run("debug_dir", _clear_debug_dir)
+    STARTUP.run("model_warmup", _warmup_model)
+    STARTUP.run("cameras", lambda: _wire_cameras(frame_hub))
+    # After debug_dir: the cleanup must not race the first plate dumps
+    STARTUP.run(
+        "detection",
+        lambda: _start_detection(frame_hub, detection_manager),
+        after=("debug_dir",),
     )
 
+    logger.warning("[Startup] wiring done; background stages running (see /ready)")
+
 # =================================================
 # ROUTES
 # =================================================
@@ -215,11 +186,23 @@ from app.routes import preview  # noqa: E402
 from app.routes import debug_rtsp  # noqa: E402
 from app.routes import debug_plates  # noqa: E402
 from app.routes import system  # noqa: E402
+from app.routes import events  # noqa: E402
+from app.ingest.frame import router as frame_ingest  # noqa: E402
+from app.routes import metrics  # noqa: E402
+from app.routes import runtime  # noqa: E402
+from app.routes import debug_profile  # noqa: E402
+from app.routes import debug_traces  # noqa: E402
 
 app.include_router(preview.router)
 app.include_router(debug_rtsp.router)
 app.include_router(debug_plates.router)
 app.include_router(system.router)
+app.include_router(events.router)
+app.include_router(frame_ingest.router)
+app.include_router(metrics.router)
+app.include_router(runtime.router)
+app.include_router(debug_profile.router)
+app.include_router(debug_traces.router)
 
 # =================================================
 # Railway entrypoint:
@@ -0,0 +1,404 @@
+# app/metrics.py
+
+"""
+Lightweight in-process metrics (no external deps).
+
+- Counter / Gauge / Histogram (fixed buckets) with label support
+- Children are cached per label-set: hot paths keep a reference to the
+  child and pay one uncontended lock per observation
+- render() -> Prometheus text exposition format (served on /metrics)
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Sequence, Tuple
+
+from app.tracing import current_trace
+
+# Seconds: 0.5 ms .. 10 s (covers decode -> YOLO -> OCR)
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+# -------------------------------------------------
+# Children (one per label-set)
+# -------------------------------------------------
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value", "_fn", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._fn = None
+        self._lock = threading.Lock()
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    def set_function(self, fn: Callable[[], float]):
+        """Evaluate fn() at scrape time instead of storing a value."""
+        self._fn = fn
+
+    def get(self) -> float:
+        if self._fn is not None:
+            try:
+                return float(self._fn())
+            except Exception:
+                return float("nan")
+        return self.value
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "count", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)   # last = +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        idx = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[idx] += 1
+            self.sum += value
+            self.count += 1
+
+    @contextmanager
+    def time(self):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0)
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Bucket-interpolated quantile (same estimate as histogram_quantile).
+        """
+        counts, _, total = self.snapshot()
+        return bucket_quantile(self.bounds, counts, total, q)
+
+
+def bucket_quantile(bounds, counts, total: int, q: float) -> float | None:
+    """
+    Quantile from bucket counts (last = +Inf); also for counts summed
+    across children of one histogram.
+    """
+    if total == 0:
+        return None
+
+    rank = q * total
+    cumulative = 0
+    lower = 0.0
+    for idx, c in enumerate(counts):
+        upper = bounds[idx] if idx < len(bounds) else lower
+        if cumulative + c >= rank and c > 0:
+            if idx == len(bounds):
+                return lower
+            return lower + (upper - lower) * ((rank - cumulative) / c)
+        cumulative += c
+        lower = upper
+    return lower
+
+
+# -------------------------------------------------
+# Metric families
+# -------------------------------------------------
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values, **kwvalues):
+        if kwvalues:
+            values = tuple(str(kwvalues[n]) for n in self.labelnames)
+        else:
+            values = tuple(str(v) for v in values)
+
+        child = self._children.get(values)
+        if child is not None:
+            return child
+
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name}: expected labels {self.labelnames}")
+
+        with self._lock:
+            child = self._children.get(values)
+            if child is None:
+                child = self._children[values] = self._new_child()
+        return child
+
+    def items(self):
+        with self._lock:
+            return list(self._children.items())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def render(self):
+        for values, child in self.items():
+            yield f"{self.name}{_label_str(self.labelnames, values)} {_fmt(child.value)}"
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def render(self):
+        for values, child in self.items():
+            yield f"{self.name}{_label_str(self.labelnames, values)} {_fmt(child.get())}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def render(self):
+        for values, child in self.items():
+            counts, total_sum, total = child.snapshot()
+            cumulative = 0
+            for bound, c in zip(self.buckets + (float("inf"),), counts):
+                cumulative += c
+                le = _label_str(self.labelnames, values, f'le="{_fmt(bound)}"')
+                yield f"{self.name}_bucket{le} {cumulative}"
+            labels = _label_str(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_fmt(total_sum)}"
+            yield f"{self.name}_count{labels} {total}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def get(self, name: str) -> _Metric | None:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 🔒 Singleton (process-wide)
+REGISTRY = MetricsRegistry()
+
+
+# -------------------------------------------------
+# Canonical pipeline metrics
+# -------------------------------------------------
+# stage = decode | framehub_wait | motion_gate | inference | plate_proposal | plate_detect | ocr | debug_dump | event_emit
+STAGE_SECONDS = REGISTRY.histogram(
+    "traffic_stage_seconds",
+    "Per-stage latency in seconds",
+    ("camera", "stage"),
+)
+
+# component = reader | ffmpeg | detection | decode
+CAMERA_CPU_SECONDS = REGISTRY.counter(
+    "traffic_camera_cpu_seconds_total",
+    "Thread CPU time attributed to a camera (time.thread_time)",
+    ("camera", "component"),
+)
+
+FRAMES_TOTAL = REGISTRY.counter(
+    "traffic_frames_total",
+    "Frames published to FrameHub",
+    ("camera", "source"),
+)
+
+FRAMES_SKIPPED = REGISTRY.counter(
+    "traffic_frames_skipped_total",
+    "Frames overwritten in FrameHub before detection read them",
+    ("camera",),
+)
+
+RTSP_CONNECTED = REGISTRY.gauge(
+    "traffic_rtsp_connected",
+    "1 while the camera's ffmpeg pipe is delivering",
+    ("camera",),
+)
+
+RTSP_STATE = REGISTRY.gauge(
+    "traffic_rtsp_state",
+    "1 for the camera's current reader state (connecting | streaming | stalled | backoff | stopped)",
+    ("camera", "state"),
+)
+
+RTSP_RECONNECTS = REGISTRY.counter(
+    "traffic_rtsp_reconnects_total",
+    "ffmpeg restarts by reason (eof | connect_timeout | stalled | error)",
+    ("camera", "reason"),
+)
+
+FRAME_AGE = REGISTRY.gauge(
+    "traffic_frame_age_seconds",
+    "Seconds since the camera's last detect frame arrived",
+    ("camera",),
+)
+
+LAST_FRAME_TS = REGISTRY.gauge(
+    "traffic_last_frame_timestamp_seconds",
+    "Epoch time of the last frame",
+    ("camera",),
+)
+
+DETECTIONS_TOTAL = REGISTRY.counter(
+    "traffic_detection_runs_total",
+    "Detector invocations",
+    ("camera",),
+)
+
+DEADLINE_MISSES = REGISTRY.counter(
+    "traffic_detection_deadline_misses_total",
+    "Detection ticks that took longer than the camera's detection interval",
+    ("camera",),
+)
+
+DETECTION_RATE = REGISTRY.gauge(
+    "traffic_detection_rate_fps",
+    "Scheduled per-camera rate (kind = detect | anpr)",
+    ("camera", "kind"),
+)
+
+# proposer = canny | model
+PLATE_CANDIDATES = REGISTRY.histogram(
+    "traffic_plate_candidates",
+    "Plate proposals per vehicle crop, before the cheap gate",
+    ("camera", "proposer"),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34),
+)
+
+EVENTS_TOTAL = REGISTRY.counter(
+    "traffic_events_emitted_total",
+    "Events accepted by the event sink",
+    ("camera", "type"),
+)
+
+
+# Capture (reader) -> event emitted; every event, per camera + type
+GLASS_TO_EVENT = REGISTRY.histogram(
+    "traffic_glass_to_event_seconds",
+    "Frame capture to event emission latency",
+    ("camera", "type"),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.5, 10.0, 15.0, 30.0, 60.0),
+)
+
+
+def stage_timer(camera: str, stage: str):
+    """
+    with stage_timer(cam, "ocr"): ...
+    Also a span of the thread's current trace, if it is sampled.
+    """
+    timer = STAGE_SECONDS.labels(camera, stage).time()
+    trace = current_trace()
+    if trace is None or not trace.sampled:
+        return timer
+    return trace.span(stage, timer)
+
+
+def observe_stage(camera: str, stage: str, seconds: float):
+    STAGE_SECONDS.labels(camera, stage).observe(seconds)
+
+
+@contextmanager
+def cpu_timer(camera: str, component: str):
+    """
+    Attribute the calling thread's CPU time to (camera, component).
+    """
+    t0 = time.thread_time()
+    try:
+        yield
+    finally:
+        CAMERA_CPU_SECONDS.labels(camera, component).inc(time.thread_time() - t0)
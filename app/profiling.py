@@ -0,0 +1,133 @@
+# app/profiling.py
+
+"""
+On-demand, in-process sampling profiler.
+
+- Samples sys._current_frames() for ALL threads at a fixed interval
+- Bounded window: sampling stops by itself when `seconds` elapse
+- Output: collapsed stacks ("thread;frame;frame N") for flamegraph.pl /
+  speedscope + per-thread CPU share (pthread CPU clocks)
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+MAX_PROFILE_SECONDS = 60.0
+MIN_INTERVAL_SEC = 0.001
+
+# One profile at a time (sampling is not free on a loaded box)
+_PROFILE_LOCK = threading.Lock()
+
+
+class ProfilerBusy(RuntimeError):
+    pass
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _collapse(frame, max_depth: int) -> str:
+    labels = []
+    while frame is not None and len(labels) < max_depth:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return ";".join(labels)
+
+
+def _thread_cpu(ident: int) -> float | None:
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(ident))
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _cpu_snapshot() -> dict:
+    snap = {}
+    for t in threading.enumerate():
+        if t.ident is None:
+            continue
+        cpu = _thread_cpu(t.ident)
+        if cpu is not None:
+            snap[t.ident] = (t.name, cpu)
+    return snap
+
+
+def sample_stacks(
+    seconds: float,
+    *,
+    interval: float = 0.005,
+    max_depth: int = 64,
+    thread_prefix: str | None = None,
+) -> dict:
+    """
+    Blocking: samples for `seconds`, then returns.
+
+    Raises ProfilerBusy if another profile is running.
+    """
+    seconds = min(max(seconds, 0.1), MAX_PROFILE_SECONDS)
+    interval = max(interval, MIN_INTERVAL_SEC)
+
+    if not _PROFILE_LOCK.acquire(blocking=False):
+        raise ProfilerBusy("profile already running")
+
+    try:
+        me = threading.get_ident()
+        stacks = Counter()
+        samples = 0
+
+        cpu_start = _cpu_snapshot()
+        wall_start = time.monotonic()
+        deadline = wall_start + seconds
+
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                name = names.get(ident, f"thread-{ident}")
+                if thread_prefix and not name.startswith(thread_prefix):
+                    continue
+                stacks[f"{name};{_collapse(frame, max_depth)}"] += 1
+            samples += 1
+
+            time.sleep(max(0.0, min(interval, deadline - time.monotonic())))
+
+        wall = time.monotonic() - wall_start
+        cpu_end = _cpu_snapshot()
+
+    finally:
+        _PROFILE_LOCK.release()
+
+    threads = []
+    for ident, (name, end) in cpu_end.items():
+        if ident not in cpu_start or ident == me:
+            continue
+        if thread_prefix and not name.startswith(thread_prefix):
+            continue
+        cpu = max(0.0, end - cpu_start[ident][1])
+        threads.append({
+            "thread": name,
+            "cpu_sec": round(cpu, 4),
+            "cpu_share": round(cpu / wall, 4) if wall > 0 else 0.0,
+        })
+    threads.sort(key=lambda t: t["cpu_sec"], reverse=True)
+
+    return {
+        "seconds": round(wall, 3),
+        "interval_ms": round(interval * 1000, 2),
+        "samples": samples,
+        "threads": threads,
+        "collapsed": "\n".join(
+            f"{stack} {count}" for stack, count in stacks.most_common()
+        ),
+    }
@@ -22,7 +22,8 @@ def debug_pipeline():
 
     for cam_id in frames.camera_ids():
         frame = frames.get_latest_frame(cam_id)
-        detections = detection_manager.get(cam_id)
+        entry = detection_manager.get(cam_id)
+        detections = entry["vehicles"] if entry is not None else []
         events = EVENT_STORE.all()
 
         cam_events = [e for e in events if e.get("cam_id") == cam_id]
@@ -0,0 +1,72 @@
+# app/routes/debug_profile.py
+
+import hmac
+import os
+import logging
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.profiling import MAX_PROFILE_SECONDS, ProfilerBusy, sample_stacks
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+logger = logging.getLogger(__name__)
+
+# Profiling is OFF unless a token is configured
+DEBUG_TOKEN_ENV = "DEBUG_TOKEN"
+
+
+def _authorize(token: str | None):
+    expected = os.getenv(DEBUG_TOKEN_ENV)
+    if not expected:
+        raise HTTPException(status_code=404, detail="Profiling disabled")
+    # bytes: compare_digest raises TypeError on non-ASCII str (-> 500)
+    if not token or not hmac.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(status_code=401, detail="Invalid debug token")
+
+
+@router.get("/profile")
+def debug_profile(
+    seconds: float = 10.0,
+    interval_ms: float = 5.0,
+    thread: str | None = None,
+    format: str = "json",
+    x_debug_token: str | None = Header(None),
+):
+    """
+    🔥 Sample stacks of ALL threads for N seconds.
+
+    - thread: optional name prefix (DetectionWorker, RTSPReader, AnyIO ...)
+    - format=collapsed -> text/plain, pipe straight into flamegraph.pl
+    - Requires X-Debug-Token == $DEBUG_TOKEN
+    """
+    _authorize(x_debug_token)
+
+    if not 0 < seconds <= MAX_PROFILE_SECONDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"seconds must be in (0, {MAX_PROFILE_SECONDS:g}]",
+        )
+    if format not in ("json", "collapsed"):
+        raise HTTPException(status_code=400, detail="format must be json|collapsed")
+
+    logger.warning(
+        "[PROFILE] sampling %.1fs @ %.1fms (thread=%s)",
+        seconds,
+        interval_ms,
+        thread or "*",
+    )
+
+    try:
+        result = sample_stacks(
+            seconds,
+            interval=interval_ms / 1000.0,
+            thread_prefix=thread,
+        )
+    except ProfilerBusy:
+        raise HTTPException(status_code=409, detail="Profile already running")
+
+    if format == "collapsed":
+        return PlainTextResponse(result["collapsed"] + "\n")
+
+    return result
@@ -0,0 +1,44 @@
+# app/routes/debug_traces.py
+
+from fastapi import APIRouter, HTTPException
+
+from app.metrics import GLASS_TO_EVENT
+from app.tracing import TRACER
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+
+def _glass_to_event() -> dict:
+    out = {}
+    for (cam_id, event_type), child in GLASS_TO_EVENT.items():
+        quantiles = {
+            f"p{int(q * 100)}_ms": child.quantile(q) for q in (0.5, 0.95, 0.99)
+        }
+        out.setdefault(cam_id, {})[event_type] = {
+            "count": child.count,
+            **{k: round(v * 1000, 1) if v is not None else None for k, v in quantiles.items()},
+        }
+    return out
+
+
+@router.get("/traces")
+def debug_traces(camera: str | None = None, limit: int = 50, with_events: bool = False):
+    """
+    🧵 Sampled per-frame traces (newest first) + glass-to-event percentiles.
+
+    - spans: offsets / durations from detection pickup; queue_ms = capture -> pickup
+    - with_events=true: only traces that produced an event
+    """
+    return {
+        "sample_rate": TRACER.sample_rate,
+        "glass_to_event": _glass_to_event(),
+        "traces": TRACER.recent(camera, limit=limit, with_events=with_events),
+    }
+
+
+@router.get("/traces/{trace_id}")
+def debug_trace(trace_id: str):
+    trace = TRACER.find(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not sampled or already evicted")
+    return trace
@@ -0,0 +1,19 @@
+# app/routes/metrics.py
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.metrics import REGISTRY
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """
+    📊 Prometheus text exposition (scrape target)
+    """
+    return PlainTextResponse(
+        REGISTRY.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -1,16 +1,43 @@
 import time
 import logging
-import cv2
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 
+from app.frames.viewers import PREVIEW_VIEWERS
 from app.shared import app_state
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/preview", tags=["preview"])
 
+MJPEG_QUALITY = 75
+
+
+def encode_mjpeg_part(frame, quality: int = MJPEG_QUALITY) -> bytes | None:
+    """
+    One multipart/x-mixed-replace part (JPEG + headers). None on encode failure.
+    """
+    import cv2
+
+    success, jpeg = cv2.imencode(
+        ".jpg",
+        frame,
+        [int(cv2.IMWRITE_JPEG_QUALITY), quality],
+    )
+
+    if not success:
+        return None
+
+    return (
+        b"--frame\r\n"
+        b"Content-Type: image/jpeg\r\n"
+        b"Cache-Control: no-cache, no-store, must-revalidate\r\n"
+        b"Pragma: no-cache\r\n\r\n"
+        + jpeg.tobytes()
+        + b"\r\n"
+    )
+
 
 @router.get("/stream/{cam_id}")
 def mjpeg_preview(cam_id: str):
@@ -25,32 +52,23 @@ def mjpeg_preview(cam_id: str):
 
         logger.warning("[MJPEG] generator started for %s", cam_id)
 
-        while True:
-            frame = frame_hub.latest(cam_id)
+        # Registered viewers switch the camera's decoder to preview mode
+        with PREVIEW_VIEWERS.watching(cam_id):
+            while True:
+                frame = frame_hub.latest_preview(cam_id)
 
-            if frame is None:
-                time.sleep(0.05)
-                continue
+                if frame is None:
+                    time.sleep(0.05)
+                    continue
 
-            success, jpeg = cv2.imencode(
-                ".jpg",
-                frame,
-                [int(cv2.IMWRITE_JPEG_QUALITY), 75],
-            )
+                part = encode_mjpeg_part(frame)
 
-            if not success:
-                continue
+                if part is None:
+                    continue
 
-            yield (
-                b"--frame\r\n"
-                b"Content-Type: image/jpeg\r\n"
-                b"Cache-Control: no-cache, no-store, must-revalidate\r\n"
-                b"Pragma: no-cache\r\n\r\n"
-                + jpeg.tobytes()
-                + b"\r\n"
-            )
+                yield part
 
-            time.sleep(delay)
+                time.sleep(delay)
 
     return StreamingResponse(
         frame_generator(),
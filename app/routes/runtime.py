@@ -2,10 +2,31 @@
 
 import time
 from fastapi import APIRouter
-from app.state import runtime_state
+
+from app.metrics import (
+    CAMERA_CPU_SECONDS,
+    FRAMES_TOTAL,
+    LAST_FRAME_TS,
+    RTSP_CONNECTED,
+    STAGE_SECONDS,
+)
+from app.shared import app_state
 
 router = APIRouter(prefix="/runtime", tags=["runtime"])
 
+_START_TS = time.time()
+
+
+def _per_camera(metric) -> dict:
+    return {values[0]: child.get() for values, child in metric.items()}
+
+
+def _frame_counts() -> dict:
+    counts = {}
+    for (cam_id, _source), child in FRAMES_TOTAL.items():
+        counts[cam_id] = counts.get(cam_id, 0) + int(child.value)
+    return counts
+
 
 @router.get("/rtsp")
 def rtsp_status():
@@ -13,38 +34,101 @@ def rtsp_status():
     🔄 RTSP connection status per camera
     """
     return {
-        "rtsp_connected": runtime_state.rtsp_connected,
-        "last_frame_ts": runtime_state.last_frame_ts,
+        "rtsp_connected": {
+            cam: bool(v) for cam, v in _per_camera(RTSP_CONNECTED).items()
+        },
+        "last_frame_ts": _per_camera(LAST_FRAME_TS),
     }
 
 
 @router.get("/metrics")
 def metrics():
     """
-    📊 Basic runtime metrics
+    📊 Basic runtime metrics (JSON view; Prometheus lives on /metrics)
     """
     now = time.time()
-    uptime = now - runtime_state.start_time
+    uptime = now - _START_TS
+    frame_count = _frame_counts()
 
     fps = {}
-    for cam_id, count in runtime_state.frame_count.items():
+    for cam_id, count in frame_count.items():
         fps[cam_id] = round(count / max(uptime, 1), 2)
 
+    stages = {}
+    for (cam_id, stage), child in STAGE_SECONDS.items():
+        p50 = child.quantile(0.5)
+        p95 = child.quantile(0.95)
+        stages.setdefault(cam_id, {})[stage] = {
+            "count": child.count,
+            "p50_ms": round(p50 * 1000, 2) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 2) if p95 is not None else None,
+        }
+
     return {
         "uptime_sec": round(uptime, 2),
         "frames_per_sec": fps,
-        "total_frames": runtime_state.frame_count,
+        "total_frames": frame_count,
+        "stages": stages,
     }
 
 
+@router.get("/models")
+def models():
+    """
+    🧮 Loaded models: load time, memory footprint, warmup latency
+    """
+    from app.detection.registry import MODEL_REGISTRY
+
+    return {"models": MODEL_REGISTRY.loaded()}
+
+
+@router.get("/scheduler")
+def scheduler():
+    """
+    🎛️ Adaptive detection rates, planned load vs budget, deadline misses
+    """
+    from app.detection.scheduler import DETECTION_SCHEDULER
+
+    if DETECTION_SCHEDULER is None:
+        return {"enabled": False}
+    return {"enabled": True, **DETECTION_SCHEDULER.snapshot()}
+
+
+@router.get("/decoders")
+def decoders():
+    """
+    🎞️ Per-camera decoder state + configuration and decode CPU (ffmpeg + pipe reading)
+    """
+    launcher = getattr(app_state, "rtsp_launcher", None)
+    status = launcher.decoder_status() if launcher is not None else {}
+
+    cpu = {}
+    for (cam_id, component), child in CAMERA_CPU_SECONDS.items():
+        if component in ("ffmpeg", "reader"):
+            cpu.setdefault(cam_id, {})[component] = round(child.value, 3)
+
+    for cam_id, entry in status.items():
+        entry["cpu_sec"] = cpu.get(cam_id, {})
+    return {"cameras": status}
+
+
+@router.get("/main_streams")
+def main_streams():
+    """
+    🔭 On-demand MAIN stream taps (dual-stream ANPR): open / idle, buffered frames
+    """
+    from app.ingest.rtsp.main_stream import MAIN_STREAM_TAPS
+
+    return {"cameras": MAIN_STREAM_TAPS.status()}
+
+
 @router.get("/state")
 def runtime_state_dump():
     """
     🧠 Full runtime snapshot (deploy sanity check)
     """
     return {
-        "uptime_sec": round(time.time() - runtime_state.start_time, 2),
-        "rtsp_connected": runtime_state.rtsp_connected,
-        "last_frame_ts": runtime_state.last_frame_ts,
-        "frame_count": runtime_state.frame_count,
+        "uptime_sec": round(time.time() - _START_TS, 2),
+        **rtsp_status(),
+        "frame_count": _frame_counts(),
     }
@@ -3,6 +3,9 @@
 import os
 import time
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.startup import STARTUP
 
 router = APIRouter(tags=["system"])
 
@@ -16,3 +19,15 @@ def health():
         "pid": os.getpid(),
         "uptime_s": int(time.monotonic() - _START_TS),
     }
+
+
+@router.get("/ready")
+def ready():
+    """
+    200 once every startup stage finished; 503 (with per-stage state) before.
+    """
+    is_ready = STARTUP.ready()
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={"ready": is_ready, "stages": STARTUP.status()},
+    )
@@ -5,6 +5,7 @@ class AppState:
         # Filled during FastAPI startup
         self.frame_hub = None
         self.detection_manager = None
+        self.detection_workers = {}   # cam_id -> DetectionWorker
 
 # 🔒 Singleton: created exactly once, at import time
 app_state = AppState()
@@ -0,0 +1,118 @@
+# app/startup.py
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable
+
+logger = logging.getLogger("Startup")
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class _Stage:
+    __slots__ = ("name", "state", "started", "finished", "error")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = PENDING
+        self.started = None
+        self.finished = None
+        self.error = None
+
+    def snapshot(self) -> dict:
+        duration = None
+        if self.started is not None:
+            end = self.finished if self.finished is not None else time.monotonic()
+            duration = round(end - self.started, 3)
+        return {"state": self.state, "duration_sec": duration, "error": self.error}
+
+
+class StartupStages:
+    """
+    Named startup stages, each run in its own background thread.
+
+    - after=[...]: wait for other stages to finish first (a failed
+      dependency fails the stage)
+    - ready() == every declared stage DONE (drives /ready)
+    - per-stage wall time is logged and exposed via status()
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, _Stage] = {}
+        self._done: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._t0 = time.monotonic()
+
+    def declare(self, name: str):
+        with self._lock:
+            if name not in self._stages:
+                self._stages[name] = _Stage(name)
+                self._done[name] = threading.Event()
+
+    def run(self, name: str, fn: Callable[[], None], *, after: Iterable[str] = (), background: bool = True):
+        self.declare(name)
+        after = tuple(after)
+        for dep in after:
+            self.declare(dep)
+
+        if background:
+            threading.Thread(
+                target=self._run, args=(name, fn, after), daemon=True, name=f"Startup-{name}"
+            ).start()
+        else:
+            self._run(name, fn, after)
+
+    def _run(self, name: str, fn: Callable[[], None], after: tuple):
+        stage = self._stages[name]
+
+        for dep in after:
+            self._done[dep].wait()
+            if self._stages[dep].state != DONE:
+                stage.state = FAILED
+                stage.error = f"dependency {dep} {self._stages[dep].state}"
+                self._done[name].set()
+                logger.error("[Startup] stage=%s skipped: %s", name, stage.error)
+                return
+
+        stage.state = RUNNING
+        stage.started = time.monotonic()
+        try:
+            fn()
+            stage.state = DONE
+        except Exception as e:
+            stage.state = FAILED
+            stage.error = repr(e)
+            logger.exception("[Startup] stage=%s FAILED", name)
+        finally:
+            stage.finished = time.monotonic()
+            self._done[name].set()
+
+        logger.warning(
+            "[Startup] stage=%s %s in %.2fs (t+%.2fs)",
+            name,
+            stage.state,
+            stage.finished - stage.started,
+            stage.finished - self._t0,
+        )
+
+    def wait(self, name: str, timeout: float | None = None) -> bool:
+        event = self._done.get(name)
+        return event.wait(timeout) if event is not None else False
+
+    def ready(self) -> bool:
+        with self._lock:
+            stages = list(self._stages.values())
+        return bool(stages) and all(s.state == DONE for s in stages)
+
+    def status(self) -> dict:
+        with self._lock:
+            stages = list(self._stages.values())
+        return {s.name: s.snapshot() for s in stages}
+
+
+# 🔒 Singleton (process-wide)
+STARTUP = StartupStages()
@@ -1,8 +1,52 @@
+import numpy as np
+
+# A current box continues a previous one when they overlap this much, or
+# when its centre moved less than this share of the previous box diagonal
+# (fast vehicles at low detection rates barely overlap between runs)
+MIN_IOU = 0.3
+MAX_CENTER_SHIFT = 0.5
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """(N, 4) x (M, 4) xyxy boxes -> (N, M) IoU."""
+    a = np.asarray(a, dtype=np.float32)[:, None, :]
+    b = np.asarray(b, dtype=np.float32)[None, :, :]
+    iw = (np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0])).clip(0)
+    ih = (np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1])).clip(0)
+    inter = iw * ih
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    return inter / np.maximum(area_a + area_b - inter, 1e-6)
+
+
 def match_boxes(prev_boxes, curr_boxes):
     """
     Greedy IoU / center-distance matching.
-    Returns pairs: (prev, curr)
+    Returns pairs: (prev index, curr index), best matches first.
     """
+    prev = np.asarray(prev_boxes, dtype=np.float32).reshape(-1, 4)
+    curr = np.asarray(curr_boxes, dtype=np.float32).reshape(-1, 4)
+    if not len(prev) or not len(curr):
+        return []
+
+    iou = iou_matrix(prev, curr)
+
+    prev_c = (prev[:, :2] + prev[:, 2:]) / 2
+    curr_c = (curr[:, :2] + curr[:, 2:]) / 2
+    diag = np.hypot(prev[:, 2] - prev[:, 0], prev[:, 3] - prev[:, 1])
+    shift = np.linalg.norm(prev_c[:, None, :] - curr_c[None, :, :], axis=2) / np.maximum(diag, 1.0)[:, None]
+
+    allowed = (iou >= MIN_IOU) | (shift <= MAX_CENTER_SHIFT)
+    score = iou - shift
+    rows, cols = np.nonzero(allowed)
+    order = np.argsort(-score[rows, cols], kind="stable")
+
     pairs = []
-    # simple implementation for MVP
+    used_prev, used_curr = set(), set()
+    for i, j in zip(rows[order].tolist(), cols[order].tolist()):
+        if i in used_prev or j in used_curr:
+            continue
+        used_prev.add(i)
+        used_curr.add(j)
+        pairs.append((i, j))
     return pairs
@@ -0,0 +1,48 @@
+# app/temporal/tracker.py
+
+import numpy as np
+
+from app.temporal.matcher import match_boxes
+
+# A track survives this many detection runs without a match (occlusion,
+# a missed detection) before its id is retired
+MAX_MISSES = 2
+
+
+class VehicleTracker:
+    """
+    Per-camera track ids across detection runs (greedy matching, no motion model).
+
+    assign() writes the "track" column of a detections array in place:
+    a vehicle matched to the previous run's boxes keeps its id, others get
+    a new one. Ids are unique per camera for the process lifetime.
+
+    One tracker per camera; not thread-safe (owned by its DetectionWorker).
+    """
+
+    def __init__(self, max_misses: int = MAX_MISSES):
+        self.max_misses = max_misses
+        self._boxes = np.empty((0, 4), np.int32)
+        self._ids = np.empty(0, np.int32)
+        self._misses = np.empty(0, np.int32)
+        self._next_id = 0
+
+    def assign(self, dets: np.ndarray) -> np.ndarray:
+        ids = np.full(len(dets), -1, np.int32)
+        matched = np.zeros(len(self._ids), dtype=bool)
+        for i, j in match_boxes(self._boxes, dets["bbox"]):
+            ids[j] = self._ids[i]
+            matched[i] = True
+
+        new = ids < 0
+        ids[new] = np.arange(self._next_id, self._next_id + int(new.sum()), dtype=np.int32)
+        self._next_id += int(new.sum())
+        dets["track"] = ids
+
+        # Unmatched tracks linger for max_misses runs at their last box
+        misses = self._misses + 1
+        keep = ~matched & (misses <= self.max_misses)
+        self._boxes = np.concatenate([dets["bbox"], self._boxes[keep]])
+        self._ids = np.concatenate([ids, self._ids[keep]])
+        self._misses = np.concatenate([np.zeros(len(ids), np.int32), misses[keep]])
+        return dets
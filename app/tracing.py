@@ -0,0 +1,148 @@
+# app/tracing.py
+
+"""
+Per-frame tracing: capture -> detection -> plate proposal -> OCR -> event.
+
+- Readers stamp every frame with its capture ts and a trace id
+  (FrameEntry.trace_id; FrameHub fills one in for sources that don't)
+- DetectionWorker opens a Trace for each frame it consumes and makes it the
+  thread's current trace; stage_timer() spans land in it
+- emit_event() tags events with trace_id + capture_ts and observes
+  glass-to-event latency (every event, sampled or not)
+- Spans are only kept for sampled traces (TRACE_SAMPLE_RATE); the last
+  TRACE_BUFFER sampled traces are served on /debug/traces
+
+"Capture" is when the reader got the decoded frame from ffmpeg (raw pipes
+carry no RTP wallclock), so camera encode + network + decode are not included.
+"""
+
+import itertools
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Process-unique ids without a uuid4 per frame
+_PREFIX = os.urandom(3).hex()
+_ids = itertools.count(1)
+
+
+def new_trace_id() -> str:
+    return f"{_PREFIX}-{next(_ids):x}"
+
+
+class Trace:
+    """One frame's trip through the pipeline (spans relative to pickup)."""
+
+    __slots__ = ("trace_id", "camera", "capture_ts", "start_ts", "sampled", "spans", "events", "_t0")
+
+    def __init__(self, trace_id: str, camera: str, capture_ts: float, sampled: bool):
+        self.trace_id = trace_id
+        self.camera = camera
+        self.capture_ts = capture_ts
+        self.start_ts = time.time()
+        self.sampled = sampled
+        self.spans = []     # (name, start offset s, duration s)
+        self.events = []    # (event_type, glass-to-event s)
+        self._t0 = time.perf_counter()
+
+    def add_span(self, name: str, t0: float, t1: float):
+        """t0 / t1: time.perf_counter() readings."""
+        if self.sampled:
+            self.spans.append((name, t0 - self._t0, t1 - t0))
+
+    @contextmanager
+    def span(self, name: str, inner=None):
+        """Time a block as a span; `inner` (e.g. a histogram timer) wraps it too."""
+        t0 = time.perf_counter()
+        try:
+            if inner is None:
+                yield
+            else:
+                with inner:
+                    yield
+        finally:
+            self.add_span(name, t0, time.perf_counter())
+
+    def add_event(self, event_type: str, latency: float):
+        if self.sampled:
+            self.events.append((event_type, latency))
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "camera": self.camera,
+            "capture_ts": self.capture_ts,
+            "queue_ms": round((self.start_ts - self.capture_ts) * 1000, 2),
+            "spans": [
+                {"name": n, "start_ms": round(s * 1000, 2), "duration_ms": round(d * 1000, 2)}
+                for n, s, d in self.spans
+            ],
+            "events": [
+                {"type": t, "glass_to_event_ms": round(lat * 1000, 2)}
+                for t, lat in self.events
+            ],
+        }
+
+
+class Tracer:
+    """Current-trace per thread + ring of finished sampled traces."""
+
+    def __init__(self, sample_rate: float, buffer: int):
+        self.sample_rate = sample_rate
+        self._done = deque(maxlen=buffer)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def current(self) -> Trace | None:
+        return getattr(self._local, "trace", None)
+
+    @contextmanager
+    def trace(self, camera: str, trace_id: str | None, capture_ts: float):
+        """with TRACER.trace(cam, entry.trace_id, entry.ts) as trace: ..."""
+        trace = Trace(
+            trace_id or new_trace_id(),
+            camera,
+            capture_ts,
+            sampled=random.random() < self.sample_rate,
+        )
+        previous, self._local.trace = self.current(), trace
+        try:
+            yield trace
+        finally:
+            self._local.trace = previous
+            if trace.sampled and (trace.spans or trace.events):
+                with self._lock:
+                    self._done.append(trace)
+
+    def recent(self, camera: str | None = None, limit: int = 50, with_events: bool = False) -> list:
+        with self._lock:
+            traces = list(self._done)
+        if camera is not None:
+            traces = [t for t in traces if t.camera == camera]
+        if with_events:
+            traces = [t for t in traces if t.events]
+        return [t.to_dict() for t in reversed(traces[-limit:])]
+
+    def find(self, trace_id: str) -> dict | None:
+        with self._lock:
+            for trace in self._done:
+                if trace.trace_id == trace_id:
+                    return trace.to_dict()
+        return None
+
+
+def _build() -> Tracer:
+    from app.config import TRACE_BUFFER, TRACE_SAMPLE_RATE
+
+    return Tracer(TRACE_SAMPLE_RATE, TRACE_BUFFER)
+
+
+# 🔒 Singleton (process-wide)
+TRACER = _build()
+
+
+def current_trace() -> Trace | None:
+    return TRACER.current()
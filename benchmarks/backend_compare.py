@@ -0,0 +1,189 @@
+# benchmarks/backend_compare.py
+
+"""
+Detector backends side by side on the same replayed frames.
+
+    python -m benchmarks.backend_compare clip.mp4
+    python -m benchmarks.backend_compare frames_dir/ --backends torch,onnx,onnx:int8,openvino:int8
+    python -m benchmarks.backend_compare clip.mp4 --frames 300 --json out.json
+
+Reports images/sec per backend (single stream, batch 1, after warmup) and
+mAP@0.5 against the torch fp32 detections on the same frames. Those
+detections stand in for ground truth, so 1 - mAP is the accuracy drift
+the export / quantization introduced.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+
+import numpy as np
+
+from app.config import (
+    DETECTION_INPUT_SIZE,
+    DETECTOR_ONNX_PATH,
+    DETECTOR_THREADS,
+    VEHICLE_MODEL_PATH,
+)
+from app.detection.backends import COCO_VEHICLE_CLASSES, load_detector
+from app.frames.replay import ReplayFrameProvider
+
+IOU_MATCH = 0.5
+WARMUP_FRAMES = 5
+
+
+def _load_frames(source: str, limit: int) -> list:
+    provider = ReplayFrameProvider({"bench": source}, realtime=False)
+    frames = []
+    while len(frames) < limit:
+        frame = provider.get_frame("bench")
+        if frame is None:
+            break
+        frames.append(frame)
+    return frames
+
+
+def _iou(box: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    x1 = np.maximum(box[0], boxes[:, 0])
+    y1 = np.maximum(box[1], boxes[:, 1])
+    x2 = np.minimum(box[2], boxes[:, 2])
+    y2 = np.minimum(box[3], boxes[:, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    return inter / np.maximum(area + areas - inter, 1e-9)
+
+
+def map50(reference: list, predicted: list) -> float | None:
+    """
+    VOC-style all-point AP@0.5 per class, averaged over classes present in
+    the reference. reference / predicted: per-frame (N, 6) arrays.
+    """
+    classes = sorted({int(c) for ref in reference for c in ref[:, 5]})
+    if not classes:
+        return None
+
+    aps = []
+    for cls in classes:
+        n_ref = 0
+        scored = []     # (conf, is_true_positive)
+        for ref, pred in zip(reference, predicted):
+            ref_c = ref[ref[:, 5] == cls]
+            pred_c = pred[pred[:, 5] == cls]
+            n_ref += len(ref_c)
+            matched = np.zeros(len(ref_c), dtype=bool)
+            for det in pred_c[np.argsort(-pred_c[:, 4])]:
+                tp = False
+                if len(ref_c):
+                    ious = _iou(det[:4], ref_c[:, :4])
+                    ious[matched] = 0.0
+                    best = int(ious.argmax())
+                    if ious[best] >= IOU_MATCH:
+                        matched[best] = True
+                        tp = True
+                scored.append((det[4], tp))
+
+        if not scored:
+            aps.append(0.0)
+            continue
+
+        scored.sort(key=lambda s: -s[0])
+        tps = np.cumsum([tp for _, tp in scored])
+        fps = np.cumsum([not tp for _, tp in scored])
+        recall = tps / max(n_ref, 1)
+        precision = tps / np.maximum(tps + fps, 1)
+
+        # Monotone precision envelope, integrate over recall steps
+        mrec = np.concatenate(([0.0], recall, [1.0]))
+        mpre = np.concatenate(([1.0], precision, [0.0]))
+        mpre = np.maximum.accumulate(mpre[::-1])[::-1]
+        steps = np.where(mrec[1:] != mrec[:-1])[0]
+        aps.append(float(np.sum((mrec[steps + 1] - mrec[steps]) * mpre[steps + 1])))
+
+    return float(np.mean(aps))
+
+
+def run_backend(spec: str, frames: list) -> dict:
+    backend, _, precision = spec.partition(":")
+    detector = load_detector(
+        VEHICLE_MODEL_PATH,
+        backend=backend,
+        precision=precision or "fp32",
+        imgsz=DETECTION_INPUT_SIZE,
+        classes=COCO_VEHICLE_CLASSES.keys(),
+        onnx_path=DETECTOR_ONNX_PATH if not precision or precision == "fp32" else None,
+        threads=DETECTOR_THREADS,
+    )
+
+    for frame in frames[:WARMUP_FRAMES]:
+        detector(frame)
+
+    outputs = []
+    started = time.perf_counter()
+    for frame in frames:
+        outputs.append(detector(frame))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "images_per_sec": round(len(frames) / elapsed, 2) if elapsed > 0 else 0.0,
+        "ms_per_image": round(elapsed / len(frames) * 1000, 2),
+        "detections": int(sum(len(o) for o in outputs)),
+        "_outputs": outputs,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare detector backends")
+    parser.add_argument("source", help="video file or directory of images")
+    parser.add_argument("--backends", default="torch,onnx,onnx:int8", help="backend[:precision] list")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--json", default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+
+    frames = _load_frames(args.source, args.frames)
+    if not frames:
+        print(f"no frames read from {args.source}", file=sys.stderr)
+        return 2
+
+    specs = [s.strip() for s in args.backends.split(",") if s.strip()]
+    if "torch" not in specs:
+        specs.insert(0, "torch")   # reference for mAP drift
+
+    results = {}
+    for spec in specs:
+        try:
+            results[spec] = run_backend(spec, frames)
+        except Exception as e:
+            results[spec] = {"error": repr(e)}
+
+    reference = results.get("torch", {}).get("_outputs")
+    print(f"{len(frames)} frames from {args.source}\n")
+    print(f"{'backend':<16} {'img/s':>9} {'ms/img':>9} {'dets':>7} {'mAP50 vs torch':>15}")
+    for spec, r in results.items():
+        if "error" in r:
+            print(f"{spec:<16} FAILED: {r['error']}")
+            continue
+        if reference is not None:
+            r["map50_vs_torch"] = map50(reference, r["_outputs"])
+        score = r.get("map50_vs_torch")
+        print(
+            f"{spec:<16} {r['images_per_sec']:>9.2f} {r['ms_per_image']:>9.2f} "
+            f"{r['detections']:>7} {'n/a' if score is None else f'{score:.3f}':>15}"
+        )
+
+    if args.json:
+        report = {
+            spec: {k: v for k, v in r.items() if not k.startswith("_")}
+            for spec, r in results.items()
+        }
+        with open(args.json, "w") as f:
+            json.dump({"source": args.source, "frames": len(frames), "backends": report}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+# benchmarks/bench_hotpaths.py
+
+"""
+CPU hot paths of the ANPR pipeline (all inputs synthetic).
+"""
+
+import threading
+
+from benchmarks import fixtures
+from benchmarks.harness import bench
+
+
+@bench("plate_proposal.propose_plate_regions", number=200)
+def _propose():
+    from app.ingest.frame.plate_proposal import propose_plate_regions
+    from app.ingest.frame.policy import CALIBRATION_PLATE_POLICY
+
+    crop = fixtures.vehicle_crop()
+    return lambda: propose_plate_regions(crop, policy=CALIBRATION_PLATE_POLICY)
+
+
+@bench("plate_proposal.plate_regions_from_boxes[x8]", number=500, ops=8)
+def _plate_regions_from_boxes():
+    import numpy as np
+
+    from app.ingest.frame.plate_proposal import plate_regions_from_boxes
+
+    # Learned-detector path minus the model: 8 crops, 3 scored boxes each
+    crop = fixtures.vehicle_crop()
+    h, w = crop.shape[:2]
+    boxes = np.array([
+        [w * 0.25, h * 0.70, w * 0.75, h * 0.85, 0.9],
+        [w * 0.10, h * 0.20, w * 0.40, h * 0.30, 0.5],
+        [w * 0.60, h * 0.40, w * 0.95, h * 0.50, 0.4],
+    ], dtype=np.float32)
+
+    def run():
+        for _ in range(8):
+            plate_regions_from_boxes(crop, boxes, limit=2)
+    return run
+
+
+@bench("quality_gate.cheap_plate_gate", number=2000, ops=64)
+def _cheap_gate():
+    from app.ingest.frame.quality_gate import cheap_plate_gate
+
+    plates = [
+        {"area_ratio": 0.001 * i, "aspect": 1.0 + i * 0.1, "blur": float(i * 2)}
+        for i in range(64)
+    ]
+
+    def run():
+        for p in plates:
+            cheap_plate_gate(p)
+    return run
+
+
+@bench("quality_gate.evaluate_plate_quality", number=500)
+def _evaluate_quality():
+    from app.ingest.frame.quality_gate import evaluate_plate_quality
+
+    plate = fixtures.plate_crop()
+    return lambda: evaluate_plate_quality(plate)
+
+
+@bench("pipeline._aggregate_text[200x50]", number=50, ops=200)
+def _aggregate():
+    from app.ingest.frame import pipeline
+
+    history = fixtures.ocr_history()
+    pipeline._OCR_HISTORY.clear()
+    pipeline._OCR_HISTORY.update(history)
+    keys = list(history)
+
+    def run():
+        for key in keys:
+            pipeline._aggregate_text(key)
+
+    def teardown():
+        pipeline._OCR_HISTORY.clear()
+    return run, teardown
+
+
+@bench("pipeline._cleanup_history[200x50]", number=50)
+def _cleanup():
+    from app.ingest.frame import pipeline
+
+    history = fixtures.ocr_history()
+
+    def run():
+        # Restore the (half-expired) history each call: measures a real sweep
+        pipeline._OCR_HISTORY.clear()
+        pipeline._OCR_HISTORY.update(history)
+        pipeline._cleanup_history(1_000.0)
+
+    def teardown():
+        pipeline._OCR_HISTORY.clear()
+    return run, teardown
+
+
+@bench("types.Vehicle.from_detections[x50]", number=500, ops=50)
+def _from_detections():
+    from app.ingest.frame.types import Vehicle
+
+    frame, _ = fixtures.road_frame(vehicles=1)
+    _, detections = fixtures.road_frame(vehicles=50)
+    return lambda: Vehicle.from_detections(detections, frame)
+
+
+@bench("detections.from_model_output[x50]", number=2000, ops=50)
+def _from_model_output():
+    import numpy as np
+
+    from app.detection.detections import from_model_output
+
+    # Raw detector rows: 50 boxes, a third of them non-vehicle classes / off-frame
+    rng = np.random.default_rng(fixtures.SEED)
+    xy = rng.uniform(-50, 1330, size=(50, 2))
+    wh = rng.uniform(40, 320, size=(50, 2))
+    raw = np.column_stack([
+        xy, xy + wh,
+        rng.uniform(0.1, 0.95, 50),
+        rng.choice([0, 2, 3, 5, 7, 9], 50),
+    ]).astype(np.float32)
+    return lambda: from_model_output(raw, (720, 1280, 3))
+
+
+def _framehub_contention(readers: int):
+    from app.frames.frame_hub import FrameHub
+
+    hub = FrameHub()
+    hub.register("cam_bench")
+    frame, _ = fixtures.road_frame(vehicles=0)
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            hub.latest_entry("cam_bench")
+
+    threads = [threading.Thread(target=reader, daemon=True) for _ in range(readers)]
+    for t in threads:
+        t.start()
+
+    def run():
+        for _ in range(100):
+            hub.update("cam_bench", frame)
+
+    def teardown():
+        stop.set()
+        for t in threads:
+            t.join()
+    return run, teardown
+
+
+@bench("frame_hub.update[0 readers]", number=100, ops=100)
+def _framehub_solo():
+    return _framehub_contention(0)
+
+
+@bench("frame_hub.update[4 readers]", number=20, ops=100)
+def _framehub_contended():
+    return _framehub_contention(4)
+
+
+@bench("rtsp.FrameAssembler.feed[720p, 4KiB chunks]", number=3, rounds=5, ops=5)
+def _assemble():
+    from app.ingest.rtsp.reader import FrameAssembler
+
+    stream = fixtures.raw_bgr_stream(frames=5)
+    chunks = [stream[i:i + 4096] for i in range(0, len(stream), 4096)]
+
+    def run():
+        assembler = FrameAssembler(1280, 720)
+        for chunk in chunks:
+            assembler.feed(chunk)
+    return run
+
+
+@bench("preview.encode_mjpeg_part[720p]", number=30)
+def _mjpeg():
+    from app.routes.preview import encode_mjpeg_part
+
+    frame, _ = fixtures.road_frame()
+    return lambda: encode_mjpeg_part(frame)
@@ -0,0 +1,100 @@
+# benchmarks/fixtures.py
+
+"""
+Deterministic synthetic inputs (no camera, no model files).
+"""
+
+import cv2
+import numpy as np
+
+SEED = 1234
+
+
+def road_frame(width: int = 1280, height: int = 720, vehicles: int = 6, seed: int = SEED):
+    """
+    Textured road + `vehicles` boxes, each carrying a plate-like patch.
+    Returns (frame, detections) with detections in detect_vehicles() format.
+    """
+    from app.detection.detections import from_boxes
+
+    rng = np.random.default_rng(seed)
+
+    frame = rng.integers(40, 90, size=(height, width, 3), dtype=np.uint8)
+    frame = cv2.GaussianBlur(frame, (5, 5), 0)
+
+    boxes, conf = [], []
+    for i in range(vehicles):
+        w = int(rng.integers(160, 320))
+        h = int(w * rng.uniform(0.6, 0.9))
+        x1 = int(rng.integers(0, width - w))
+        y1 = int(rng.integers(0, height - h))
+        x2, y2 = x1 + w, y1 + h
+
+        color = tuple(int(c) for c in rng.integers(60, 220, size=3))
+        cv2.rectangle(frame, (x1, y1), (x2, y2), color, -1)
+        cv2.rectangle(frame, (x1, y1), (x2, y2), (20, 20, 20), 2)
+
+        _draw_plate(frame, x1 + w // 4, y1 + int(h * 0.7), w // 2, rng)
+
+        boxes.append((x1, y1, x2, y2))
+        conf.append(float(rng.uniform(0.4, 0.95)))
+
+    detections = from_boxes(boxes, cls="car")
+    detections["conf"] = conf
+    return frame, detections
+
+
+def _draw_plate(frame, x, y, w, rng):
+    h = max(12, w // 4)
+    cv2.rectangle(frame, (x, y), (x + w, y + h), (235, 235, 235), -1)
+    cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 0, 0), 1)
+
+    text = "".join(rng.choice(list("ABCDEFGH0123456789"), size=8))
+    cv2.putText(
+        frame,
+        text,
+        (x + 3, y + h - 3),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        h / 30.0,
+        (0, 0, 0),
+        1,
+        cv2.LINE_AA,
+    )
+
+
+def vehicle_crop(seed: int = SEED):
+    frame, detections = road_frame(vehicles=1, seed=seed)
+    x1, y1, x2, y2 = detections[0]["bbox"].tolist()
+    return np.ascontiguousarray(frame[y1:y2, x1:x2])
+
+
+def plate_crop(seed: int = SEED):
+    rng = np.random.default_rng(seed)
+    img = np.full((40, 160, 3), 60, dtype=np.uint8)
+    _draw_plate(img, 4, 4, 150, rng)
+    return img
+
+
+def ocr_history(keys: int = 200, per_key: int = 50, now: float = 1_000.0, ttl: float = 3.0):
+    """
+    {(cam, vehicle_idx): [(ts, text, conf), ...]} — half the entries expired.
+    """
+    rng = np.random.default_rng(SEED)
+    texts = ["TS09AB1234", "TS09AB1284", "T509AB1234", "AB12", "X"]
+
+    history = {}
+    for k in range(keys):
+        items = []
+        for _ in range(per_key):
+            ts = now - float(rng.uniform(0.0, ttl * 2))
+            items.append((ts, texts[int(rng.integers(0, len(texts)))], float(rng.uniform(0, 1))))
+        history[("cam_bench", k)] = items
+    return history
+
+
+def raw_bgr_stream(width: int = 1280, height: int = 720, frames: int = 5):
+    """
+    `frames` raw bgr24 frames back-to-back (what ffmpeg writes to the pipe).
+    """
+    rng = np.random.default_rng(SEED)
+    return rng.integers(0, 255, size=frames * width * height * 3, dtype=np.uint8).tobytes()
@@ -0,0 +1,124 @@
+# benchmarks/harness.py
+
+"""
+Minimal benchmark harness (stdlib only).
+
+- @bench registers a case: a setup function returning a zero-arg callable
+  (or (callable, teardown) when the case starts threads)
+- Each case runs `rounds` x `number` calls; we keep per-op median + min
+- Baselines are plain JSON: {"name": {"median_us": ..., "min_us": ...}}
+- compare() flags cases whose median regressed past the threshold
+"""
+
+import json
+import platform
+import statistics
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict
+
+_CASES: Dict[str, "Case"] = {}
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    number: int
+    rounds: int
+    ops: int          # logical operations per call (e.g. frames per feed)
+
+
+@dataclass
+class Result:
+    name: str
+    median_us: float  # per logical op
+    min_us: float
+    ops_per_sec: float
+    rounds: int
+    number: int
+
+
+def bench(name: str, *, number: int = 100, rounds: int = 7, ops: int = 1):
+    def register(setup):
+        _CASES[name] = Case(name, setup, number, rounds, ops)
+        return setup
+    return register
+
+
+def cases() -> Dict[str, Case]:
+    return dict(_CASES)
+
+
+def run_case(case: Case, *, quick: bool = False) -> Result:
+    fn = case.setup()
+    teardown = None
+    if isinstance(fn, tuple):
+        fn, teardown = fn
+
+    try:
+        return _measure(case, fn, quick)
+    finally:
+        if teardown is not None:
+            teardown()
+
+
+def _measure(case: Case, fn, quick: bool) -> Result:
+    number = max(1, case.number // 10) if quick else case.number
+    rounds = 3 if quick else case.rounds
+
+    # Warmup (lazy imports, caches, allocator)
+    for _ in range(max(1, number // 10)):
+        fn()
+
+    per_op = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - t0
+        per_op.append(elapsed / (number * case.ops))
+
+    median = statistics.median(per_op)
+    return Result(
+        name=case.name,
+        median_us=median * 1e6,
+        min_us=min(per_op) * 1e6,
+        ops_per_sec=1.0 / median if median > 0 else float("inf"),
+        rounds=rounds,
+        number=number,
+    )
+
+
+def save_baseline(path: str, results: list):
+    payload = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {r.name: asdict(r) for r in results},
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f).get("results", {})
+
+
+def compare(results: list, baseline: dict, threshold: float) -> list:
+    """
+    Returns [(name, baseline_us, current_us, ratio)] for regressions only.
+    """
+    regressions = []
+    for r in results:
+        base = baseline.get(r.name)
+        if not base:
+            continue
+        ratio = r.median_us / max(base["median_us"], 1e-9)
+        if ratio > 1.0 + threshold:
+            regressions.append((r.name, base["median_us"], r.median_us, ratio))
+    return regressions
@@ -0,0 +1,305 @@
+# benchmarks/loadtest.py
+
+"""
+Synthetic multi-camera load test: where does the engine saturate?
+
+    python -m benchmarks.loadtest --steps 1,5,10,25,50,100,200 --stub --stub-cost-ms 40
+    python -m benchmarks.loadtest --steps 1,4,8 --duration 30          # real YOLO
+    python -m benchmarks.loadtest --http http://localhost:8000 --steps 1,10,50
+
+In-process mode runs the production FrameHub -> DetectionWorker ->
+run_frame_pipeline path with MockFrameProvider cameras (optionally a
+CPU-burning StubDetector instead of YOLO). Each step uses fresh cameras.
+
+A step is saturated when cameras get < --ok-ratio of their target
+detection rate. The saturating stage is the one whose p95 grew the most
+versus the first step (queueing shows up where capacity ran out).
+
+--http mode is a pure load generator against a running app: every camera
+posts one /ingest/frame/batch request per second and the server's own
+/runtime/metrics stage percentiles are reported. The load{step}_{i} ids
+are push cameras: run the server with PUSH_CAMERAS='*' and
+PUSH_CAMERAS_MAX >= the sum of --steps (others get 403).
+"""
+
+import argparse
+import json
+import logging
+import struct
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from app.frames.frame_hub import FrameHub
+from app.frames.mock import MockFramePump, MockFrameProvider, StubDetector
+from app.metrics import CAMERA_CPU_SECONDS, STAGE_SECONDS, bucket_quantile
+
+STAGES = (
+    "framehub_wait",
+    "motion_gate",
+    "inference",
+    "plate_proposal",
+    "ocr",
+    "debug_dump",
+    "event_emit",
+)
+
+
+# -------------------------------------------------
+# Metrics helpers (aggregate across a step's cameras)
+# -------------------------------------------------
+def _stage_summary(cameras: set) -> dict:
+    merged = {}
+    for (cam_id, stage), child in STAGE_SECONDS.items():
+        if cam_id not in cameras:
+            continue
+        counts, total_sum, total = child.snapshot()
+        agg = merged.setdefault(stage, [[0] * len(counts), 0.0, 0])
+        agg[0] = [a + b for a, b in zip(agg[0], counts)]
+        agg[1] += total_sum
+        agg[2] += total
+
+    out = {}
+    for stage, (counts, total_sum, total) in merged.items():
+        if total == 0:
+            continue
+        out[stage] = {
+            "count": total,
+            "busy_sec": round(total_sum, 3),
+            "p95_ms": round(bucket_quantile(STAGE_SECONDS.buckets, counts, total, 0.95) * 1000, 2),
+        }
+    return out
+
+
+def _cpu_summary(cameras: set) -> dict:
+    out = {}
+    for (cam_id, component), child in CAMERA_CPU_SECONDS.items():
+        if cam_id in cameras:
+            out[component] = out.get(component, 0.0) + child.value
+    return {k: round(v, 3) for k, v in out.items()}
+
+
+# -------------------------------------------------
+# In-process step
+# -------------------------------------------------
+def run_inprocess_step(step: int, n_cameras: int, args) -> dict:
+    from app.detection.detection_manager import DetectionManager
+    from app.detection.detector import DetectionWorker
+
+    cameras = [f"load{step}_{i}" for i in range(n_cameras)]
+    provider = MockFrameProvider(
+        cameras,
+        width=args.width,
+        height=args.height,
+        objects=args.objects,
+        prerendered=args.prerendered,
+    )
+    frame_hub = FrameHub()
+    detection_manager = DetectionManager()
+    detect_fn = StubDetector(provider, cost_ms=args.stub_cost_ms) if args.stub else None
+
+    pump = MockFramePump(provider, frame_hub, fps=args.source_fps)
+    workers = [
+        DetectionWorker(
+            cam_id=cam_id,
+            frame_hub=frame_hub,
+            detection_manager=detection_manager,
+            fps=args.detect_fps,
+            anpr_fps=args.anpr_fps,
+            detect_fn=detect_fn,
+        )
+        for cam_id in cameras
+    ]
+
+    pump.start()
+    for w in workers:
+        w.start()
+
+    time.sleep(args.warmup)
+    start_counts = [w.frames_processed for w in workers]
+    started = time.monotonic()
+    time.sleep(args.duration)
+    elapsed = time.monotonic() - started
+    end_counts = [w.frames_processed for w in workers]
+
+    pump.running = False
+    for w in workers:
+        w.running = False
+    for w in workers:
+        w.join(timeout=5.0)
+    pump.join(timeout=5.0)
+
+    target = min(args.detect_fps, args.source_fps)
+    rates = [(e - s) / elapsed for s, e in zip(start_counts, end_counts)]
+    ratio = (sum(rates) / len(rates)) / target if target > 0 else 0.0
+
+    camera_set = set(cameras)
+    return {
+        "cameras": n_cameras,
+        "target_fps_per_camera": target,
+        "achieved_fps_per_camera": round(sum(rates) / len(rates), 3),
+        "min_fps_per_camera": round(min(rates), 3),
+        "ok_ratio": round(ratio, 3),
+        "generator_late_ticks": pump.late_ticks,
+        "stages": _stage_summary(camera_set),
+        "cpu_sec": _cpu_summary(camera_set),
+    }
+
+
+# -------------------------------------------------
+# HTTP step (load generator only)
+# -------------------------------------------------
+def _encode_clip(provider: MockFrameProvider, cam_id: str, frames: int) -> list:
+    import cv2
+
+    out = []
+    for _ in range(frames):
+        ok, jpeg = cv2.imencode(".jpg", provider.get_frame(cam_id), [int(cv2.IMWRITE_JPEG_QUALITY), 80])
+        if ok:
+            out.append(jpeg.tobytes())
+    return out
+
+
+def _post_batch(url: str, cam_id: str, jpegs: list) -> int:
+    body = b"".join(struct.pack(">dI", time.time(), len(j)) + j for j in jpegs)
+    req = urllib.request.Request(
+        f"{url}/ingest/frame/batch?camera_id={cam_id}",
+        data=body,
+        headers={"Content-Type": "application/octet-stream"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return resp.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except Exception:
+        return 0
+
+
+def run_http_step(step: int, n_cameras: int, args) -> dict:
+    cameras = [f"load{step}_{i}" for i in range(n_cameras)]
+    provider = MockFrameProvider(
+        cameras[:1],
+        width=args.width,
+        height=args.height,
+        objects=args.objects,
+        prerendered=args.prerendered,
+    )
+    batch = max(1, int(round(args.source_fps)))
+    clip = _encode_clip(provider, cameras[0], batch)
+
+    statuses = {}
+    lock = threading.Lock()
+
+    def send(cam_id):
+        code = _post_batch(args.http, cam_id, clip)
+        with lock:
+            statuses[code] = statuses.get(code, 0) + 1
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=min(64, n_cameras)) as pool:
+        tick = started
+        while time.monotonic() - started < args.duration:
+            list(pool.map(send, cameras))
+            tick += 1.0
+            time.sleep(max(0.0, tick - time.monotonic()))
+
+    try:
+        with urllib.request.urlopen(f"{args.http}/runtime/metrics", timeout=10) as resp:
+            server = json.load(resp)
+    except Exception as e:
+        server = {"error": str(e)}
+
+    camera_set = set(cameras)
+    return {
+        "cameras": n_cameras,
+        "requests": statuses,
+        "frames_sent_per_camera": batch * int(args.duration),
+        "server_stages": {
+            cam: stages for cam, stages in server.get("stages", {}).items() if cam in camera_set
+        },
+    }
+
+
+# -------------------------------------------------
+# Report
+# -------------------------------------------------
+def find_saturation(results: list, ok_ratio: float):
+    first = results[0]
+    for r in results:
+        if r["ok_ratio"] >= ok_ratio and r["generator_late_ticks"] == 0:
+            continue
+
+        growth = {}
+        for stage, s in r["stages"].items():
+            base = first["stages"].get(stage)
+            if base and base["p95_ms"] > 0:
+                growth[stage] = s["p95_ms"] / base["p95_ms"]
+
+        stage = max(growth, key=growth.get) if growth else None
+        if r["generator_late_ticks"] and r["ok_ratio"] >= ok_ratio:
+            stage = "mock_generator"
+        return r["cameras"], stage, growth
+    return None, None, {}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Synthetic multi-camera load test")
+    parser.add_argument("--steps", default="1,5,10,25,50,100,200", help="camera counts")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds measured per step")
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--objects", type=int, default=4, help="moving boxes per camera")
+    parser.add_argument("--prerendered", type=int, default=25, help="0 = render every frame")
+    parser.add_argument("--source-fps", type=float, default=10.0)
+    parser.add_argument("--detect-fps", type=int, default=2)
+    parser.add_argument("--anpr-fps", type=float, default=0.7)
+    parser.add_argument("--stub", action="store_true", help="StubDetector instead of YOLO")
+    parser.add_argument("--stub-cost-ms", type=float, default=0.0, help="CPU burned per stub inference")
+    parser.add_argument("--ok-ratio", type=float, default=0.9)
+    parser.add_argument("--http", default=None, help="base URL of a running app")
+    parser.add_argument("--json", default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    steps = [int(s) for s in args.steps.split(",") if s.strip()]
+
+    results = []
+    for idx, n in enumerate(steps):
+        if args.http:
+            r = run_http_step(idx, n, args)
+            print(f"{n:>4} cams  requests={r['requests']}")
+        else:
+            r = run_inprocess_step(idx, n, args)
+            busiest = max(r["stages"].items(), key=lambda kv: kv[1]["busy_sec"], default=(None, None))[0]
+            print(
+                f"{n:>4} cams  {r['achieved_fps_per_camera']:.2f}/{r['target_fps_per_camera']:.2f} fps/cam "
+                f"(min {r['min_fps_per_camera']:.2f}, ok={r['ok_ratio']:.0%})  "
+                f"cpu={r['cpu_sec']}  busiest={busiest}"
+            )
+        results.append(r)
+
+    summary = {"steps": results}
+    if not args.http:
+        cams, stage, growth = find_saturation(results, args.ok_ratio)
+        summary["saturation"] = {"cameras": cams, "stage": stage, "p95_growth": growth}
+        if cams is None:
+            print(f"\nno saturation up to {steps[-1]} cameras")
+        else:
+            print(f"\nsaturates at {cams} cameras; first saturated stage: {stage}")
+            for s, g in sorted(growth.items(), key=lambda kv: -kv[1]):
+                print(f"  {s:<16} p95 x{g:.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+# benchmarks/plate_compare.py
+
+"""
+Plate proposal stage: Canny + contours vs the learned plate detector,
+on the same vehicle crops.
+
+    python -m benchmarks.plate_compare --model plates.onnx                # synthetic road frames
+    python -m benchmarks.plate_compare --model plates.onnx clip.mp4       # vehicles from a replayed clip
+    python -m benchmarks.plate_compare --model plates.pt --backend torch clip.mp4 --json out.json
+
+Per proposer: vehicles/sec and ms/frame for the whole stage (Canny runs
+once per crop, the model once per frame over the batch of crops), plus
+candidates per vehicle before and after the cheap gate: what OCR would
+be asked to read.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+
+from app.config import (
+    DETECTOR_THREADS,
+    PLATE_DETECTOR_BATCH,
+    PLATE_DETECTOR_CONF,
+    PLATE_DETECTOR_INPUT_SIZE,
+    PLATE_DETECTOR_MAX_PER_VEHICLE,
+)
+from app.detection.plate_detector import load_plate_detector
+from app.ingest.frame.plate_proposal import detect_plate_regions, propose_plate_regions
+from app.ingest.frame.policy import CALIBRATION_PLATE_POLICY
+from app.ingest.frame.quality_gate import cheap_plate_gate
+
+MIN_CROP = (40, 80)     # h, w: same floor as run_frame_pipeline
+WARMUP_FRAMES = 3
+
+
+def _synthetic_frames(count: int) -> list:
+    from benchmarks import fixtures
+
+    frames = []
+    for i in range(count):
+        frame, detections = fixtures.road_frame(vehicles=6, seed=fixtures.SEED + i)
+        frames.append((frame, detections["bbox"]))
+    return frames
+
+
+def _clip_frames(source: str, count: int) -> list:
+    from app.detection import detections
+    from app.detection.registry import get_vehicle_model
+    from app.frames.replay import ReplayFrameProvider
+
+    provider = ReplayFrameProvider({"bench": source}, realtime=False)
+    model = get_vehicle_model()
+    frames = []
+    while len(frames) < count:
+        frame = provider.get_frame("bench")
+        if frame is None:
+            break
+        frames.append((frame, detections.from_model_output(model(frame), frame.shape)["bbox"]))
+    return frames
+
+
+def _crops(frames: list) -> list:
+    """Per frame: the vehicle crops the pipeline would propose plates on."""
+    per_frame = []
+    for frame, boxes in frames:
+        crops = []
+        for x1, y1, x2, y2 in boxes.tolist():
+            crop = frame[y1:y2, x1:x2]
+            if crop.shape[0] >= MIN_CROP[0] and crop.shape[1] >= MIN_CROP[1]:
+                crops.append(crop)
+        per_frame.append(crops)
+    return per_frame
+
+
+def run_proposer(propose, per_frame: list) -> dict:
+    for crops in per_frame[:WARMUP_FRAMES]:
+        propose(crops)
+
+    outputs = []
+    started = time.perf_counter()
+    for crops in per_frame:
+        outputs.append(propose(crops))
+    elapsed = time.perf_counter() - started
+
+    vehicles = sum(len(crops) for crops in per_frame)
+    candidates = sum(len(plates) for frame_sets in outputs for plates in frame_sets)
+    gated = sum(cheap_plate_gate(p) for frame_sets in outputs for plates in frame_sets for p in plates)
+    return {
+        "vehicles_per_sec": round(vehicles / elapsed, 2) if elapsed > 0 else 0.0,
+        "ms_per_frame": round(elapsed / len(per_frame) * 1000, 2),
+        "candidates_per_vehicle": round(candidates / max(vehicles, 1), 2),
+        "gated_per_vehicle": round(gated / max(vehicles, 1), 2),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare Canny and learned plate proposals")
+    parser.add_argument("source", nargs="?", default=None, help="video file or directory of images (default: synthetic)")
+    parser.add_argument("--model", required=True, help="plate detector weights (.onnx / .pt)")
+    parser.add_argument("--backend", default="onnx", help="torch | onnx | openvino")
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--json", default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.disable(logging.INFO)   # pipeline modules log per call
+
+    frames = _clip_frames(args.source, args.frames) if args.source else _synthetic_frames(args.frames)
+    per_frame = _crops(frames)
+    vehicles = sum(len(c) for c in per_frame)
+    if not vehicles:
+        print(f"no vehicle crops from {args.source or 'synthetic frames'}", file=sys.stderr)
+        return 2
+
+    model = load_plate_detector(
+        args.model,
+        backend=args.backend,
+        imgsz=PLATE_DETECTOR_INPUT_SIZE,
+        batch=PLATE_DETECTOR_BATCH,
+        conf=PLATE_DETECTOR_CONF,
+        threads=DETECTOR_THREADS,
+    )
+
+    proposers = {
+        "canny": lambda crops: [propose_plate_regions(c, policy=CALIBRATION_PLATE_POLICY) for c in crops],
+        f"model:{args.backend}": lambda crops: detect_plate_regions(
+            crops, model, limit=PLATE_DETECTOR_MAX_PER_VEHICLE
+        ),
+    }
+
+    results = {}
+    for name, propose in proposers.items():
+        try:
+            results[name] = run_proposer(propose, per_frame)
+        except Exception as e:
+            results[name] = {"error": repr(e)}
+
+    print(f"{len(per_frame)} frames, {vehicles} vehicle crops from {args.source or 'synthetic frames'}\n")
+    print(f"{'proposer':<16} {'veh/s':>9} {'ms/frame':>9} {'cand/veh':>9} {'gated/veh':>10}")
+    for name, r in results.items():
+        if "error" in r:
+            print(f"{name:<16} FAILED: {r['error']}")
+            continue
+        print(
+            f"{name:<16} {r['vehicles_per_sec']:>9.2f} {r['ms_per_frame']:>9.2f} "
+            f"{r['candidates_per_vehicle']:>9.2f} {r['gated_per_vehicle']:>10.2f}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {"source": args.source, "frames": len(per_frame), "vehicles": vehicles, "proposers": results},
+                f,
+                indent=2,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+# benchmarks/replay_e2e.py
+
+"""
+End-to-end throughput on a recorded clip.
+
+    python -m benchmarks.replay_e2e clip.mp4                  # as fast as possible
+    python -m benchmarks.replay_e2e frames_dir/ --realtime    # paced at source FPS
+    python -m benchmarks.replay_e2e clip.mp4 --limit 500 --json out.json
+
+Path: ReplayFrameProvider -> FrameHub -> DetectionWorker -> run_frame_pipeline
+(the production path; only the frame source differs from RTSP).
+
+fast mode is lossless: the pump waits for the worker to finish each frame,
+so frames/sec is the pipeline's own ceiling. realtime mode never waits and
+reports how many frames the worker could not keep up with.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+
+from app.frames.frame_hub import FrameHub
+from app.frames.replay import ReplayFrameProvider, ReplayPump
+from app.metrics import STAGE_SECONDS
+
+CAM_ID = "replay"
+STAGES = (
+    "framehub_wait",
+    "motion_gate",
+    "inference",
+    "plate_proposal",
+    "ocr",
+    "debug_dump",
+    "event_emit",
+)
+
+
+def stage_percentiles(cam_id: str) -> dict:
+    out = {}
+    for stage in STAGES:
+        child = STAGE_SECONDS.labels(cam_id, stage)
+        if child.count == 0:
+            continue
+        out[stage] = {
+            "count": child.count,
+            **{
+                f"p{int(q * 100)}_ms": round(child.quantile(q) * 1000, 2)
+                for q in (0.5, 0.95, 0.99)
+            },
+        }
+    return out
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a clip through the detection pipeline")
+    parser.add_argument("source", help="video file or directory of images")
+    parser.add_argument("--realtime", action="store_true", help="pace at source FPS (default: as fast as possible)")
+    parser.add_argument("--fps", type=float, default=None, help="override source FPS")
+    parser.add_argument("--limit", type=int, default=None, help="max frames")
+    parser.add_argument("--detect-fps", type=int, default=None, help="worker detection rate (default: 2 realtime, unthrottled fast)")
+    parser.add_argument("--anpr-fps", type=float, default=None)
+    parser.add_argument("--json", default=None, help="write the report here")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    from app.config import ANPR_FPS, DETECTION_FPS
+    from app.detection.detection_manager import DetectionManager
+    from app.detection.detector import DetectionWorker
+
+    detect_fps = args.detect_fps or (DETECTION_FPS if args.realtime else 1000)
+    anpr_fps = args.anpr_fps or ANPR_FPS
+
+    provider = ReplayFrameProvider(
+        {CAM_ID: args.source},
+        fps=args.fps,
+        realtime=args.realtime,
+    )
+    frame_hub = FrameHub()
+    frame_hub.register(CAM_ID)
+
+    worker = DetectionWorker(
+        cam_id=CAM_ID,
+        frame_hub=frame_hub,
+        detection_manager=DetectionManager(),
+        fps=detect_fps,
+        anpr_fps=anpr_fps,
+    )
+    pump = ReplayPump(
+        provider,
+        CAM_ID,
+        frame_hub,
+        limit=args.limit,
+        wait_for=None if args.realtime else (lambda seq: worker.processed_seq >= seq),
+    )
+
+    worker.start()
+    started = time.perf_counter()
+    pump.start()
+
+    try:
+        pump.finished.wait()
+        # Let the worker drain the last published frame
+        entry = frame_hub.latest_entry(CAM_ID)
+        last_seq = entry.seq if entry is not None else 0
+        deadline = time.monotonic() + 30.0
+        while worker.processed_seq < last_seq and time.monotonic() < deadline:
+            time.sleep(0.01)
+    except KeyboardInterrupt:
+        pump.running = False
+    finally:
+        worker.running = False
+
+    wall = time.perf_counter() - started
+    dropped = max(0, pump.published - worker.frames_processed)
+
+    report = {
+        "source": args.source,
+        "mode": "realtime" if args.realtime else "fast",
+        "source_fps": provider.fps(CAM_ID),
+        "frames_published": pump.published,
+        "frames_processed": worker.frames_processed,
+        "frames_dropped": dropped,
+        "wall_sec": round(wall, 3),
+        "e2e_fps": round(worker.frames_processed / wall, 2) if wall > 0 else 0.0,
+        "stages": stage_percentiles(CAM_ID),
+    }
+
+    print(f"source         {report['source']} ({report['mode']}, {report['source_fps']:.1f} fps)")
+    print(f"frames         published={pump.published} processed={worker.frames_processed} dropped={dropped}")
+    print(f"throughput     {report['e2e_fps']:.2f} frames/sec over {report['wall_sec']:.1f}s")
+    print("stage latency  (ms)")
+    for stage, s in report["stages"].items():
+        print(
+            f"  {stage:<16} n={s['count']:<6} "
+            f"p50={s['p50_ms']:<9} p95={s['p95_ms']:<9} p99={s['p99_ms']}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
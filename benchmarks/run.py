@@ -0,0 +1,79 @@
+# benchmarks/run.py
+
+"""
+Offline microbenchmarks for the CPU hot paths.
+
+    python -m benchmarks.run                      # run + compare to baseline
+    python -m benchmarks.run --save               # (re)write the baseline
+    python -m benchmarks.run -k plate --quick     # subset, fewer iterations
+
+Exit code 1 when any case's median regressed more than --threshold
+versus the baseline JSON.
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+from benchmarks import harness
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Case modules (import registers their @bench cases)
+SUITES = [
+    "benchmarks.bench_hotpaths",
+]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-k", "--filter", default="", help="substring match on case name")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.20, help="allowed median slowdown (0.20 = +20%%)")
+    parser.add_argument("--quick", action="store_true", help="smoke mode: fewer iterations")
+    args = parser.parse_args(argv)
+
+    # Pipeline modules log per call; keep the timings clean
+    logging.disable(logging.CRITICAL)
+
+    for suite in SUITES:
+        __import__(suite)
+
+    selected = [c for name, c in sorted(harness.cases().items()) if args.filter in name]
+    if not selected:
+        print(f"no cases match {args.filter!r}", file=sys.stderr)
+        return 2
+
+    results = []
+    for case in selected:
+        result = harness.run_case(case, quick=args.quick)
+        results.append(result)
+        print(
+            f"{result.name:<48} {result.median_us:>12.2f} us/op "
+            f"(min {result.min_us:.2f})  {result.ops_per_sec:>12.1f} op/s"
+        )
+
+    if args.save:
+        harness.save_baseline(args.baseline, results)
+        print(f"\nbaseline saved -> {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nno baseline at {args.baseline} (run with --save)")
+        return 0
+
+    regressions = harness.compare(results, harness.load_baseline(args.baseline), args.threshold)
+    if not regressions:
+        print(f"\nno regressions (threshold +{args.threshold:.0%})")
+        return 0
+
+    print(f"\nREGRESSIONS (threshold +{args.threshold:.0%}):")
+    for name, base_us, cur_us, ratio in regressions:
+        print(f"  {name:<48} {base_us:>10.2f} -> {cur_us:>10.2f} us/op  (x{ratio:.2f})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())